@@ -0,0 +1,76 @@
+# Módulo de varredura adaptativa em frequência para Bode e Nyquist
+# Começa com uma grade grossa e refina só onde magnitude ou fase se afastam da interpolação linear
+
+import numpy as np
+from typing import Callable, Iterable, Tuple
+
+def series_rlc_poles(r: float, l: float, c: float) -> np.ndarray:
+    """Polos do RLC série no plano s (raízes de LC·s² + RC·s + 1)"""
+    return np.roots([l * c, r * c, 1.0])
+
+def _pole_seeds(poles: Iterable[complex], f_start: float, f_end: float) -> np.ndarray:
+    """Frequências extras em torno de cada polo, espaçadas pela sua meia largura de banda"""
+    seeds = []
+    for pole in poles:
+        magnitude = abs(pole)
+        if magnitude == 0:
+            continue
+        f_pole = magnitude / (2 * np.pi)
+        # ζ do polo: define a largura relativa do pico
+        zeta = max(abs(pole.real) / magnitude, 1e-12)
+        seeds.extend(f_pole * (1 + zeta * np.array([-2.0, -1.0, -0.5, 0.0, 0.5, 1.0, 2.0])))
+    seeds = np.asarray(seeds, dtype=float)
+    return seeds[(seeds > f_start) & (seeds < f_end)]
+
+def _wrap(angle: np.ndarray) -> np.ndarray:
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+def adaptive_frequency_sweep(response: Callable[[np.ndarray], np.ndarray], f_start: float, f_end: float,
+                             poles: Iterable[complex] = (), initial_points: int = 41,
+                             tolerance_db: float = 0.05, tolerance_deg: float = 0.5,
+                             max_points: int = 5000) -> Tuple[np.ndarray, np.ndarray]:
+    """Amostra H(f) em escala log com refinamento adaptativo.
+
+    `response` recebe um array de frequências [Hz] e devolve H complexo.
+    Cada intervalo é testado no seu ponto médio (em log f): se |H| em dB ou
+    a fase diferirem da interpolação linear dos extremos além da tolerância,
+    o intervalo é dividido e as duas metades voltam a ser testadas. Os polos
+    conhecidos semeiam pontos em torno da ressonância, de modo que picos de
+    alto Q são capturados mesmo que a grade inicial passe por cima deles.
+    Retorna (f, H) ordenados; para ao atingir a tolerância ou `max_points`.
+    """
+    if not 0 < f_start < f_end:
+        raise ValueError("Faixa de frequência inválida: requer 0 < f_start < f_end")
+
+    x = np.union1d(np.linspace(np.log10(f_start), np.log10(f_end), initial_points),
+                   np.log10(_pole_seeds(poles, f_start, f_end)))
+    H = np.asarray(response(10 ** x), dtype=complex)
+    active = np.ones(len(x) - 1, dtype=bool)
+
+    while active.any() and len(x) < max_points:
+        index = np.nonzero(active)[0]
+        if len(x) + len(index) > max_points:
+            index = index[:max_points - len(x)]
+        x_mid = 0.5 * (x[index] + x[index + 1])
+        H_mid = np.asarray(response(10 ** x_mid), dtype=complex)
+
+        with np.errstate(divide='ignore'):
+            db_left, db_right, db_mid = (20 * np.log10(np.abs(v)) for v in (H[index], H[index + 1], H_mid))
+        phase_left = np.angle(H[index])
+        phase_linear = phase_left + 0.5 * _wrap(np.angle(H[index + 1]) - phase_left)
+        error_db = np.abs(db_mid - 0.5 * (db_left + db_right))
+        error_deg = np.degrees(np.abs(_wrap(np.angle(H_mid) - phase_linear)))
+        refine = (error_db > tolerance_db) | (error_deg > tolerance_deg)
+        refine &= (x[index + 1] - x[index]) > 1e-9
+
+        # Intercala os pontos médios (já avaliados); filhos de intervalos refinados seguem ativos
+        order = np.argsort(np.concatenate([x, x_mid]), kind='stable')
+        x = np.concatenate([x, x_mid])[order]
+        H = np.concatenate([H, H_mid])[order]
+        child = np.zeros(len(active) + len(index), dtype=bool)
+        position = index + np.arange(len(index))
+        child[position] = refine
+        child[position + 1] = refine
+        active = child
+
+    return 10 ** x, H
@@ -5,9 +5,25 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime
 import json
+import time
 
 # Importar o editor de circuitos
+from circuit_calculator import CalculationResults, HarmonicAnalyzer, PowerFactorCorrector
 from circuit_editor import CircuitBuilder, ComponentType, CircuitTemplates
+from circuit_solver import NONLINEAR_TYPES, CircuitSolver, IncrementalSolver, build_netlist, component_si_value
+import device_models
+import harmonic_balance
+import harmonic_flow
+import modal_analysis
+import model_reduction
+import netlist_analysis
+import noise_analysis
+import power_flow
+import nonlinear_solver
+import three_phase
+import transmission_line
+from transient_solver import SwitchEvent, TransientSimulator
+from ui_components import PresetManager
 
 # Configuração da página
 st.set_page_config(
@@ -125,7 +141,12 @@ def main():
                 ComponentType.CAPACITOR: ("⚏", "Capacitor", "#3498db"),
                 ComponentType.INDUCTOR: ("⨂", "Indutor", "#f39c12"),
                 ComponentType.GROUND: ("⏚", "Terra", "#34495e"),
-                ComponentType.SWITCH: ("⧄", "Chave", "#e67e22")
+                ComponentType.SWITCH: ("⧄", "Chave", "#e67e22"),
+                ComponentType.TRANSMISSION_LINE: ("≋", "Linha de Transmissão", "#16a085"),
+                ComponentType.DIODE: ("▷|", "Diodo", "#c0392b"),
+                ComponentType.BJT: ("⊳", "Transistor Bipolar", "#2c3e50"),
+                ComponentType.MOSFET: ("⊩", "MOSFET", "#8e44ad"),
+                ComponentType.SATURABLE_INDUCTOR: ("⨷", "Indutor Saturável", "#d35400")
             }
             
             for comp_type, (symbol, name, color) in components_info.items():
@@ -148,7 +169,10 @@ def main():
                     ComponentType.CAPACITOR: ["µF", "nF", "pF"],
                     ComponentType.INDUCTOR: ["mH", "µH", "H"],
                     ComponentType.VOLTAGE_SOURCE: ["V"],
-                    ComponentType.CURRENT_SOURCE: ["A", "mA"]
+                    ComponentType.CURRENT_SOURCE: ["A", "mA"],
+                    ComponentType.TRANSMISSION_LINE: ["m", "km"],
+                    ComponentType.DIODE: ["A"],
+                    ComponentType.SATURABLE_INDUCTOR: ["mH", "µH", "H"]
                 }
                 
                 if st.session_state.selected_component_type in unit_options:
@@ -158,6 +182,30 @@ def main():
                     )
                 else:
                     component_unit = ""
+                
+                # Linha: valor = comprimento; parâmetros por metro e número de seções
+                if st.session_state.selected_component_type == ComponentType.TRANSMISSION_LINE:
+                    typical = {"r": 1e-4, "l": 1e-6, "c": 1e-11, "g": 0.0}
+                    line_parameters = {
+                        name: st.number_input(transmission_line.LINE_LABELS[name], min_value=0.0,
+                                              value=default, format="%.3e", key=f"line_{name}")
+                        for name, default in typical.items()
+                    }
+                    line_parameters["segments"] = int(st.number_input(
+                        transmission_line.LINE_LABELS["segments"], min_value=0, value=0, step=1,
+                        key="line_segments"
+                    ))
+                    st.session_state.line_parameters = line_parameters
+
+                # Dispositivos não lineares: valor = Iₛ, β ou L₀; parâmetros do modelo
+                # (base/porta dos transistores é o terminal 3)
+                if st.session_state.selected_component_type in device_models.DEVICE_DEFAULTS:
+                    defaults = device_models.DEVICE_DEFAULTS[st.session_state.selected_component_type]
+                    st.session_state.device_parameters = {
+                        name: st.number_input(device_models.DEVICE_LABELS[name], value=float(default),
+                                              format="%.3e", key=f"device_{name}")
+                        for name, default in defaults.items()
+                    }
         
         st.markdown("---")
         
@@ -318,6 +366,23 @@ def main():
             if params['total_inductance'] > 0:
                 st.metric("Indutância Total", f"{params['total_inductance']:.1f} mH")
             
+            # Análise nodal com re-solução incremental
+            show_nodal_analysis(builder)
+            show_sensitivity_analysis(builder)
+            show_port_equivalents(builder)
+            show_superposition(builder)
+            show_fault_study(builder)
+            show_harmonic_load_flow(builder)
+            show_noise_analysis(builder)
+            show_power_flow(builder)
+            show_line_profile(builder)
+            show_natural_modes(builder)
+            show_model_reduction(builder)
+            show_transient_analysis(builder)
+            show_power_electronics_examples()
+            show_periodic_steady_state(builder)
+            show_three_phase_analysis()
+
             # Simulação básica
             if params['voltage_sources'] and params['total_resistance'] > 0:
                 st.markdown("### 🔬 Simulação Básica")
@@ -400,6 +465,930 @@ def main():
             **5.** 💾 Salve ou carregue seus projetos
             """)
 
+# Elementos cujo valor o solver incremental atualiza sem remontar a netlist
+INCREMENTAL_TYPES = (ComponentType.RESISTOR, ComponentType.CAPACITOR, ComponentType.INDUCTOR,
+                     ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE)
+
+def get_incremental_solver(builder: CircuitBuilder):
+    """Retorna o solver incremental do circuito, recriando-o quando a topologia ou os parâmetros mudam.
+
+    Valores alterados fora da análise nodal (modelo recarregado, JSON
+    importado com os mesmos ids, troca de unidade) entram como atualizações
+    de posto baixo no solver em cache.
+    """
+    signature = (
+        tuple((comp.id, comp.type.value, tuple(sorted((comp.parameters or {}).items())))
+              for comp in builder.components.values()),
+        tuple(sorted((conn.id, conn.from_component, conn.from_terminal, conn.to_component, conn.to_terminal)
+                     for conn in builder.connections.values()))
+    )
+    netlist = build_netlist(builder)
+    cached = st.session_state.get('incremental_solver')
+    if cached is None or cached[0] != signature or \
+            [e.id for e in cached[1].netlist.elements] != [e.id for e in netlist.elements]:
+        cached = (signature, IncrementalSolver(netlist))
+        st.session_state.incremental_solver = cached
+    else:
+        changed = [element for element, current in zip(netlist.elements, cached[1].netlist.elements)
+                   if element.value != current.value]
+        if any(element.type not in INCREMENTAL_TYPES for element in changed):
+            cached = (signature, IncrementalSolver(netlist))
+            st.session_state.incremental_solver = cached
+        else:
+            for element in changed:
+                cached[1].update_value(element.id, element.value)
+    return cached[1]
+
+def show_nodal_analysis(builder: CircuitBuilder):
+    """Mostra tensões nodais (MNA) e permite editar valores sem refatorar o circuito"""
+    st.markdown("### 🔬 Análise Nodal (DC)")
+
+    try:
+        solver = get_incremental_solver(builder)
+    except ValueError as e:
+        st.warning(f"⚠️ {e}")
+        return
+
+    # Semicondutores: ponto de operação por Newton-Raphson (a solução linear os deixaria em aberto)
+    if any(element.type in NONLINEAR_TYPES for element in solver.netlist.elements):
+        # Em cache pela assinatura do circuito e pelos valores: só refaz o Newton quando algo muda
+        key = (st.session_state.incremental_solver[0], tuple(e.value for e in solver.netlist.elements))
+        cached = st.session_state.get('operating_point')
+        if cached is None or cached[0] != key:
+            try:
+                cached = (key, nonlinear_solver.NonlinearSimulator(solver.netlist).operating_point())
+            except RuntimeError as e:
+                st.warning(f"⚠️ {e}")
+                return
+            st.session_state.operating_point = cached
+        solution = cached[1]
+        voltages = solution.node_voltages
+        st.dataframe(pd.DataFrame([
+            {"Nó": solver.netlist.node_names.get(k, f"N{k}"), "Tensão (V)": f"{voltages[k]:.4f}"}
+            for k in range(1, len(voltages))
+        ]), use_container_width=True)
+        st.caption(f"⚡ Newton-Raphson: {solution.iterations} iterações, "
+                   f"{solution.factorizations} fatorações")
+        return
+
+    editable = {
+        comp.id: comp for comp in builder.components.values()
+        if comp.type in (ComponentType.RESISTOR, ComponentType.CAPACITOR, ComponentType.INDUCTOR,
+                         ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE)
+        and comp.value is not None
+    }
+    if editable:
+        edit_id = st.selectbox("Componente:", list(editable.keys()),
+                               format_func=lambda cid: editable[cid].label, key="nodal_edit_component")
+        component = editable[edit_id]
+        new_value = st.number_input(f"Valor ({component.unit or 'SI'}):", value=float(component.value),
+                                    key=f"nodal_edit_value_{edit_id}_{component.value}")
+        if new_value != component.value and (new_value > 0 or component.type in
+                                              (ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE)):
+            builder.update_component_value(edit_id, new_value)
+            start = time.perf_counter()
+            solver.update_value(edit_id, component_si_value(component))
+            st.caption(f"⚡ Re-solução incremental em {(time.perf_counter() - start) * 1000:.2f} ms "
+                       f"({solver.update_count} atualizações, {solver.refactor_count} fatorações)")
+
+    solution = solver.solution()
+    voltages = solution.node_voltages
+    nodes_df = pd.DataFrame([
+        {"Nó": solver.netlist.node_names.get(k, f"N{k}"), "Tensão (V)": f"{np.real(voltages[k]):.4f}"}
+        for k in range(1, len(voltages))
+    ])
+    st.dataframe(nodes_df, use_container_width=True)
+
+def show_sensitivity_analysis(builder: CircuitBuilder):
+    """Ranking das derivadas de uma saída em relação a todos os componentes (método adjunto)"""
+    with st.expander("🎚️ Sensibilidades (Adjunto)"):
+        try:
+            netlist = get_incremental_solver(builder).netlist
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            kind = st.selectbox("Saída:", list(netlist_analysis.OUTPUTS),
+                                format_func=netlist_analysis.OUTPUTS.get, key="sensitivity_kind")
+        with col_b:
+            if kind == "node_voltage":
+                targets = list(range(1, netlist.node_count + 1))
+                label = lambda node: netlist.node_names.get(node, f"N{node}")
+            else:
+                targets = [element.id for element in netlist.elements]
+                label = lambda element_id: netlist.element(element_id).label
+            if not targets:
+                st.info("Circuito sem nós ou elementos para analisar")
+                return
+            target = st.selectbox("Em:", targets, format_func=label, key="sensitivity_target")
+        with col_c:
+            frequency = st.number_input("Frequência (Hz, 0 = DC):", min_value=0.0, value=0.0,
+                                        key="sensitivity_frequency")
+
+        if not st.button("▶️ Calcular Sensibilidades", key="run_sensitivity"):
+            return
+
+        solver = CircuitSolver(netlist)
+        start = time.perf_counter()
+        sensitivities = netlist_analysis.adjoint_sensitivities(solver, kind, target, frequency)
+        elapsed = (time.perf_counter() - start) * 1000
+        output = netlist_analysis.output_value(solver, kind, target, frequency)
+
+        st.metric(f"{netlist_analysis.OUTPUTS[kind]} em {label(target)}", f"{abs(output):.4g}")
+        # Em DC as derivadas são reais e o sinal é mostrado; em CA, o módulo
+        show = (lambda v: f"{np.real(v):+.4g}") if frequency == 0 else (lambda v: f"{abs(v):.4g}")
+        sens_df = pd.DataFrame([
+            {
+                "Componente": s.label,
+                "Valor (SI)": f"{s.value:.4g}",
+                "∂y/∂p": show(s.derivative),
+                "(p/y)·∂y/∂p": show(s.relative / output) if abs(output) > 0 else "—",
+            }
+            for s in sensitivities
+        ])
+        st.dataframe(sens_df, use_container_width=True)
+        st.caption(f"⚡ {len(sensitivities)} derivadas com uma substituição transposta em {elapsed:.2f} ms")
+
+def show_port_equivalents(builder: CircuitBuilder):
+    """Equivalentes de Thévenin/Norton nos pares de nós escolhidos (uma fatoração para todas as portas)"""
+    with st.expander("🔌 Equivalentes de Thévenin/Norton"):
+        try:
+            netlist = get_incremental_solver(builder).netlist
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+
+        name = lambda node: netlist.node_names.get(node, f"N{node}")
+        pairs = [(node1, node2) for node1 in range(1, netlist.node_count + 1) for node2 in range(node1)]
+        if not pairs:
+            st.info("Circuito sem nós para analisar")
+            return
+        ports = st.multiselect("Portas (+, −):", pairs, default=[pair for pair in pairs if pair[1] == 0],
+                               format_func=lambda pair: f"{name(pair[0])} – {name(pair[1])}",
+                               key="port_pairs")
+        frequency = st.number_input("Frequência (Hz, 0 = DC):", min_value=0.0, value=0.0,
+                                    key="port_frequency")
+        if not ports:
+            return
+
+        if not st.button("▶️ Calcular Equivalentes", key="run_port_equivalents"):
+            return
+
+        start = time.perf_counter()
+        equivalents = netlist_analysis.port_equivalents(CircuitSolver(netlist), ports, frequency)
+        elapsed = (time.perf_counter() - start) * 1000
+        ports_df = pd.DataFrame([
+            {
+                "Porta": f"{name(e.node1)} – {name(e.node2)}",
+                "V_th (V)": f"{abs(e.voltage):.4g} ∠ {np.degrees(np.angle(e.voltage)):.1f}°",
+                "Z_th (Ω)": f"{np.real(e.impedance):.4g} {np.imag(e.impedance):+.4g}j",
+                "I_N (A)": f"{abs(e.current):.4g} ∠ {np.degrees(np.angle(e.current)):.1f}°",
+                "Carga casada (Ω)": f"{np.real(e.matched_load):.4g} {np.imag(e.matched_load):+.4g}j",
+                "P máx (W)": f"{e.max_power:.4g}",
+            }
+            for e in equivalents
+        ])
+        st.dataframe(ports_df, use_container_width=True)
+        st.caption(f"⚡ {len(ports)} portas com uma fatoração e uma substituição múltipla em {elapsed:.2f} ms")
+
+def show_superposition(builder: CircuitBuilder):
+    """Contribuição de cada fonte em cada tensão nodal e corrente (superposição em uma substituição múltipla)"""
+    with st.expander("🧮 Superposição por Fonte"):
+        try:
+            netlist = get_incremental_solver(builder).netlist
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+
+        frequency = st.number_input("Frequência (Hz, 0 = DC):", min_value=0.0, value=0.0,
+                                    key="superposition_frequency")
+        if not any(element.type in (ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE)
+                   for element in netlist.elements):
+            st.info("Circuito sem fontes independentes")
+            return
+        if not st.button("▶️ Calcular Superposição", key="run_superposition"):
+            return
+
+        start = time.perf_counter()
+        result = netlist_analysis.superposition(CircuitSolver(netlist), frequency)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        values = np.real(result.contributions) if frequency == 0 else np.abs(result.contributions)
+        table = pd.DataFrame(values, index=result.source_labels, columns=result.quantities)
+        table.loc["Total"] = np.real(result.total) if frequency == 0 else np.abs(result.total)
+        st.dataframe(table.T.style.format("{:.4g}"), use_container_width=True)
+        st.caption(f"⚡ {len(result.sources)} fontes × {len(result.quantities)} grandezas "
+                   f"com uma fatoração em {elapsed:.2f} ms" + ("" if frequency == 0 else " (módulos)"))
+
+def show_fault_study(builder: CircuitBuilder):
+    """Corrente de curto-circuito presumida em todos os nós a partir da diagonal de Z_barra"""
+    with st.expander("💥 Estudo de Curto-Circuito"):
+        try:
+            netlist = get_incremental_solver(builder).netlist
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            frequency = st.number_input("Frequência (Hz, 0 = DC):", min_value=0.0, value=60.0,
+                                        key="fault_frequency")
+        with col_b:
+            fault_r = st.number_input("R de falta (Ω):", min_value=0.0, value=0.0, key="fault_r")
+        with col_c:
+            fault_x = st.number_input("X de falta (Ω):", value=0.0, key="fault_x")
+        if netlist.node_count == 0:
+            st.info("Circuito sem nós para analisar")
+            return
+
+        if not st.button("▶️ Calcular Curtos", key="run_fault_study"):
+            return
+
+        start = time.perf_counter()
+        study = netlist_analysis.fault_study(CircuitSolver(netlist), frequency, complex(fault_r, fault_x))
+        elapsed = (time.perf_counter() - start) * 1000
+        order = study.ranking()
+        current = study.current
+        fault_df = pd.DataFrame([
+            {
+                "Nó": study.node_names[k],
+                "V pré-falta (V)": f"{abs(study.prefault_voltage[k]):.4g}",
+                "Z_kk (Ω)": f"{np.real(study.impedance[k]):.4g} {np.imag(study.impedance[k]):+.4g}j",
+                "I falta (A)": f"{abs(current[k]):.4g}",
+            }
+            for k in order
+        ])
+        st.dataframe(fault_df, use_container_width=True)
+        st.caption(f"⚡ {len(order)} nós com uma fatoração e substituições por coluna em {elapsed:.2f} ms")
+
+def show_harmonic_load_flow(builder: CircuitBuilder):
+    """Fluxo harmônico: fontes escolhidas injetam o espectro de um conversor; THD de tensão por nó"""
+    with st.expander("📶 Fluxo Harmônico"):
+        try:
+            netlist = get_incremental_solver(builder).netlist
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+        sources = {element.id: element.label for element in netlist.elements
+                   if element.type in (ComponentType.CURRENT_SOURCE, ComponentType.VOLTAGE_SOURCE)}
+        if not sources or netlist.node_count == 0:
+            st.info("Adicione fontes para modelar as injeções harmônicas")
+            return
+
+        # Cargas não lineares costumam ser modeladas como fontes de corrente
+        current_sources = [e for e in sources if netlist.element(e).type == ComponentType.CURRENT_SOURCE]
+        emitters = st.multiselect("Fontes harmônicas:", list(sources), format_func=lambda e: sources[e],
+                                  default=current_sources, key="harmonic_emitters")
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            frequency = st.number_input("Fundamental (Hz):", min_value=1.0, value=60.0, key="harmonic_frequency")
+        with col_b:
+            pulses = st.selectbox("Conversor:", [6, 12, 18, 24], format_func=lambda p: f"{p} pulsos",
+                                  key="harmonic_pulses")
+        with col_c:
+            max_order = int(st.number_input("Ordem máxima:", min_value=2, max_value=200,
+                                            value=harmonic_flow.DEFAULT_MAX_ORDER, key="harmonic_max_order"))
+        if not emitters:
+            return
+
+        if not st.button("▶️ Calcular Fluxo Harmônico", key="run_harmonic_flow"):
+            return
+
+        spectrum = harmonic_flow.pulse_spectrum(pulses, max_order)
+        start = time.perf_counter()
+        flow = harmonic_flow.harmonic_load_flow(netlist, frequency, {e: spectrum for e in emitters})
+        elapsed = (time.perf_counter() - start) * 1000
+        thd = flow.thd
+        rms = flow.rms
+        worst = flow.worst_nodes(netlist.node_count)
+        st.dataframe(pd.DataFrame([
+            {
+                "Nó": netlist.node_names.get(node, f"N{node}"),
+                "|V₁| (V)": f"{abs(flow.order_voltages(1)[node - 1]):.4g}",
+                "V_rms (V)": f"{rms[node - 1]:.4g}",
+                "THD (%)": f"{thd[node - 1] * 100:.2f}",
+            }
+            for node in worst
+        ]), use_container_width=True)
+
+        fig = go.Figure(go.Bar(x=flow.orders[1:], y=flow.individual_distortion[1:, worst[0] - 1] * 100))
+        fig.update_layout(title=f"Distorção individual em {netlist.node_names.get(worst[0], f'N{worst[0]}')}",
+                          xaxis_title="Ordem harmônica", yaxis_title="|V_h|/|V₁| (%)", height=350)
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"⚡ {len(flow.orders)} ordens resolvidas em {elapsed:.2f} ms")
+
+def show_noise_analysis(builder: CircuitBuilder):
+    """Ruído térmico 4kTR na saída: densidade total, maiores contribuições e ruído eficaz integrado"""
+    with st.expander("🔊 Ruído Térmico"):
+        try:
+            netlist = get_incremental_solver(builder).netlist
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+        if netlist.node_count == 0 or not any(e.type == ComponentType.RESISTOR for e in netlist.elements):
+            st.info("A análise de ruído requer resistores e ao menos um nó")
+            return
+
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            node = st.selectbox("Saída (nó):", list(range(1, netlist.node_count + 1)),
+                                index=netlist.node_count - 1, format_func=lambda k: netlist.node_names.get(k, f"N{k}"),
+                                key="noise_output")
+            temperature = st.number_input("Temperatura (K):", min_value=1.0, value=noise_analysis.DEFAULT_TEMPERATURE,
+                                          key="noise_temperature")
+        with col_b:
+            f_start = st.number_input("f inicial (Hz):", min_value=1e-3, value=10.0, key="noise_f_start")
+            f_end = st.number_input("f final (Hz):", min_value=1e-3, value=1e6, key="noise_f_end")
+        with col_c:
+            points = int(st.number_input("Pontos:", min_value=10, max_value=20000, value=400, key="noise_points"))
+            workers = int(st.number_input("Processos:", min_value=1, max_value=32, value=1, key="noise_workers"))
+        if f_end <= f_start:
+            st.error("❌ A frequência final deve ser maior que a inicial")
+            return
+
+        if not st.button("▶️ Calcular Ruído", key="run_noise"):
+            return
+
+        frequencies = np.logspace(np.log10(f_start), np.log10(f_end), points)
+        start = time.perf_counter()
+        result = noise_analysis.noise_analysis(netlist, node, frequencies, temperature=temperature, workers=workers)
+        elapsed = (time.perf_counter() - start) * 1000
+        ranking = result.ranking()
+        component_rms = result.component_rms
+
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=frequencies, y=result.density * 1e9, name="Total", line=dict(width=3)))
+        for k in ranking[:5]:
+            fig.add_trace(go.Scatter(x=frequencies, y=np.sqrt(result.contributions[:, k]) * 1e9,
+                                     name=result.labels[k], line=dict(dash="dot")))
+        fig.update_layout(xaxis_type="log", yaxis_type="log", xaxis_title="Frequência (Hz)",
+                          yaxis_title="Densidade (nV/√Hz)", height=400)
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.dataframe(pd.DataFrame([
+            {
+                "Componente": result.labels[k],
+                "Ruído integrado (µV)": f"{component_rms[k] * 1e6:.4g}",
+                "Participação (%)": f"{(component_rms[k] / result.rms) ** 2 * 100:.1f}" if result.rms > 0 else "0.0",
+            }
+            for k in ranking
+        ]), use_container_width=True)
+        st.caption(f"⚡ Ruído eficaz {result.rms * 1e6:.4g} µV entre {f_start:g} e {f_end:g} Hz; "
+                   f"{points} substituições adjuntas em {elapsed:.1f} ms")
+
+def show_power_flow(builder: CircuitBuilder):
+    """Fluxo de potência por barra (Newton ou desacoplado rápido) e correção do FP em cada barra de carga"""
+    with st.expander("🏭 Fluxo de Potência"):
+        try:
+            netlist = get_incremental_solver(builder).netlist
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+        sources = [e for e in netlist.elements if e.type == ComponentType.VOLTAGE_SOURCE]
+        if netlist.node_count == 0 or not sources:
+            st.info("O fluxo de potência requer uma fonte de tensão (barra de referência)")
+            return
+
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            frequency = st.number_input("Frequência (Hz):", min_value=0.1, value=60.0, key="pf_frequency")
+            method = st.selectbox("Método:", power_flow.METHODS,
+                                  format_func=lambda m: {"newton": "Newton-Raphson",
+                                                         "fast_decoupled": "Desacoplado rápido"}[m],
+                                  key="pf_method")
+        with col_b:
+            constant_power = st.checkbox("Cargas para o terra como potência constante", value=True,
+                                         key="pf_constant_power")
+            desired_fp = st.number_input("FP desejado:", min_value=0.5, max_value=1.0, value=0.95, key="pf_desired_fp")
+        with col_c:
+            # Fontes além da primeira são barras PV: |V| da fonte e P gerada informada
+            generation = {
+                source.id: st.number_input(f"P gerada por {source.label} (kW):", value=0.0,
+                                           key=f"pf_generation_{source.id}") * 1e3
+                for source in sources[1:]
+            }
+
+        if not st.button("▶️ Calcular Fluxo de Potência", key="run_power_flow"):
+            return
+
+        try:
+            start = time.perf_counter()
+            case = power_flow.case_from_netlist(netlist, frequency, generation, constant_power)
+            result = power_flow.solve_power_flow(case, method)
+            elapsed = (time.perf_counter() - start) * 1000
+        except (ValueError, RuntimeError) as e:
+            st.warning(f"⚠️ {e}")
+            return
+        corrections = power_flow.power_factor_corrections(result, frequency, desired_fp)
+
+        reference = abs(case.voltage[case.bus_types == power_flow.SLACK][0])
+        rows = []
+        for bus in range(case.bus_count):
+            node = int(case.nodes[bus])
+            correction = corrections.get(node)
+            rows.append({
+                "Barra": case.names[bus],
+                "Tipo": case.bus_types[bus],
+                "|V| (V)": f"{result.magnitude[bus]:.2f}",
+                "|V| (pu)": f"{result.magnitude[bus] / reference:.4f}",
+                "θ (°)": f"{result.angle[bus]:.3f}",
+                "P carga (kW)": f"{case.load[bus].real / 1e3:.3f}",
+                "Q carga (kvar)": f"{case.load[bus].imag / 1e3:.3f}",
+                "Correção FP": (f"{correction['capacitance_uF']:.2f} µF" if correction['q_capacitor'] > 0
+                                else f"{abs(correction['q_capacitor']) / 1e3:.3f} kvar indutivo")
+                               if correction else "—",
+            })
+        st.dataframe(pd.DataFrame(rows), use_container_width=True)
+
+        losses = result.losses
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Iterações", result.iterations)
+        col1.metric("Desbalanço final", f"{result.mismatch:.3g} VA")
+        col2.metric("Perdas ativas", f"{losses.real / 1e3:.4f} kW")
+        col2.metric("Perdas reativas", f"{losses.imag / 1e3:.4f} kvar")
+        col3.metric("Menor tensão", f"{result.magnitude.min() / reference:.4f} pu")
+        col3.metric("Capacitores", f"{sum(c['q_capacitor'] > 0 for c in corrections.values())} barras")
+        st.caption(f"⚡ {case.bus_count} barras e {len(case.branch_ids)} ramos (séries sem derivação viram um "
+                   f"ramo equivalente) resolvidos em {elapsed:.1f} ms; a correção usa o |V| calculado de cada barra")
+
+def show_line_profile(builder: CircuitBuilder):
+    """Perfil de tensão ao longo das linhas de transmissão a partir da solução nodal"""
+    lines = [comp for comp in builder.components.values() if comp.type == ComponentType.TRANSMISSION_LINE]
+    if not lines:
+        return
+
+    with st.expander("〰️ Perfil da Linha de Transmissão"):
+        try:
+            netlist = get_incremental_solver(builder).netlist
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+
+        col_a, col_b = st.columns(2)
+        with col_a:
+            line = st.selectbox("Linha:", lines, format_func=lambda comp: comp.label, key="line_profile_id")
+        with col_b:
+            frequency = st.number_input("Frequência (Hz):", min_value=0.0, value=60.0, key="line_profile_f")
+
+        if not st.button("▶️ Calcular Perfil", key="run_line_profile"):
+            return
+
+        element = netlist.element(line.id)
+        start = time.perf_counter()
+        solution = CircuitSolver(netlist).solve(frequency)
+        positions, voltages = transmission_line.voltage_profile(
+            element.parameters, element.value, frequency,
+            solution.node_voltage(element.node1), solution.node_voltage(element.node2)
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+
+        fig = go.Figure(go.Scatter(x=positions, y=np.abs(voltages), mode='lines', name="|V(x)|"))
+        fig.update_layout(title=f"Tensão ao longo de {line.label}", xaxis_title="Posição (m)",
+                          yaxis_title="|V| (V)", height=300)
+        st.plotly_chart(fig, use_container_width=True)
+        segments = element.parameters['segments']
+        model = f"escada de {segments} seções" if segments else "linha distribuída"
+        st.caption(f"⚡ Quadripolo em forma fechada ({model}) em {elapsed:.2f} ms; "
+                   f"potência absorvida {np.real(solution.power(line.id)):.4g} W")
+
+def show_natural_modes(builder: CircuitBuilder):
+    """Polos, zeros e modos naturais (fₙ, ζ, τ) pelos autovalores generalizados do MNA"""
+    with st.expander("🎯 Polos, Zeros e Modos Naturais"):
+        try:
+            netlist = get_incremental_solver(builder).netlist
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+
+        size = get_incremental_solver(builder).system.size
+        col_a, col_b = st.columns(2)
+        with col_a:
+            count = st.number_input("Modos (circuitos grandes):", min_value=1, max_value=100, value=10,
+                                    key="modes_count")
+        with col_b:
+            frequency = st.number_input("Faixa de interesse em torno de (Hz):", min_value=0.0, value=0.0,
+                                        key="modes_frequency")
+
+        # Circuitos pequenos: todos os polos pelo QZ; grandes: os `count` mais próximos da faixa
+        dense = size <= modal_analysis.DENSE_LIMIT
+        count = None if dense else int(count)
+        sources = [element for element in netlist.elements
+                   if element.type in (ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE)]
+        source = node = None
+        if sources and netlist.node_count:
+            col_c, col_d = st.columns(2)
+            with col_c:
+                source = st.selectbox("Zeros da fonte:", sources, format_func=lambda element: element.label,
+                                      key="modes_zero_source")
+            with col_d:
+                node = st.selectbox("para a tensão do nó:", list(range(1, netlist.node_count + 1)),
+                                    format_func=lambda k: netlist.node_names.get(k, f"N{k}"), key="modes_zero_node")
+
+        if not st.button("▶️ Calcular Polos e Zeros", key="run_natural_modes"):
+            return
+
+        start = time.perf_counter()
+        try:
+            poles = modal_analysis.poles(netlist, count, frequency)
+            elapsed = (time.perf_counter() - start) * 1000
+            zeros = modal_analysis.zeros(netlist, source.id, node, count, frequency) if source else None
+        except (RuntimeError, ValueError, np.linalg.LinAlgError) as e:
+            st.warning(f"⚠️ Não foi possível extrair os polos e zeros: {e}")
+            return
+        modes = modal_analysis.natural_modes(poles)
+        if not modes:
+            st.info("Circuito sem elementos armazenadores de energia: não há modos naturais")
+            return
+
+        modes_df = pd.DataFrame([
+            {
+                "Polo s (rad/s)": f"{mode.pole.real:.4g} {mode.pole.imag:+.4g}j",
+                "fₙ (Hz)": f"{mode.natural_frequency:.4g}",
+                "ζ": f"{mode.damping:.4f}",
+                "τ (s)": f"{mode.time_constant:.4g}",
+            }
+            for mode in modes
+        ])
+        st.dataframe(modes_df, use_container_width=True)
+
+        fig = go.Figure(go.Scatter(x=poles.real, y=poles.imag, mode='markers', name="Polos",
+                                   marker=dict(symbol='x', size=11, color='#e74c3c')))
+        if zeros is not None:
+            fig.add_trace(go.Scatter(x=zeros.real, y=zeros.imag, mode='markers', name="Zeros",
+                                     marker=dict(symbol='circle-open', size=11, color='#27ae60')))
+        fig.update_layout(title="Plano s", xaxis_title="σ (1/s)", yaxis_title="jω (rad/s)", height=350)
+        st.plotly_chart(fig, use_container_width=True)
+        method = "QZ denso" if dense else "Arnoldi com deslocamento-inversão"
+        st.caption(f"⚡ {len(poles)} polos de {size} incógnitas por {method} em {elapsed:.2f} ms")
+
+def show_model_reduction(builder: CircuitBuilder):
+    """Bode do modelo reduzido por PRIMA, com estimativa de erro e comparação opcional com o completo"""
+    with st.expander("📉 Redução de Ordem (PRIMA)"):
+        try:
+            netlist = get_incremental_solver(builder).netlist
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+
+        sources = [element for element in netlist.elements
+                   if element.type in (ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE)]
+        if not sources or netlist.node_count == 0:
+            st.info("A redução requer ao menos uma fonte e um nó")
+            return
+
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            source = st.selectbox("Entrada:", sources, format_func=lambda element: element.label,
+                                  key="prima_input")
+            node = st.selectbox("Saída (nó):", list(range(1, netlist.node_count + 1)),
+                                format_func=lambda k: netlist.node_names.get(k, f"N{k}"), key="prima_output")
+        with col_b:
+            f_start = st.number_input("f inicial (Hz):", min_value=1e-3, value=10.0, key="prima_f_start")
+            f_end = st.number_input("f final (Hz):", min_value=1e-3, value=1e5, key="prima_f_end")
+        with col_c:
+            order = st.number_input("Ordem do modelo:", min_value=1, max_value=200, value=10, key="prima_order")
+            f_expansion = st.number_input("Frequência de expansão (Hz):", min_value=0.0,
+                                          value=float(np.sqrt(f_start * f_end)), key="prima_expansion")
+        compare = st.checkbox("Comparar com o modelo completo", key="prima_compare")
+        if f_end <= f_start:
+            st.error("❌ A frequência final deve ser maior que a inicial")
+            return
+
+        if not st.button("▶️ Reduzir Modelo", key="run_prima"):
+            return
+
+        frequencies = np.logspace(np.log10(f_start), np.log10(f_end), 400)
+        start = time.perf_counter()
+        model = model_reduction.prima(netlist, int(order), [node], [source.id], f_expansion)
+        H = model.transfer(frequencies)[:, 0, 0]
+        elapsed = (time.perf_counter() - start) * 1000
+        error = model.error_estimate(frequencies)
+
+        fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
+                            subplot_titles=("Magnitude (dB)", "Erro relativo estimado"))
+        fig.add_trace(go.Scatter(x=frequencies, y=20 * np.log10(np.abs(H) + 1e-300),
+                                 name=f"Reduzido (ordem {model.order})"), row=1, col=1)
+        if compare:
+            start = time.perf_counter()
+            H_full = model_reduction.full_transfer(netlist, frequencies, [node], [source.id])[:, 0, 0]
+            full_elapsed = (time.perf_counter() - start) * 1000
+            fig.add_trace(go.Scatter(x=frequencies, y=20 * np.log10(np.abs(H_full) + 1e-300),
+                                     name="Completo", line=dict(dash='dot')), row=1, col=1)
+        fig.add_trace(go.Scatter(x=frequencies, y=error, name="Estimativa de erro"), row=2, col=1)
+        fig.update_xaxes(type="log", title_text="Frequência (Hz)", row=2, col=1)
+        fig.update_xaxes(type="log", row=1, col=1)
+        fig.update_yaxes(type="log", row=2, col=1)
+        fig.update_layout(height=500)
+        st.plotly_chart(fig, use_container_width=True)
+        caption = (f"⚡ Ordem {model.order} (de {model.basis.shape[0]} incógnitas) em {elapsed:.2f} ms, "
+                   f"erro estimado máximo {error.max():.2e}")
+        if compare:
+            caption += f"; modelo completo em {full_elapsed:.2f} ms"
+        st.caption(caption)
+
+def show_transient_analysis(builder: CircuitBuilder):
+    """Simula o transitório da netlist (fontes ligadas em t = 0) e plota as tensões nodais"""
+    switches = [comp for comp in builder.components.values() if comp.type == ComponentType.SWITCH]
+    nonlinear = any(comp.type in NONLINEAR_TYPES for comp in builder.components.values())
+
+    with st.expander("🚀 Transitório da Netlist"):
+        col_a, col_b = st.columns(2)
+        with col_a:
+            t_stop_ms = st.number_input("Tempo final (ms):", min_value=0.01, value=20.0, key="netlist_t_stop")
+        with col_b:
+            if nonlinear:
+                # Newton-Raphson com passo fixo: trapézio ou Euler implícito
+                method = st.selectbox("Integração:", nonlinear_solver.INTEGRATION_METHODS,
+                                      format_func=lambda m: {"trap": "Trapezoidal", "euler": "Euler implícito"}[m],
+                                      key="netlist_nonlinear_method")
+                step_us = st.number_input("Passo (µs):", min_value=0.001, value=10.0, key="netlist_step")
+            else:
+                method = st.selectbox("Integração:", ["trap", "bdf2"],
+                                      format_func=lambda m: {"trap": "Trapezoidal", "bdf2": "BDF2"}[m],
+                                      key="netlist_method")
+
+        # Chaves: fechadas em t = 0, com instantes opcionais de abertura e religamento
+        switch_events = []
+        for switch in switches:
+            col_open, col_close = st.columns(2)
+            with col_open:
+                t_open = st.number_input(f"{switch.label} abre em (ms):", min_value=0.0, value=0.0,
+                                         key=f"switch_open_{switch.id}")
+            with col_close:
+                t_close = st.number_input(f"{switch.label} fecha em (ms):", min_value=0.0, value=0.0,
+                                          key=f"switch_close_{switch.id}")
+            if t_open > 0:
+                switch_events.append(SwitchEvent(t_open / 1000, switch.id, False))
+            if t_close > 0:
+                switch_events.append(SwitchEvent(t_close / 1000, switch.id, True))
+
+        if st.button("▶️ Simular Transitório", key="run_netlist_transient"):
+            try:
+                netlist = build_netlist(builder)
+                if nonlinear:
+                    # Newton-Raphson com passo fixo a partir do estado nulo, chaves comutando nos eventos
+                    simulator = nonlinear_solver.NonlinearSimulator(netlist, method=method)
+                    result = simulator.run(t_stop_ms / 1000, step_us * 1e-6,
+                                           initial_state=np.zeros(simulator.system.size),
+                                           switch_events=switch_events)
+                else:
+                    result = TransientSimulator(netlist, method=method).run(
+                        t_stop_ms / 1000, switch_events=switch_events
+                    )
+            except (ValueError, RuntimeError) as e:
+                st.warning(f"⚠️ {e}")
+                return
+
+            fig = go.Figure()
+            for node in range(1, netlist.node_count + 1):
+                fig.add_trace(go.Scatter(
+                    x=result.time * 1000, y=result.node_voltage(node),
+                    name=netlist.node_names.get(node, f"N{node}"), mode='lines'
+                ))
+            fig.update_layout(
+                title="Tensões Nodais",
+                xaxis_title="Tempo (ms)",
+                yaxis_title="Tensão (V)",
+                height=300
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption(f"📈 {result.accepted_steps} passos aceitos, {result.rejected_steps} rejeitados, "
+                       f"{result.factorizations} fatorações")
+
+def show_power_electronics_examples():
+    """Retificador em ponte e PFC boost resolvidos por Newton-Raphson, com as estatísticas por passo"""
+    with st.expander("🔋 Retificador e PFC (Newton-Raphson)"):
+        example = st.selectbox("Circuito:", ["rectifier", "pfc"],
+                               format_func=lambda e: {"rectifier": "Retificador em ponte com filtro C",
+                                                      "pfc": "PFC boost (PWM em malha aberta)"}[e],
+                               key="nonlinear_example")
+        col_a, col_b = st.columns(2)
+        with col_a:
+            t_stop_ms = st.number_input("Tempo final (ms):", min_value=0.1,
+                                        value=33.3 if example == "rectifier" else 2.0, key="nonlinear_t_stop")
+        with col_b:
+            step_us = st.number_input("Passo (µs):", min_value=0.01,
+                                      value=20.0 if example == "rectifier" else 0.5, key="nonlinear_step")
+
+        if st.button("▶️ Simular", key="run_nonlinear_example"):
+            netlist, sources = (nonlinear_solver.bridge_rectifier() if example == "rectifier"
+                                else nonlinear_solver.boost_pfc())
+            start = time.perf_counter()
+            try:
+                result = nonlinear_solver.NonlinearSimulator(netlist).run(t_stop_ms / 1000, step_us * 1e-6, sources)
+            except RuntimeError as e:
+                st.warning(f"⚠️ {e}")
+                return
+            elapsed = time.perf_counter() - start
+
+            fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
+                                subplot_titles=("Tensões", "Corrente da fonte"))
+            bus = 3 if example == "rectifier" else 6
+            fig.add_trace(go.Scatter(x=result.time * 1000, y=result.node_voltage(bus), name="Barramento CC"),
+                          row=1, col=1)
+            fig.add_trace(go.Scatter(x=result.time * 1000, y=result.element_voltage("Vac"), name="Rede"),
+                          row=1, col=1)
+            fig.add_trace(go.Scatter(x=result.time * 1000, y=result.element_current("Vac"), name="i_rede"),
+                          row=2, col=1)
+            fig.update_layout(height=450)
+            fig.update_xaxes(title_text="Tempo (ms)", row=2, col=1)
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption(f"⚡ {result.accepted_steps} passos em {elapsed:.2f} s: "
+                       f"{result.factorizations_per_step:.2f} fatorações e "
+                       f"{result.iterations_per_step:.1f} iterações de Newton por passo")
+
+def show_periodic_steady_state(builder: CircuitBuilder):
+    """Regime permanente periódico por balanço harmônico: fasores por harmônico, espectro e FP não senoidal"""
+    with st.expander("🎼 Regime Permanente Periódico (Balanço Harmônico)"):
+        circuit = st.selectbox("Circuito:", ["builder", "rectifier"],
+                               format_func=lambda c: {"builder": "Circuito desenhado (fontes senoidais de pico)",
+                                                      "rectifier": "Retificador em ponte com filtro C"}[c],
+                               key="hb_circuit")
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            frequency = st.number_input("Frequência fundamental (Hz):", min_value=0.1, value=60.0, key="hb_frequency")
+        with col_b:
+            harmonics = int(st.number_input("Harmônicos:", min_value=1, max_value=200, value=25, key="hb_harmonics"))
+        with col_c:
+            desired_fp = st.number_input("FP desejado:", min_value=0.5, max_value=1.0, value=0.95, key="hb_desired_fp")
+
+        try:
+            if circuit == "rectifier":
+                netlist, sources = nonlinear_solver.bridge_rectifier(frequency=frequency)
+            else:
+                netlist, sources = build_netlist(builder), None
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+            return
+        labels = {element.id: element.label for element in netlist.elements}
+        element_id = st.selectbox("Elemento para espectro e potências:", list(labels),
+                                  format_func=lambda e: labels[e], key="hb_element")
+
+        if st.button("▶️ Calcular Regime Permanente", key="run_harmonic_balance"):
+            start = time.perf_counter()
+            try:
+                solution = harmonic_balance.HarmonicBalanceSolver(netlist, frequency, harmonics).solve(sources)
+            except (ValueError, RuntimeError) as e:
+                st.warning(f"⚠️ {e}")
+                return
+            elapsed = time.perf_counter() - start
+            st.caption(f"⚡ {solution.iterations} iterações e {solution.factorizations} fatorações "
+                       f"em {elapsed:.2f} s ({2 * harmonics + 1} coeficientes por incógnita)")
+
+            # Fasores nodais por harmônico (amplitude de pico)
+            shown = min(harmonics, 15)
+            rows = []
+            for node in range(1, netlist.node_count + 1):
+                phasors = solution.node_phasors(node)
+                row = {"Nó": netlist.node_names.get(node, f"N{node}")}
+                row.update({f"h{k}": f"{abs(phasors[k]):.4g}∠{np.degrees(np.angle(phasors[k])):.1f}°"
+                            for k in range(shown + 1)})
+                rows.append(row)
+            st.dataframe(pd.DataFrame(rows), use_container_width=True)
+
+            # Um período de tensão e corrente do elemento, e o espectro pelo HarmonicAnalyzer
+            element = netlist.element(element_id)
+            delivered = element.type in (ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE)
+            t, voltage = solution.waveform(solution.element_voltage(element_id))
+            _, current = solution.waveform(solution.element_current(element_id))
+            current = -current if delivered else current
+            freqs, amplitudes = HarmonicAnalyzer.analyze_harmonics(current, frequency, harmonics + 1)
+
+            fig = make_subplots(rows=1, cols=2, subplot_titles=("Um período", "Espectro da corrente"))
+            fig.add_trace(go.Scatter(x=t * 1000, y=voltage, name="v"), row=1, col=1)
+            fig.add_trace(go.Scatter(x=t * 1000, y=current, name="i"), row=1, col=1)
+            fig.add_trace(go.Bar(x=freqs, y=amplitudes, name="|I_h|"), row=1, col=2)
+            fig.update_xaxes(title_text="Tempo (ms)", row=1, col=1)
+            fig.update_xaxes(title_text="Frequência (Hz)", row=1, col=2)
+            fig.update_layout(height=400)
+            st.plotly_chart(fig, use_container_width=True)
+
+            metrics = solution.power_metrics(element_id, delivered=delivered)
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("P", f"{metrics['active']:.2f} W")
+            col1.metric("Q₁", f"{metrics['reactive']:.2f} var")
+            col2.metric("S", f"{metrics['apparent']:.2f} VA")
+            col2.metric("D", f"{metrics['distortion']:.2f} VA")
+            col3.metric("FP total", f"{metrics['power_factor']:.3f}")
+            col3.metric("FP deslocamento", f"{metrics['displacement_power_factor']:.3f}")
+            col4.metric("THD corrente", f"{metrics['thd_current'] * 100:.1f}%")
+            col4.metric("THD tensão", f"{metrics['thd_voltage'] * 100:.1f}%")
+
+            # Correção do FP: o capacitor só compensa Q₁; a distorção continua limitando o FP total
+            results = CalculationResults(
+                voltage_rms=metrics['voltage_rms'], current_rms=metrics['current_rms'],
+                power_factor=metrics['power_factor'], power_active=metrics['active'],
+                power_reactive=metrics['reactive'], power_apparent=metrics['apparent'],
+                impedance_magnitude=metrics['voltage_rms'] / metrics['current_rms'] if metrics['current_rms'] else 0.0,
+                impedance_angle=float(np.degrees(np.arccos(np.clip(metrics['displacement_power_factor'], -1, 1)))),
+                circuit_type="Não senoidal", phase_difference=0.0,
+            )
+            correction = PowerFactorCorrector().calculate_correction(results, metrics['voltage_rms'], frequency,
+                                                                     desired_fp)
+            if correction:
+                compensation = (f"capacitor de {correction['capacitance_uF']:.2f} µF" if correction['q_capacitor'] > 0
+                                else f"compensação indutiva de {abs(correction['q_capacitor']):.3g} var")
+                st.info(f"🔧 Para FP {desired_fp:.2f}: {compensation}; "
+                        f"com D = {metrics['distortion']:.3g} VA o FP total fica limitado a "
+                        f"{metrics['active'] / np.hypot(metrics['active'], metrics['distortion']):.3f}")
+
+def show_three_phase_analysis():
+    """Carga trifásica Y/Δ equilibrada ou não: grandezas de fase e linha, neutro, Fortescue e potências"""
+    with st.expander("🔺 Sistema Trifásico"):
+        # Valores iniciais do preset industrial (uma fase): 380 V de linha e 50 A atrasados de 30°
+        preset = PresetManager.get_preset("Industrial 380V")
+        line_voltage = preset["voltage_max"] / np.sqrt(2)
+        current = preset["current_max"] / np.sqrt(2)
+        default_z = line_voltage / np.sqrt(3) / current
+        default_angle = preset["voltage_angle"] - preset["current_angle"]
+
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            v_line = st.number_input("Tensão de linha (V eficaz):", min_value=1.0, value=round(line_voltage, 1),
+                                     key="tp_line_voltage")
+        with col_b:
+            connection = st.selectbox("Ligação da carga:", three_phase.CONNECTIONS, key="tp_connection")
+        with col_c:
+            neutral = st.selectbox("Neutro:", ["ideal", "impedance", "isolated"],
+                                   format_func=lambda n: {"ideal": "Solidamente ligado", "impedance": "Com impedância",
+                                                          "isolated": "Isolado (3 fios)"}[n],
+                                   disabled=connection == "Δ", key="tp_neutral")
+        neutral_impedance = 0.0 if neutral == "ideal" else None
+        if neutral == "impedance" and connection == "Y":
+            neutral_impedance = st.number_input("Z do neutro (Ω, resistiva):", min_value=1e-6, value=1.0,
+                                                key="tp_neutral_impedance")
+
+        names = ("a", "b", "c") if connection == "Y" else ("ab", "bc", "ca")
+        magnitudes, angles, supply = [], [], []
+        columns = st.columns(3)
+        for k, column in enumerate(columns):
+            with column:
+                supply.append(st.number_input(f"V_{'abc'[k]} (% nominal):", min_value=0.0, value=100.0,
+                                              key=f"tp_supply_{k}"))
+                magnitudes.append(st.number_input(f"|Z_{names[k]}| (Ω):", min_value=1e-6,
+                                                  value=round(default_z * (3 if connection == "Δ" else 1), 3),
+                                                  key=f"tp_z_{connection}_{k}"))
+                angles.append(st.number_input(f"∠Z_{names[k]} (°):", min_value=-90.0, max_value=90.0,
+                                              value=float(default_angle), key=f"tp_angle_{k}"))
+
+        phase = three_phase.balanced_set(v_line / np.sqrt(3)) * np.array(supply) / 100
+        impedances = np.array(magnitudes) * np.exp(1j * np.radians(angles))
+        result = (three_phase.wye_load(phase, impedances, neutral_impedance) if connection == "Y"
+                  else three_phase.delta_load(phase, impedances))
+
+        line = result.line_voltages
+        st.dataframe(pd.DataFrame([
+            {
+                "Fase": "abc"[k],
+                "V fase (V)": f"{abs(phase[k]):.1f} ∠ {np.degrees(np.angle(phase[k])):.1f}°",
+                "V linha (V)": f"{abs(line[k]):.1f} ∠ {np.degrees(np.angle(line[k])):.1f}° ({('ab', 'bc', 'ca')[k]})",
+                "I linha (A)": f"{abs(result.line_currents[k]):.2f} ∠ "
+                               f"{np.degrees(np.angle(result.line_currents[k])):.1f}°",
+                "I carga (A)": f"{abs(result.load_currents[k]):.2f} ({names[k]})",
+                "P (kW)": f"{result.active[k] / 1000:.3f}",
+                "Q (kvar)": f"{result.reactive[k] / 1000:.3f}",
+                "S (kVA)": f"{result.apparent[k] / 1000:.3f}",
+            }
+            for k in range(3)
+        ]), use_container_width=True)
+
+        total = result.total_power
+        voltage_unbalance = result.voltage_unbalance
+        current_unbalance = result.current_unbalance
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("P total", f"{total.real / 1000:.3f} kW")
+        col1.metric("Q total", f"{total.imag / 1000:.3f} kvar")
+        col2.metric("S total", f"{abs(total) / 1000:.3f} kVA")
+        col2.metric("FP trifásico", f"{result.power_factor:.3f}")
+        col3.metric("Corrente de neutro", f"{abs(result.neutral_current):.2f} A")
+        col3.metric("Deslocamento do neutro", f"{abs(result.neutral_voltage):.1f} V")
+        col4.metric("Desequilíbrio de I (I₂/I₁)", f"{current_unbalance['negative'] * 100:.1f}%")
+        col4.metric("Desequilíbrio de V (V₂/V₁)", f"{voltage_unbalance['negative'] * 100:.2f}%")
+
+        voltage_sequence, current_sequence = result.voltage_sequence, result.current_sequence
+        st.dataframe(pd.DataFrame([
+            {
+                "Sequência": name,
+                "V (V)": f"{abs(voltage_sequence[k]):.2f} ∠ {np.degrees(np.angle(voltage_sequence[k])):.1f}°",
+                "I (A)": f"{abs(current_sequence[k]):.2f} ∠ {np.degrees(np.angle(current_sequence[k])):.1f}°",
+            }
+            for k, name in enumerate(("Zero", "Positiva", "Negativa"))
+        ]), use_container_width=True)
+        st.caption(f"NEMA (desvio máximo da média): tensão {voltage_unbalance['nema'] * 100:.2f}%, "
+                   f"corrente {current_unbalance['nema'] * 100:.1f}%")
+
+        fig = go.Figure()
+        scale = np.abs(phase).max() / max(np.abs(result.line_currents).max(), 1e-12)
+        for k, color in enumerate(("#c0392b", "#2c3e50", "#2980b9")):
+            for value, dash, label in ((phase[k], "solid", "V"), (result.line_currents[k] * scale, "dot", "I")):
+                fig.add_trace(go.Scatterpolar(r=[0, abs(value)], theta=[0, np.degrees(np.angle(value))],
+                                              mode="lines+markers", line=dict(color=color, dash=dash),
+                                              name=f"{label}_{'abc'[k]}"))
+        fig.update_layout(title="Diagrama fasorial (correntes em escala)", height=400)
+        st.plotly_chart(fig, use_container_width=True)
+
 def handle_click_event(builder: CircuitBuilder, x: float, y: float, mode: str):
     """Processa eventos de clique na área de desenho"""
     
@@ -409,9 +1398,15 @@ def handle_click_event(builder: CircuitBuilder, x: float, y: float, mode: str):
             component_value = st.session_state.get('component_value', 100.0)
             component_unit = st.session_state.get('component_unit', '')
             
+            parameters = None
+            if st.session_state.selected_component_type == ComponentType.TRANSMISSION_LINE:
+                parameters = dict(st.session_state.get('line_parameters', {}))
+            elif st.session_state.selected_component_type in device_models.DEVICE_DEFAULTS:
+                parameters = dict(st.session_state.get('device_parameters', {}))
+            
             component_id = builder.add_component(
                 st.session_state.selected_component_type,
-                x, y, component_value, component_unit
+                x, y, component_value, component_unit, parameters
             )
             st.success(f"✅ Componente adicionado! ID: {component_id[:8]}...")
             st.rerun()
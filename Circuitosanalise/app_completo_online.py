@@ -7,7 +7,8 @@ import pandas as pd
 from matplotlib.patches import Circle, Rectangle
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import scipy.signal as signal
+import rlc_transient
+from adaptive_sweep import adaptive_frequency_sweep, series_rlc_poles
 
 # Configuração da página
 st.set_page_config(
@@ -282,18 +283,17 @@ class CircuitAnalyzerPro:
         
         return fig
     
+    def sample_admittance(self, r, l, c, f_start=1.0, f_end=1e5):
+        """Admitância 1/Z(jω) com varredura adaptativa (densa só perto da ressonância)"""
+        def admittance(f):
+            s = 2j * np.pi * f
+            return 1 / (r + s * l + 1 / (s * c))
+        return adaptive_frequency_sweep(admittance, f_start, f_end, poles=series_rlc_poles(r, l, c))
+    
     def plot_frequency_response(self, r, l, c):
         """Plota resposta em frequência (Bode)"""
-        # Faixa de frequências (1 Hz a 100 kHz)
-        frequencies = np.logspace(0, 5, 1000)  # 1 Hz to 100 kHz
-        omega = 2 * np.pi * frequencies
-        
-        # Função de transferência do circuito RLC
-        s = 1j * omega
-        
-        # Impedância total
-        Z = r + s * l + 1 / (s * c)
-        H = 1 / Z  # Admitância (ou outra função de transferência desejada)
+        # Faixa de frequências (1 Hz a 100 kHz), amostrada adaptativamente
+        frequencies, H = self.sample_admittance(r, l, c)
         
         # Magnitude e fase
         magnitude_db = 20 * np.log10(np.abs(H))
@@ -341,29 +341,13 @@ class CircuitAnalyzerPro:
     
     def plot_transient_response(self, r, l, c):
         """Plota resposta transitória"""
-        # Parâmetros do sistema
-        # Para circuito RLC série: s² + (R/L)s + 1/(LC) = 0
-        
-        # Coeficientes da equação característica
-        a = 1
-        b = r / l
-        c_coef = 1 / (l * c)
-        
-        # Criar sistema em espaço de estados
-        # Para um sistema de segunda ordem
-        num = [1/(l*c)]  # Numerador
-        den = [1, r/l, 1/(l*c)]  # Denominador
-        
-        system = signal.TransferFunction(num, den)
-        
         # Tempo de simulação
         t = np.linspace(0, 0.1, 1000)  # 100ms
         
-        # Resposta ao degrau
-        t_step, y_step = signal.step_response(system, T=t)
-        
-        # Resposta ao impulso
-        t_impulse, y_impulse = signal.impulse_response(system, T=t)
+        # Respostas em forma fechada da tensão no capacitor (H(s) = 1/(LCs² + RCs + 1))
+        y_step, _ = rlc_transient.step_response(t, r, l, c)
+        y_impulse, _ = rlc_transient.impulse_response(t, r, l, c)
+        t_step = t_impulse = t
         
         # Criar subplot
         fig = make_subplots(
@@ -401,13 +385,8 @@ class CircuitAnalyzerPro:
     
     def plot_nyquist(self, r, l, c):
         """Plota diagrama de Nyquist"""
-        # Faixa de frequências
-        frequencies = np.logspace(0, 5, 1000)
-        omega = 2 * np.pi * frequencies
-        s = 1j * omega
-        
-        # Função de transferência
-        H = 1 / (r + s * l + 1 / (s * c))
+        # Função de transferência (admitância), amostrada adaptativamente
+        frequencies, H = self.sample_admittance(r, l, c)
         
         real_part = np.real(H)
         imag_part = np.imag(H)
@@ -2,6 +2,8 @@ import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
 import math
+import os
+import tempfile
 import cmath
 import pandas as pd
 from matplotlib.patches import Circle, Rectangle
@@ -10,6 +12,17 @@ from plotly.subplots import make_subplots
 import scipy.signal as signal
 from matplotlib.patches import Circle as MPLCircle
 import matplotlib.patches as patches
+import state_space
+import rlc_transient
+import response_atlas
+import response_metrics
+import design_space
+import component_selection
+import monte_carlo
+import modal_analysis
+from circuit_editor import ComponentType
+from circuit_solver import Netlist
+from adaptive_sweep import adaptive_frequency_sweep, series_rlc_poles
 
 # Configuração da página
 st.set_page_config(
@@ -402,13 +415,14 @@ class CircuitAnalyzerProfessional:
         """Plota resposta em frequência completa com Bode e Nyquist"""
         # Faixa de frequências
         f_start, f_end = 10**freq_range[0], 10**freq_range[1]
-        frequencies = np.logspace(freq_range[0], freq_range[1], 2000)
-        omega = 2 * np.pi * frequencies
         
-        # Função de transferência - Impedância do circuito
-        s = 1j * omega
-        Z = r + s * l + 1 / (s * c)
-        H = 1 / Z  # Admitância como função de transferência
+        # Função de transferência - Admitância do circuito, amostrada adaptativamente
+        # (refina perto da ressonância até 0.05 dB / 0.5° de erro de interpolação)
+        def admittance(f):
+            s = 2j * np.pi * f
+            return 1 / (r + s * l + 1 / (s * c))
+        frequencies, H = adaptive_frequency_sweep(admittance, f_start, f_end,
+                                                  poles=series_rlc_poles(r, l, c))
         
         # Magnitude e fase
         magnitude_db = 20 * np.log10(np.abs(H))
@@ -463,36 +477,27 @@ class CircuitAnalyzerProfessional:
             fig.add_vline(x=f_res, line_dash="dash", line_color="orange", 
                          row=2, col=1)
         
-        # Análise de polos e zeros (simplified)
-        wn = 1 / np.sqrt(l * c)
-        zeta = r / (2 * np.sqrt(l / c))
+        # Polos e zeros da admitância I/V: autovalores generalizados do MNA do RLC série
+        netlist = Netlist(node_count=0)
+        netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 1.0, "V")
+        netlist.add_element(ComponentType.RESISTOR, 1, 2, r, "R")
+        netlist.add_element(ComponentType.INDUCTOR, 2, 3, l, "L")
+        netlist.add_element(ComponentType.CAPACITOR, 3, 0, c, "C")
+        circuit_poles = modal_analysis.poles(netlist)
+        circuit_zeros = modal_analysis.zeros(netlist, "V", "V")
         
-        if zeta < 1:
-            # Polos complexos conjugados
-            sigma = -zeta * wn
-            wd = wn * np.sqrt(1 - zeta**2)
-            pole1 = complex(sigma, wd)
-            pole2 = complex(sigma, -wd)
-        else:
-            # Polos reais
-            pole1 = -wn * (zeta + np.sqrt(zeta**2 - 1))
-            pole2 = -wn * (zeta - np.sqrt(zeta**2 - 1))
-        
-        # Plot polos no plano s
-        if isinstance(pole1, complex):
-            fig.add_trace(
-                go.Scatter(x=[pole1.real, pole2.real], y=[pole1.imag, pole2.imag],
-                          mode='markers', marker=dict(color='red', size=12, symbol='x'),
-                          name='Polos'),
-                row=2, col=2
-            )
-        else:
-            fig.add_trace(
-                go.Scatter(x=[pole1, pole2], y=[0, 0],
-                          mode='markers', marker=dict(color='red', size=12, symbol='x'),
-                          name='Polos'),
-                row=2, col=2
-            )
+        fig.add_trace(
+            go.Scatter(x=circuit_poles.real, y=circuit_poles.imag,
+                      mode='markers', marker=dict(color='red', size=12, symbol='x'),
+                      name='Polos'),
+            row=2, col=2
+        )
+        fig.add_trace(
+            go.Scatter(x=circuit_zeros.real, y=circuit_zeros.imag,
+                      mode='markers', marker=dict(color='#10b981', size=12, symbol='circle-open'),
+                      name='Zeros'),
+            row=2, col=2
+        )
         
         # Layout
         fig.update_layout(
@@ -519,33 +524,17 @@ class CircuitAnalyzerProfessional:
         wn = 1 / math.sqrt(l * c)
         zeta = r / (2 * math.sqrt(l / c))
         
-        # Coeficientes da equação diferencial
-        # s² + (R/L)s + 1/(LC) = 0
-        num = [1/(l*c)]  # Numerador
-        den = [1, r/l, 1/(l*c)]  # Denominador
-        
-        system = signal.TransferFunction(num, den)
-        
-        # Tempo de simulação
+        # Atlas normalizado (ζ, ωₙt): as três curvas saem de uma única consulta,
+        # com avaliação direta em forma fechada fora da faixa tabelada
         t = np.linspace(0, sim_time, 2000)
+        responses = response_atlas.get_atlas().responses(t, r, l, c)
+        y_step, _ = responses["step"]
+        y_impulse, _ = responses["impulse"]
+        t_step = t_impulse = t
         
-        # Respostas
-        t_step, y_step = signal.step_response(system, T=t)
-        t_impulse, y_impulse = signal.impulse_response(system, T=t)
-        
-        # Resposta natural (condições iniciais)
-        if zeta < 1:
-            # Sub-amortecida
-            wd = wn * math.sqrt(1 - zeta**2)
-            y_natural = np.exp(-zeta * wn * t) * np.cos(wd * t)
-        elif zeta == 1:
-            # Criticamente amortecida
-            y_natural = (1 + wn * t) * np.exp(-wn * t)
-        else:
-            # Super-amortecida
-            r1 = -wn * (zeta + math.sqrt(zeta**2 - 1))
-            r2 = -wn * (zeta - math.sqrt(zeta**2 - 1))
-            y_natural = 0.5 * (np.exp(r1 * t) + np.exp(r2 * t))
+        # Resposta natural: descarga com vC(0) = 1 e i(0) = 0
+        y_natural, _ = responses["natural"]
+        regime = rlc_transient.response_regime(zeta)
         
         # Criar subplot
         fig = make_subplots(
@@ -606,7 +595,7 @@ class CircuitAnalyzerProfessional:
         fig.update_layout(
             height=700,
             template='plotly_dark',
-            title_text=f"🚀 Análise Transitória Completa - {params['response_type']}"
+            title_text=f"🚀 Análise Transitória Completa - {regime}"
         )
         
         # Atualizações dos eixos
@@ -615,6 +604,176 @@ class CircuitAnalyzerProfessional:
         
         return fig
     
+    def plot_arbitrary_input_response(self, r, l, c, t, u):
+        """Plota a resposta do RLC série a uma entrada amostrada arbitrária"""
+        dt = t[1] - t[0]
+        vc, il = state_space.simulate(u, dt, r, l, c, method="foh")
+        
+        fig = make_subplots(rows=2, cols=1, subplot_titles=('Entrada e Tensão no Capacitor', 'Corrente'),
+                            vertical_spacing=0.12)
+        fig.add_trace(go.Scatter(x=t*1000, y=u, name='Entrada v(t)',
+                                 line=dict(color='#64748b', width=2, dash='dot')), row=1, col=1)
+        fig.add_trace(go.Scatter(x=t*1000, y=vc, name='vC(t)',
+                                 line=dict(color='#10b981', width=3)), row=1, col=1)
+        fig.add_trace(go.Scatter(x=t*1000, y=il, name='i(t)',
+                                 line=dict(color='#f59e0b', width=3)), row=2, col=1)
+        
+        fig.update_layout(
+            height=550,
+            template='plotly_dark',
+            title_text="🎛️ Resposta a Entrada Arbitrária (Espaço de Estados)"
+        )
+        fig.update_xaxes(title="Tempo [ms]")
+        fig.update_yaxes(title="Tensão [V]", row=1, col=1)
+        fig.update_yaxes(title="Corrente [A]", row=2, col=1)
+        
+        return fig
+    
+    def plot_design_space(self, heatmap):
+        """Heatmap com iso-contornos de uma grandeza sobre dois eixos do espaço de projeto"""
+        fig = go.Figure()
+        fig.add_trace(go.Heatmap(x=heatmap['x'], y=heatmap['y'], z=heatmap['z'],
+                                 colorscale='Viridis', colorbar=dict(title=heatmap['label'])))
+        fig.add_trace(go.Contour(x=heatmap['x'], y=heatmap['y'], z=heatmap['z'],
+                                 contours=dict(coloring='none', showlabels=True),
+                                 line=dict(color='white', width=1), showscale=False,
+                                 name='Iso-contornos'))
+        fig.update_layout(
+            height=550,
+            template='plotly_dark',
+            title_text=f"🗺️ {heatmap['label']} — {heatmap['cells']:,} combinações avaliadas"
+        )
+        fig.update_xaxes(title=heatmap['x_label'], type='log' if heatmap['x'].min() > 0 else 'linear')
+        fig.update_yaxes(title=heatmap['y_label'], type='log' if heatmap['y'].min() > 0 else 'linear')
+        return fig
+    
+    def show_design_space_explorer(self, r, l, c, f):
+        """Controles do explorador do espaço de projeto R × L × C × f"""
+        with st.expander("🗺️ Explorador do Espaço de Projeto (R × L × C × f)"):
+            ranges = {}
+            cols = st.columns(4)
+            for col, (axis, center, unit) in zip(cols, [('r', r, 'Ω'), ('l', l, 'H'), ('c', c, 'F'), ('f', f, 'Hz')]):
+                with col:
+                    st.markdown(f"**{design_space.AXIS_LABELS[axis]}**")
+                    low = st.number_input(f"Mín [{unit}]", value=float(center) / 10, format="%.3e", key=f"ds_min_{axis}")
+                    high = st.number_input(f"Máx [{unit}]", value=float(center) * 10, format="%.3e", key=f"ds_max_{axis}")
+                    count = st.number_input("Pontos", min_value=1, max_value=2000, value=100, key=f"ds_n_{axis}")
+                    ranges[axis] = np.geomspace(max(low, 1e-12), max(high, low, 1e-12), int(count))
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                quantity = st.selectbox("Grandeza", list(design_space.QUANTITIES),
+                                        format_func=design_space.QUANTITIES.get)
+            with col2:
+                x_axis = st.selectbox("Eixo X", design_space.AXES, index=3, format_func=design_space.AXIS_LABELS.get)
+            with col3:
+                y_axis = st.selectbox("Eixo Y", design_space.AXES, index=0, format_func=design_space.AXIS_LABELS.get)
+            with col4:
+                reduction = st.selectbox("Redução dos demais eixos", design_space.REDUCTIONS)
+            
+            try:
+                explorer = design_space.DesignSpaceExplorer(*(ranges[a] for a in design_space.AXES),
+                                                            workers=os.cpu_count())
+            except ValueError as e:
+                st.error(f"❌ {e}: reduza o número de pontos")
+                return
+            st.caption(f"{explorer.cells:,} combinações, calculadas em blocos de até "
+                       f"{explorer.chunk_cells:,} células")
+            if st.button("🗺️ Calcular Mapa"):
+                if x_axis == y_axis:
+                    st.error("❌ Escolha eixos X e Y diferentes")
+                else:
+                    heatmap = explorer.heatmap(quantity, x_axis, y_axis, reduction)
+                    st.plotly_chart(self.plot_design_space(heatmap), use_container_width=True)
+    
+    def show_component_selection(self, f):
+        """Seleção inversa: metas de f₀, ζ e FP → combinações comerciais (R, L, C)"""
+        with st.expander("🎯 Seleção Inversa de Componentes (séries E / catálogo)"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                target_f0 = st.number_input("f₀ desejada [Hz] (0 = livre)", min_value=0.0, value=1000.0)
+                r_series = st.selectbox("Série dos resistores", list(component_selection.E_SERIES), index=2)
+            with col2:
+                target_zeta = st.number_input("ζ desejado (0 = livre)", min_value=0.0, value=0.707, format="%.3f")
+                l_series = st.selectbox("Série dos indutores", list(component_selection.E_SERIES), index=0)
+            with col3:
+                target_pf = st.number_input(f"FP desejado em {f:.0f} Hz (0 = livre)", min_value=0.0,
+                                            max_value=1.0, value=0.0, format="%.3f")
+                c_series = st.selectbox("Série dos capacitores", list(component_selection.E_SERIES), index=1)
+            tolerance = st.slider("Tolerância das metas [%]", 0.5, 20.0, 5.0) / 100
+            top_n = st.number_input("Quantidade de combinações", min_value=1, max_value=100, value=10)
+            uploaded = st.file_uploader("Catálogo do fabricante (CSV: tipo, valor, codigo)", type=['csv'],
+                                        key="catalog_csv")
+            
+            if st.button("🎯 Buscar Componentes"):
+                try:
+                    if uploaded:
+                        with tempfile.NamedTemporaryFile("wb", suffix=".csv", delete=False) as file:
+                            file.write(uploaded.getvalue())
+                        catalog = component_selection.load_catalog_csv(file.name)
+                        os.unlink(file.name)
+                    else:
+                        catalog = component_selection.standard_catalog(r_series, l_series, c_series)
+                    selections = component_selection.select_components(
+                        catalog, f0=target_f0 or None, zeta=target_zeta or None,
+                        pf=target_pf or None, frequency=f, tolerance=tolerance, top_n=int(top_n))
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                    return
+                if not selections:
+                    st.warning("⚠️ Nenhuma combinação atende às metas dentro da tolerância")
+                    return
+                st.dataframe(pd.DataFrame([{
+                    'R [Ω]': s.r, 'L [H]': s.l, 'C [F]': s.c,
+                    'f₀ [Hz]': round(s.f0, 3), 'ζ': round(s.zeta, 4),
+                    'FP': None if s.pf is None else round(s.pf, 4),
+                    'Erro [%]': round(100 * s.error, 3), 'Peças': ' / '.join(s.parts),
+                } for s in selections]), use_container_width=True)
+    
+    def show_tolerance_analysis(self, circuit_type, r, l, c, f):
+        """Monte Carlo das tolerâncias de R, L e C: percentis, histogramas e rendimento"""
+        topology = "parallel" if circuit_type == "RLC Paralelo" else "series"
+        with st.expander("🎲 Análise de Tolerâncias (Monte Carlo)"):
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                tol_r = st.number_input("Tolerância R [%]", min_value=0.0, max_value=50.0, value=5.0)
+            with col2:
+                tol_l = st.number_input("Tolerância L [%]", min_value=0.0, max_value=50.0, value=10.0)
+            with col3:
+                tol_c = st.number_input("Tolerância C [%]", min_value=0.0, max_value=50.0, value=20.0)
+            with col4:
+                distribution = st.selectbox("Distribuição", monte_carlo.DISTRIBUTIONS,
+                                            format_func={"normal": "Normal (±tol = 3σ)",
+                                                         "uniform": "Uniforme"}.get)
+            samples = st.select_slider("Amostras", [10_000, 100_000, 1_000_000], value=100_000)
+            f0_nominal = 1 / (2 * np.pi * np.sqrt(l * c))
+            col1, col2 = st.columns(2)
+            with col1:
+                f0_low = st.number_input("Especificação f₀ mín [Hz]", value=0.95 * f0_nominal)
+            with col2:
+                f0_high = st.number_input("Especificação f₀ máx [Hz]", value=1.05 * f0_nominal)
+            
+            if st.button("🎲 Executar Monte Carlo"):
+                results = monte_carlo.rlc_monte_carlo(
+                    topology, r, l, c, {'r': tol_r / 100, 'l': tol_l / 100, 'c': tol_c / 100}, f,
+                    n=samples, distribution=distribution, seed=0,
+                    workers=os.cpu_count() if samples >= 1_000_000 else None)
+                summary = monte_carlo.summarize(results, limits={'f0': (f0_low, f0_high)})
+                labels = {'f0': 'f₀ [Hz]', 'zeta': 'ζ', 'z_mag': f'|Z| em {f:.0f} Hz [Ω]',
+                          'pf': f'FP em {f:.0f} Hz'}
+                st.dataframe(pd.DataFrame({labels[k]: v for k, v in summary.items()}).T,
+                             use_container_width=True)
+                st.metric("Rendimento (f₀ dentro da especificação)", f"{100 * summary['f0']['yield']:.2f} %")
+                
+                fig = make_subplots(rows=2, cols=2, subplot_titles=[labels[k] for k in results])
+                for index, (name, (counts, edges)) in enumerate(monte_carlo.histograms(results).items()):
+                    fig.add_trace(go.Bar(x=0.5 * (edges[:-1] + edges[1:]), y=counts, name=labels[name],
+                                         marker_color='#00d4ff', showlegend=False),
+                                  row=index // 2 + 1, col=index % 2 + 1)
+                fig.update_layout(height=600, template='plotly_dark', bargap=0,
+                                  title_text=f"🎲 {samples:,} amostras")
+                st.plotly_chart(fig, use_container_width=True)
+    
     def create_circuit_diagram(self, circuit_type, r, l, c):
         """Cria diagrama do circuito"""
         fig, ax = plt.subplots(1, 1, figsize=(10, 6))
@@ -770,6 +929,10 @@ class CircuitAnalyzerProfessional:
                 plt.close(fig_circuit)
             except:
                 st.info("Diagrama do circuito será exibido aqui")
+            
+            self.show_design_space_explorer(r, l, c, f)
+            self.show_component_selection(f)
+            self.show_tolerance_analysis(circuit_type, r, l, c, f)
         
         with tab4:
             st.markdown('<div class="advanced-card">', unsafe_allow_html=True)
@@ -787,11 +950,46 @@ class CircuitAnalyzerProfessional:
             with col4:
                 st.metric("⏱️ Constante de Tempo", f"{params['tau']*1000:.1f} ms")
             
+            # Pontos característicos do degrau (raízes exatas, não varredura do gráfico)
+            step_points = response_metrics.step_metrics(r, l, c)
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("📈 Sobressinal", f"{float(step_points['overshoot_pct']):.2f} %")
+            with col2:
+                st.metric("⛰️ Tempo de Pico", f"{float(step_points['peak_time'])*1000:.2f} ms")
+            with col3:
+                st.metric("🚀 Subida (10–90%)", f"{float(step_points['rise_time'])*1000:.2f} ms")
+            with col4:
+                st.metric("🎯 Acomodação (2%)", f"{float(step_points['settling_time'])*1000:.2f} ms")
+            
             st.markdown('</div>', unsafe_allow_html=True)
             
             # Gráfico transitório
             fig_transient = self.plot_transient_response_advanced(r, l, c, sim_time)
             st.plotly_chart(fig_transient, use_container_width=True)
+            
+            # Entradas arbitrárias: senoide chaveada ou forma de onda medida
+            input_type = st.selectbox(
+                "Entrada Arbitrária:",
+                ["Senoide ligada em t=0", "Forma de onda medida (CSV)"]
+            )
+            t_input = np.linspace(0, sim_time, 2000)
+            u_input = None
+            if input_type == "Senoide ligada em t=0":
+                u_input = vm * np.sin(2 * np.pi * f * t_input + math.radians(theta_v))
+            else:
+                uploaded = st.file_uploader("CSV com colunas tempo [s] e tensão [V]", type=['csv'])
+                if uploaded:
+                    try:
+                        measured = pd.read_csv(uploaded).to_numpy(dtype=float)
+                        t_input = np.linspace(measured[0, 0], measured[-1, 0], len(measured))
+                        u_input = np.interp(t_input, measured[:, 0], measured[:, 1])
+                    except Exception as e:
+                        st.error(f"❌ Erro ao ler a forma de onda: {e}")
+            
+            if u_input is not None and len(u_input) > 1:
+                fig_arbitrary = self.plot_arbitrary_input_response(r, l, c, t_input, u_input)
+                st.plotly_chart(fig_arbitrary, use_container_width=True)
         
         with tab5:
             st.markdown('<div class="advanced-card">', unsafe_allow_html=True)
@@ -809,6 +1007,18 @@ class CircuitAnalyzerProfessional:
             
             st.markdown('</div>', unsafe_allow_html=True)
             
+            # Pontos característicos em frequência (admitância passa-faixa)
+            freq_points = response_metrics.frequency_metrics(r, l, c)
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("📶 Banda -3 dB", f"{float(freq_points['bandwidth']):.2f} Hz")
+            with col2:
+                st.metric("🎚️ Fator Q", f"{float(freq_points['q_factor']):.2f}")
+            with col3:
+                st.metric("⬅️ f inferior", f"{float(freq_points['f_low']):.2f} Hz")
+            with col4:
+                st.metric("➡️ f superior", f"{float(freq_points['f_high']):.2f} Hz")
+            
             # Gráfico de frequência
             fig_freq = self.plot_frequency_response_advanced(r, l, c, freq_range)
             st.plotly_chart(fig_freq, use_container_width=True)
@@ -21,6 +21,11 @@ class ComponentType(Enum):
     GROUND = "ground"
     WIRE = "wire"
     SWITCH = "switch"
+    TRANSMISSION_LINE = "transmission_line"
+    DIODE = "diode"
+    BJT = "bjt"
+    MOSFET = "mosfet"
+    SATURABLE_INDUCTOR = "saturable_inductor"
 
 @dataclass
 class Component:
@@ -34,6 +39,7 @@ class Component:
     unit: Optional[str] = None
     label: Optional[str] = None
     connected_to: List[str] = None
+    parameters: Optional[Dict[str, float]] = None  # Parâmetros extras (ex.: R, L, C, G por metro da linha, modelo do diodo)
     
     def __post_init__(self):
         if self.connected_to is None:
@@ -47,7 +53,7 @@ class CircuitConnection:
     id: str
     from_component: str
     to_component: str
-    from_terminal: str  # "terminal1" ou "terminal2"
+    from_terminal: str  # "terminal1", "terminal2" ou "terminal3" (base/porta dos transistores)
     to_terminal: str
 
 class CircuitBuilder:
@@ -61,7 +67,12 @@ class CircuitBuilder:
         ComponentType.CURRENT_SOURCE: "⊗",
         ComponentType.GROUND: "⏚",
         ComponentType.WIRE: "─",
-        ComponentType.SWITCH: "⧄"
+        ComponentType.SWITCH: "⧄",
+        ComponentType.TRANSMISSION_LINE: "≋",
+        ComponentType.DIODE: "▷|",
+        ComponentType.BJT: "⊳",
+        ComponentType.MOSFET: "⊩",
+        ComponentType.SATURABLE_INDUCTOR: "⨷"
     }
     
     COMPONENT_COLORS = {
@@ -72,7 +83,12 @@ class CircuitBuilder:
         ComponentType.CURRENT_SOURCE: "#9b59b6",
         ComponentType.GROUND: "#34495e",
         ComponentType.WIRE: "#95a5a6",
-        ComponentType.SWITCH: "#e67e22"
+        ComponentType.SWITCH: "#e67e22",
+        ComponentType.TRANSMISSION_LINE: "#16a085",
+        ComponentType.DIODE: "#c0392b",
+        ComponentType.BJT: "#2c3e50",
+        ComponentType.MOSFET: "#8e44ad",
+        ComponentType.SATURABLE_INDUCTOR: "#d35400"
     }
     
     def __init__(self):
@@ -83,7 +99,7 @@ class CircuitBuilder:
         self.canvas_height = 600
     
     def add_component(self, component_type: ComponentType, x: float, y: float, 
-                     value: float = None, unit: str = None) -> str:
+                     value: float = None, unit: str = None, parameters: Dict[str, float] = None) -> str:
         """Adiciona um componente ao circuito"""
         component_id = str(uuid.uuid4())
         
@@ -97,7 +113,8 @@ class CircuitBuilder:
             x=x,
             y=y,
             value=value,
-            unit=unit
+            unit=unit,
+            parameters=parameters
         )
         
         self.components[component_id] = component
@@ -113,6 +130,13 @@ class CircuitBuilder:
             self.components[component_id].x = x
             self.components[component_id].y = y
     
+    def update_component_value(self, component_id: str, value: float, unit: str = None):
+        """Altera o valor (e opcionalmente a unidade) de um componente"""
+        if component_id in self.components:
+            self.components[component_id].value = value
+            if unit is not None:
+                self.components[component_id].unit = unit
+
     def remove_component(self, component_id: str):
         """Remove um componente do circuito"""
         if component_id in self.components:
@@ -0,0 +1,609 @@
+# Módulo de solução nodal de circuitos montados no construtor
+# Converte o desenho do CircuitBuilder em netlist e resolve por análise nodal modificada (MNA)
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from circuit_editor import CircuitBuilder, Component, ComponentType
+from device_models import DEVICE_TERMINALS, device_parameters
+from transmission_line import line_admittance, line_parameters, lumped_sections
+
+# Condutância mínima ligada do nó ao terra (evita matriz singular em nós flutuantes)
+GMIN = 1e-12
+
+# Resistência de uma chave fechada e aberta
+SWITCH_ON_RESISTANCE = 1e-3
+SWITCH_OFF_RESISTANCE = 1e9
+
+UNIT_SCALE = {
+    "Ω": 1.0, "kΩ": 1e3, "MΩ": 1e6,
+    "F": 1.0, "mF": 1e-3, "µF": 1e-6, "μF": 1e-6, "uF": 1e-6, "nF": 1e-9, "pF": 1e-12,
+    "H": 1.0, "mH": 1e-3, "µH": 1e-6, "μH": 1e-6, "uH": 1e-6,
+    "V": 1.0, "kV": 1e3, "mV": 1e-3,
+    "A": 1.0, "mA": 1e-3,
+    "m": 1.0, "km": 1e3,
+}
+
+# Elementos que são resolvidos com uma corrente de ramo como incógnita extra
+# (a linha de transmissão usa duas: a que entra pelo terminal 1 e a que sai pelo terminal 2)
+BRANCH_TYPES = (ComponentType.VOLTAGE_SOURCE, ComponentType.INDUCTOR, ComponentType.TRANSMISSION_LINE,
+                ComponentType.SATURABLE_INDUCTOR)
+
+# Elementos não lineares: só o solver de Newton (nonlinear_solver) os estampa por completo;
+# nas análises lineares o indutor saturável vale L₀ e os semicondutores ficam em aberto
+NONLINEAR_TYPES = (ComponentType.DIODE, ComponentType.BJT, ComponentType.MOSFET,
+                   ComponentType.SATURABLE_INDUCTOR)
+
+# Elementos cujo valor entra na matriz como estampa de posto um (stamp_coefficient·u·uᵀ);
+# o indutor saturável entra com L₀, como em assemble_mna
+RANK_ONE_TYPES = (ComponentType.RESISTOR, ComponentType.SWITCH, ComponentType.CAPACITOR,
+                  ComponentType.INDUCTOR, ComponentType.SATURABLE_INDUCTOR)
+
+@dataclass
+class NetlistElement:
+    """Elemento da netlist (valor em unidades SI); transistores usam node3 para base/porta"""
+    id: str
+    type: ComponentType
+    node1: int
+    node2: int
+    value: float
+    label: str = ""
+    parameters: Optional[Dict[str, float]] = None
+    node3: int = 0
+
+@dataclass
+class Netlist:
+    """Netlist nodal: o nó 0 é o terra e os demais são numerados de 1 a node_count"""
+    node_count: int
+    elements: List[NetlistElement] = field(default_factory=list)
+    node_names: Dict[int, str] = field(default_factory=dict)
+    _index: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def add_element(self, element_type: ComponentType, node1: int, node2: int,
+                    value: float, element_id: str = None, label: str = None,
+                    parameters: Dict[str, float] = None, node3: int = 0) -> str:
+        """Adiciona um elemento diretamente à netlist (útil para circuitos gerados)"""
+        element_id = element_id or f"{element_type.value}_{len(self.elements)}"
+        self.node_count = max(self.node_count, node1, node2, node3)
+        self._index[element_id] = len(self.elements)
+        self.elements.append(NetlistElement(
+            id=element_id, type=element_type, node1=node1, node2=node2,
+            value=float(value), label=label or element_id, parameters=parameters, node3=node3
+        ))
+        return element_id
+
+    def element(self, element_id: str) -> NetlistElement:
+        """Retorna o elemento pelo id"""
+        position = self._index.get(element_id)
+        if position is not None and position < len(self.elements) and \
+                self.elements[position].id == element_id:
+            return self.elements[position]
+        for position, element in enumerate(self.elements):
+            if element.id == element_id:
+                self._index[element_id] = position
+                return element
+        raise KeyError(f"Elemento {element_id} não encontrado na netlist")
+
+def component_si_value(component: Component) -> Optional[float]:
+    """Converte o valor de um componente para unidades SI conforme a unidade informada"""
+    if component.value is None:
+        return None
+    scale = UNIT_SCALE.get(component.unit, 1.0) if component.unit else 1.0
+    return float(component.value) * scale
+
+def build_netlist(builder: CircuitBuilder) -> Netlist:
+    """Extrai a netlist nodal do circuito desenhado no construtor"""
+    parent: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    def find(key):
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    def union(a, b):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    ground_key = ("__ground__", "node")
+    find(ground_key)
+    has_ground = False
+
+    def terminal_names(component):
+        # Base/porta dos transistores é o terminal 3
+        return ("terminal1", "terminal2", "terminal3")[:DEVICE_TERMINALS.get(component.type, 2)]
+
+    # Terminais internos: terra e fios curto-circuitam seus terminais
+    for component in builder.components.values():
+        terminals = [(component.id, terminal) for terminal in terminal_names(component)]
+        for terminal in terminals:
+            find(terminal)
+        if component.type == ComponentType.GROUND:
+            has_ground = True
+            for terminal in terminals:
+                union(ground_key, terminal)
+        elif component.type == ComponentType.WIRE:
+            union(*terminals)
+
+    for connection in builder.connections.values():
+        if (connection.from_component in builder.components and
+                connection.to_component in builder.components):
+            union((connection.from_component, connection.from_terminal),
+                  (connection.to_component, connection.to_terminal))
+
+    # Sem terra explícito, o terminal negativo da primeira fonte vira referência
+    if not has_ground:
+        for component in builder.components.values():
+            if component.type in (ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE):
+                union(ground_key, (component.id, "terminal2"))
+                break
+
+    node_index = {find(ground_key): 0}
+    netlist = Netlist(node_count=0, node_names={0: "GND"})
+    errors = []
+
+    for component in builder.components.values():
+        if component.type in (ComponentType.GROUND, ComponentType.WIRE):
+            continue
+        nodes = []
+        for terminal in terminal_names(component):
+            root = find((component.id, terminal))
+            if root not in node_index:
+                node_index[root] = len(node_index)
+                netlist.node_names[node_index[root]] = f"N{node_index[root]}"
+            nodes.append(node_index[root])
+
+        value = component_si_value(component)
+        if component.type == ComponentType.SWITCH:
+            value = SWITCH_ON_RESISTANCE
+        elif value is None:
+            value = 0.0 if component.type in (ComponentType.VOLTAGE_SOURCE,
+                                              ComponentType.CURRENT_SOURCE) else None
+        if value is None or (component.type in (ComponentType.RESISTOR, ComponentType.CAPACITOR,
+                                                ComponentType.INDUCTOR, ComponentType.TRANSMISSION_LINE)
+                             + NONLINEAR_TYPES and value <= 0):
+            errors.append(f"{component.label} sem valor positivo")
+            continue
+        parameters = None
+        if component.type == ComponentType.TRANSMISSION_LINE:
+            # Valor = comprimento; parâmetros por metro no próprio componente
+            try:
+                parameters = line_parameters(component.parameters)
+            except ValueError as error:
+                errors.append(f"{component.label}: {error}")
+                continue
+        elif component.type in NONLINEAR_TYPES:
+            # Valor = Iₛ, β ou L₀; demais parâmetros do modelo no próprio componente
+            try:
+                parameters = device_parameters(component.type, component.parameters)
+            except ValueError as error:
+                errors.append(f"{component.label}: {error}")
+                continue
+
+        netlist.add_element(component.type, nodes[0], nodes[1], value,
+                            element_id=component.id, label=component.label, parameters=parameters,
+                            node3=nodes[2] if len(nodes) > 2 else 0)
+
+    if errors:
+        raise ValueError(f"Netlist inválida: {', '.join(errors)}")
+
+    netlist.node_count = len(node_index) - 1
+    return netlist
+
+class _Stamper:
+    """Acumula estampas MNA em formato COO"""
+
+    def __init__(self):
+        self.rows: List[int] = []
+        self.cols: List[int] = []
+        self.vals: List[float] = []
+
+    def entry(self, row: int, col: int, value):
+        if row >= 0 and col >= 0:
+            self.rows.append(row)
+            self.cols.append(col)
+            self.vals.append(value)
+
+    def admittance(self, node1: int, node2: int, value):
+        """Estampa uma admitância entre dois nós (índices 1..n, 0 = terra)"""
+        i, j = node1 - 1, node2 - 1
+        self.entry(i, i, value)
+        self.entry(j, j, value)
+        self.entry(i, j, -value)
+        self.entry(j, i, -value)
+
+    def incidence(self, node1: int, node2: int, branch: int):
+        """Estampa a incidência de uma corrente de ramo (entra em node1, sai por node2)"""
+        i, j = node1 - 1, node2 - 1
+        self.entry(i, branch, 1.0)
+        self.entry(j, branch, -1.0)
+        self.entry(branch, i, 1.0)
+        self.entry(branch, j, -1.0)
+
+    def matrix(self, size: int) -> sp.csc_matrix:
+        return sp.coo_matrix((self.vals, (self.rows, self.cols)), shape=(size, size)).tocsc()
+
+@dataclass
+class MNASystem:
+    """Sistema descritor G·x + C·dx/dt = b das equações nodais modificadas"""
+    G: sp.csc_matrix
+    C: sp.csc_matrix
+    b: np.ndarray
+    node_count: int
+    branch_index: Dict[str, int]
+    # Linhas de transmissão: (parâmetros, comprimento, nó 1, nó 2, ramo 1, ramo 2)
+    lines: List[Tuple[Dict[str, float], float, int, int, int, int]] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return self.G.shape[0]
+
+    def matrix(self, frequency: float = 0.0) -> sp.csc_matrix:
+        """Matriz do sistema na frequência informada (G + jωC + estampas das linhas)"""
+        matrix = self.G if frequency == 0 else self.G + 2j * np.pi * frequency * self.C
+        if self.lines:
+            matrix = matrix + self.line_matrix(frequency)
+        return matrix.tocsc()
+
+    def line_matrix(self, frequency: float = 0.0) -> sp.csc_matrix:
+        """Equações de ramo das linhas de transmissão na frequência (dependem de f de forma não racional).
+
+        Com B ≠ 0 usa os parâmetros Y (i₁ = y₁₁V₁ + y₁₂V₂, −i₂ = y₁₂V₁ + y₂₂V₂),
+        limitados mesmo em linhas longas; a linha sem perdas em DC (B = 0)
+        usa a forma ABCD V₁ = V₂, i₁ = G·ℓ·V₂ + i₂.
+        """
+        stamp = _Stamper()
+        for parameters, length, n1, n2, k1, k2 in self.lines:
+            i, j = n1 - 1, n2 - 1
+            if frequency == 0 and parameters["r"] == 0:
+                stamp.entry(k1, i, 1.0)
+                stamp.entry(k1, j, -1.0)
+                stamp.entry(k2, k1, 1.0)
+                stamp.entry(k2, j, -parameters["g"] * length)
+                stamp.entry(k2, k2, -1.0)
+                continue
+            y11, y12, y22 = (complex(v) for v in line_admittance(parameters, length, frequency))
+            stamp.entry(k1, k1, 1.0)
+            stamp.entry(k1, i, -y11)
+            stamp.entry(k1, j, -y12)
+            stamp.entry(k2, k2, 1.0)
+            stamp.entry(k2, i, y12)
+            stamp.entry(k2, j, y22)
+        matrix = stamp.matrix(self.size)
+        return matrix.real.tocsc() if frequency == 0 else matrix
+
+def element_vector(element: NetlistElement, system: MNASystem) -> np.ndarray:
+    """Vetor u da estampa de posto um do elemento na matriz do sistema.
+
+    R, C e chave estampam (coeficiente)·u·uᵀ com u = e₁ − e₂; o indutor (e o
+    saturável, com L₀) estampa −jωL·e_k·e_kᵀ, com k a sua corrente de ramo.
+    """
+    u = np.zeros(system.size)
+    if element.type in (ComponentType.INDUCTOR, ComponentType.SATURABLE_INDUCTOR):
+        u[system.branch_index[element.id]] = 1.0
+        return u
+    if element.node1 > 0:
+        u[element.node1 - 1] = 1.0
+    if element.node2 > 0:
+        u[element.node2 - 1] = -1.0
+    return u
+
+def stamp_coefficient(element_type: ComponentType, value, frequency: float = 0.0):
+    """Coeficiente da estampa u·uᵀ do elemento (aceita arrays de valores).
+
+    R e chave: 1/R; capacitor: jωC; indutor e indutor saturável (L₀): −jωL
+    na sua linha de ramo. Os demais não têm estampa de posto um e retornam 0.
+    """
+    jw = 2j * np.pi * frequency
+    if element_type in (ComponentType.RESISTOR, ComponentType.SWITCH):
+        return 1.0 / np.asarray(value, dtype=float)
+    if element_type == ComponentType.CAPACITOR:
+        return jw * np.asarray(value, dtype=float)
+    if element_type in (ComponentType.INDUCTOR, ComponentType.SATURABLE_INDUCTOR):
+        return -jw * np.asarray(value, dtype=float)
+    return np.zeros_like(value, dtype=float)
+
+def assemble_mna(netlist: Netlist, gmin: float = GMIN,
+                 open_switches: Iterable[str] = ()) -> MNASystem:
+    """Monta as matrizes G e C e o vetor de excitação b da netlist.
+
+    Chaves em open_switches são estampadas com SWITCH_OFF_RESISTANCE; as demais
+    com o valor da netlist (resistência de chave fechada). Dos diodos só entra a
+    capacitância de junção, transistores não entram e o indutor saturável é
+    estampado com a indutância L₀ da origem: o solver de Newton soma a parte
+    não linear a estas matrizes.
+    """
+    open_switches = set(open_switches)
+    n = netlist.node_count
+    branch_index: Dict[str, int] = {}
+    size = n
+    for element in netlist.elements:
+        if element.type in BRANCH_TYPES:
+            branch_index[element.id] = size
+            size += 2 if element.type == ComponentType.TRANSMISSION_LINE else 1
+    lines = []
+
+    g_stamp, c_stamp = _Stamper(), _Stamper()
+    b = np.zeros(size)
+    for k in range(n):
+        g_stamp.entry(k, k, gmin)
+
+    for element in netlist.elements:
+        n1, n2 = element.node1, element.node2
+        if element.type == ComponentType.RESISTOR:
+            g_stamp.admittance(n1, n2, 1.0 / element.value)
+        elif element.type == ComponentType.SWITCH:
+            resistance = SWITCH_OFF_RESISTANCE if element.id in open_switches else element.value
+            g_stamp.admittance(n1, n2, 1.0 / resistance)
+        elif element.type == ComponentType.CAPACITOR:
+            c_stamp.admittance(n1, n2, element.value)
+        elif element.type == ComponentType.DIODE and (element.parameters or {}).get("cj"):
+            c_stamp.admittance(n1, n2, element.parameters["cj"])
+        elif element.type in (ComponentType.INDUCTOR, ComponentType.SATURABLE_INDUCTOR):
+            k = branch_index[element.id]
+            g_stamp.incidence(n1, n2, k)
+            c_stamp.entry(k, k, -element.value)
+        elif element.type == ComponentType.VOLTAGE_SOURCE:
+            k = branch_index[element.id]
+            g_stamp.incidence(n1, n2, k)
+            b[k] = element.value
+        elif element.type == ComponentType.CURRENT_SOURCE:
+            # Corrente entra no circuito pelo terminal 2 (sentido da seta)
+            if n1 > 0:
+                b[n1 - 1] -= element.value
+            if n2 > 0:
+                b[n2 - 1] += element.value
+        elif element.type == ComponentType.TRANSMISSION_LINE:
+            # i₁ sai do nó 1 para a linha e i₂ sai da linha para o nó 2; as linhas
+            # de ramo (dependentes de f) são estampadas por MNASystem.line_matrix
+            k = branch_index[element.id]
+            g_stamp.entry(n1 - 1, k, 1.0)
+            g_stamp.entry(n2 - 1, k + 1, -1.0)
+            lines.append((line_parameters(element.parameters), element.value, n1, n2, k, k + 1))
+
+    return MNASystem(G=g_stamp.matrix(size), C=c_stamp.matrix(size), b=b,
+                     node_count=n, branch_index=branch_index, lines=lines)
+
+def _new_node(netlist: Netlist, name: str) -> int:
+    netlist.node_count += 1
+    netlist.node_names[netlist.node_count] = name
+    return netlist.node_count
+
+def expand_lines(netlist: Netlist) -> Netlist:
+    """Cópia da netlist com cada linha de transmissão trocada pela escada RLCG concentrada.
+
+    Usada onde só há modelos de parâmetros concentrados (transitório, redução
+    de ordem). Cada seção é série R–L seguida de C e 1/G para o terra; os nós
+    originais mantêm a numeração e os internos são acrescentados ao final.
+    """
+    if not any(element.type == ComponentType.TRANSMISSION_LINE for element in netlist.elements):
+        return netlist
+    expanded = Netlist(node_count=netlist.node_count, node_names=dict(netlist.node_names))
+    for element in netlist.elements:
+        if element.type != ComponentType.TRANSMISSION_LINE:
+            expanded.add_element(element.type, element.node1, element.node2, element.value,
+                                 element_id=element.id, label=element.label,
+                                 parameters=element.parameters, node3=element.node3)
+            continue
+        segments, r, l, c, g = lumped_sections(element.parameters, element.value)
+        start = element.node1
+        for k in range(1, segments + 1):
+            prefix = f"{element.id}.{k}"
+            end = element.node2 if k == segments else _new_node(expanded, f"{element.label}.{k}")
+            if r and l:
+                middle = _new_node(expanded, f"{element.label}.{k}m")
+                expanded.add_element(ComponentType.RESISTOR, start, middle, r, element_id=f"{prefix}.R")
+                expanded.add_element(ComponentType.INDUCTOR, middle, end, l, element_id=f"{prefix}.L")
+            elif r:
+                expanded.add_element(ComponentType.RESISTOR, start, end, r, element_id=f"{prefix}.R")
+            else:
+                expanded.add_element(ComponentType.INDUCTOR, start, end, l, element_id=f"{prefix}.L")
+            if end > 0 and c:
+                expanded.add_element(ComponentType.CAPACITOR, end, 0, c, element_id=f"{prefix}.C")
+            if end > 0 and g:
+                expanded.add_element(ComponentType.RESISTOR, end, 0, 1.0 / g, element_id=f"{prefix}.G")
+            start = end
+    return expanded
+
+def source_vector(netlist: Netlist, system: MNASystem) -> np.ndarray:
+    """Recalcula o vetor de excitação b a partir dos valores atuais das fontes"""
+    b = np.zeros(system.size)
+    for element in netlist.elements:
+        if element.type == ComponentType.VOLTAGE_SOURCE:
+            b[system.branch_index[element.id]] = element.value
+        elif element.type == ComponentType.CURRENT_SOURCE:
+            if element.node1 > 0:
+                b[element.node1 - 1] -= element.value
+            if element.node2 > 0:
+                b[element.node2 - 1] += element.value
+    return b
+
+class CircuitSolution:
+    """Resultado de uma solução nodal (fasores de pico ou valores DC).
+
+    As grandezas por elemento são calculadas sob demanda a partir do vetor de
+    incógnitas, para que resolver circuitos grandes não custe O(elementos) em Python.
+    """
+
+    def __init__(self, netlist: Netlist, system: MNASystem, x: np.ndarray,
+                 frequency: float = 0.0):
+        self.netlist = netlist
+        self.system = system
+        self.x = x
+        self.frequency = frequency
+
+    @property
+    def node_voltages(self) -> np.ndarray:
+        """Tensões nodais com o terra na posição 0"""
+        return np.concatenate(([0.0], self.x[:self.system.node_count]))
+
+    def node_voltage(self, node: int) -> complex:
+        return self.x[node - 1] if node > 0 else 0.0
+
+    def element_voltage(self, element_id: str) -> complex:
+        """Tensão entre o terminal 1 e o terminal 2 do elemento"""
+        element = self.netlist.element(element_id)
+        return self.node_voltage(element.node1) - self.node_voltage(element.node2)
+
+    def element_current(self, element_id: str) -> complex:
+        """Corrente no elemento, do terminal 1 para o terminal 2"""
+        element = self.netlist.element(element_id)
+        if element.type in BRANCH_TYPES:
+            return self.x[self.system.branch_index[element.id]]
+        v = self.element_voltage(element_id)
+        if element.type in (ComponentType.RESISTOR, ComponentType.SWITCH):
+            return v / element.value
+        if element.type == ComponentType.CAPACITOR:
+            return 2j * np.pi * self.frequency * element.value * v
+        if element.type == ComponentType.CURRENT_SOURCE:
+            return element.value
+        return 0.0
+
+    def power(self, element_id: str) -> complex:
+        """Potência complexa absorvida pelo elemento (V·I*; na linha, V₁·i₁* − V₂·i₂*)"""
+        element = self.netlist.element(element_id)
+        if element.type == ComponentType.TRANSMISSION_LINE:
+            k = self.system.branch_index[element.id]
+            return (self.node_voltage(element.node1) * np.conj(self.x[k]) -
+                    self.node_voltage(element.node2) * np.conj(self.x[k + 1]))
+        return self.element_voltage(element_id) * np.conj(self.element_current(element_id))
+
+    @property
+    def branch_currents(self) -> Dict[str, complex]:
+        return {element.id: self.element_current(element.id) for element in self.netlist.elements}
+
+    @property
+    def element_voltages(self) -> Dict[str, complex]:
+        return {element.id: self.element_voltage(element.id) for element in self.netlist.elements}
+
+class CircuitSolver:
+    """Solver nodal com cache da fatoração LU esparsa por frequência"""
+
+    def __init__(self, netlist: Netlist, gmin: float = GMIN):
+        self.netlist = netlist
+        self.system = assemble_mna(netlist, gmin)
+        self._factorizations: Dict[float, spla.SuperLU] = {}
+
+    def factorize(self, frequency: float = 0.0) -> spla.SuperLU:
+        """Retorna (e guarda) a fatoração LU da matriz do sistema na frequência"""
+        if frequency not in self._factorizations:
+            self._factorizations[frequency] = spla.splu(self.system.matrix(frequency))
+        return self._factorizations[frequency]
+
+    def solve_vector(self, frequency: float = 0.0, rhs: np.ndarray = None) -> np.ndarray:
+        """Resolve o sistema e retorna o vetor de incógnitas (tensões nodais e correntes de ramo)"""
+        rhs = self.system.b if rhs is None else rhs
+        lu = self.factorize(frequency)
+        if frequency != 0:
+            rhs = rhs.astype(complex)
+        return lu.solve(rhs)
+
+    def solve(self, frequency: float = 0.0) -> CircuitSolution:
+        """Resolve o circuito em DC (frequency = 0) ou em regime senoidal"""
+        x = self.solve_vector(frequency)
+        return CircuitSolution(self.netlist, self.system, x, frequency)
+
+class IncrementalSolver:
+    """Solver que mantém a fatoração do circuito e aplica alterações de valor como
+    atualizações de posto baixo (Sherman–Morrison–Woodbury).
+
+    Após max_updates componentes alterados, ou quando a matriz de capacitância
+    do SMW fica mal condicionada, o circuito é refatorado do zero.
+    """
+
+    def __init__(self, netlist: Netlist, frequency: float = 0.0, max_updates: int = 16,
+                 condition_limit: float = 1e10, gmin: float = GMIN):
+        self.netlist = netlist
+        self.frequency = frequency
+        self.max_updates = max_updates
+        self.condition_limit = condition_limit
+        self.gmin = gmin
+        self.refactor_count = 0
+        self._refactor()
+
+    def _refactor(self):
+        """Remonta e fatora o sistema com os valores atuais da netlist"""
+        self.system = assemble_mna(self.netlist, self.gmin)
+        self._lu = spla.splu(self.system.matrix(self.frequency))
+        self._base_values = {element.id: element.value for element in self.netlist.elements}
+        self._columns: Dict[str, int] = {}
+        self._U = np.zeros((self.system.size, 0))
+        self._W = np.zeros((self.system.size, 0), dtype=self._dtype)
+        self._D = np.zeros(0, dtype=self._dtype)
+        self._y = self._base_solve(self.system.b)
+        self._x = self._y
+        self.refactor_count += 1
+
+    @property
+    def _dtype(self):
+        return complex if self.frequency != 0 else float
+
+    @property
+    def update_count(self) -> int:
+        return len(self._columns)
+
+    def _base_solve(self, rhs: np.ndarray) -> np.ndarray:
+        return self._lu.solve(rhs.astype(self._dtype))
+
+    def _matrix_delta(self, element: NetlistElement, value: float) -> complex:
+        """Variação do coeficiente da estampa em relação ao valor fatorado"""
+        base = self._base_values[element.id]
+        delta = (stamp_coefficient(element.type, value, self.frequency) -
+                 stamp_coefficient(element.type, base, self.frequency))
+        return np.asarray(delta).item()
+
+    def _smw_solve(self) -> np.ndarray:
+        """x = y − W·(I + D·UᵀW)⁻¹·D·Uᵀy, com y = A₀⁻¹b"""
+        if not self._columns:
+            return self._y
+        S = np.eye(len(self._D)) + self._D[:, None] * (self._U.T @ self._W)
+        if np.linalg.cond(S) > self.condition_limit:
+            raise np.linalg.LinAlgError("Atualização de posto baixo mal condicionada")
+        correction = np.linalg.solve(S, self._D * (self._U.T @ self._y))
+        return self._y - self._W @ correction
+
+    def update_value(self, element_id: str, value: float) -> CircuitSolution:
+        """Altera o valor (SI) de um elemento e retorna a nova solução"""
+        element = self.netlist.element(element_id)
+        if element.type in (ComponentType.RESISTOR, ComponentType.CAPACITOR, ComponentType.INDUCTOR,
+                            ComponentType.SATURABLE_INDUCTOR, ComponentType.TRANSMISSION_LINE) and value <= 0:
+            raise ValueError(f"Valor inválido para {element.label}: {value}")
+        element.value = float(value)
+
+        if element.type in (ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE):
+            # Só o lado direito muda: basta uma nova substituição com a fatoração atual
+            self.system.b = source_vector(self.netlist, self.system)
+            self._y = self._base_solve(self.system.b)
+        elif element.type not in RANK_ONE_TYPES:
+            # Linha (comprimento não linear nas duas linhas de ramo) e demais elementos sem
+            # estampa de posto um: refatora para não deixar a solução desatualizada
+            self._refactor()
+            return self.solution()
+        else:
+            delta = self._matrix_delta(element, element.value)
+            if element_id in self._columns:
+                self._D[self._columns[element_id]] = delta
+            elif delta != 0:
+                if self.update_count >= self.max_updates:
+                    self._refactor()
+                    return self.solution()
+                u = element_vector(element, self.system)
+                self._columns[element_id] = len(self._D)
+                self._U = np.column_stack((self._U, u))
+                self._W = np.column_stack((self._W, self._base_solve(u)))
+                self._D = np.append(self._D, delta)
+
+        try:
+            self._x = self._smw_solve()
+        except np.linalg.LinAlgError:
+            self._refactor()
+        return self.solution()
+
+    def solution(self) -> CircuitSolution:
+        """Solução do circuito com os valores atuais"""
+        return CircuitSolution(self.netlist, self.system, self._x, self.frequency)
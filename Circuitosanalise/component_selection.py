@@ -0,0 +1,169 @@
+# Módulo de seleção inversa de componentes a partir de séries E e catálogos
+# Parte de metas de f₀, ζ e FP e devolve as melhores combinações (R, L, C) comerciais
+
+import csv
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+E_SERIES = {
+    "E12": (10, 12, 15, 18, 22, 27, 33, 39, 47, 56, 68, 82),
+    "E24": (10, 11, 12, 13, 15, 16, 18, 20, 22, 24, 27, 30,
+            33, 36, 39, 43, 47, 51, 56, 62, 68, 75, 82, 91),
+    "E96": (100, 102, 105, 107, 110, 113, 115, 118, 121, 124, 127, 130,
+            133, 137, 140, 143, 147, 150, 154, 158, 162, 165, 169, 174,
+            178, 182, 187, 191, 196, 200, 205, 210, 215, 221, 226, 232,
+            237, 243, 249, 255, 261, 267, 274, 280, 287, 294, 301, 309,
+            316, 324, 332, 340, 348, 357, 365, 374, 383, 392, 402, 412,
+            422, 432, 442, 453, 464, 475, 487, 499, 511, 523, 536, 549,
+            562, 576, 590, 604, 619, 634, 649, 665, 681, 698, 715, 732,
+            750, 768, 787, 806, 825, 845, 866, 887, 909, 931, 953, 976),
+}
+
+# Faixas típicas (décadas) de cada tipo de componente
+DEFAULT_DECADES = {"R": (-1, 6), "L": (-7, 0), "C": (-12, -2)}
+
+def series_values(name: str, first_decade: int, last_decade: int) -> np.ndarray:
+    """Valores da série E `name` de 10^first_decade até 10^last_decade (inclusive)"""
+    if name not in E_SERIES:
+        raise ValueError(f"Série desconhecida: {name}")
+    digits = len(str(E_SERIES[name][0])) - 1
+    # Monta pelo texto decimal para obter exatamente 4.7e-06 e não 4.7000000000000005e-06
+    values = [float(f"{mantissa}e{decade - digits}")
+              for decade in range(first_decade, last_decade) for mantissa in E_SERIES[name]]
+    return np.asarray(values + [10.0 ** last_decade])
+
+@dataclass
+class Catalog:
+    """Valores comerciais disponíveis por tipo ('R', 'L', 'C'), ordenados, com rótulos opcionais"""
+    values: Dict[str, np.ndarray]
+    labels: Dict[str, List[str]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        for kind, values in list(self.values.items()):
+            values = np.asarray(values, dtype=float)
+            order = np.argsort(values)
+            self.values[kind] = values[order]
+            if kind in self.labels:
+                self.labels[kind] = [self.labels[kind][k] for k in order]
+
+    def label(self, kind: str, index: int) -> str:
+        if kind in self.labels:
+            return self.labels[kind][index]
+        return f"{self.values[kind][index]:.4g}"
+
+def standard_catalog(r_series: str = "E96", l_series: str = "E12", c_series: str = "E24") -> Catalog:
+    """Catálogo com séries E nas faixas típicas de resistores, indutores e capacitores"""
+    return Catalog({
+        "R": series_values(r_series, *DEFAULT_DECADES["R"]),
+        "L": series_values(l_series, *DEFAULT_DECADES["L"]),
+        "C": series_values(c_series, *DEFAULT_DECADES["C"]),
+    })
+
+def load_catalog_csv(path: str) -> Catalog:
+    """Catálogo de fabricante em CSV com colunas tipo (R/L/C), valor (SI) e código"""
+    values: Dict[str, List[float]] = {"R": [], "L": [], "C": []}
+    labels: Dict[str, List[str]] = {"R": [], "L": [], "C": []}
+    with open(path, newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            kind = row['tipo'].strip().upper()
+            if kind not in values:
+                raise ValueError(f"Tipo de componente inválido no catálogo: {kind}")
+            values[kind].append(float(row['valor']))
+            labels[kind].append(row.get('codigo') or row['valor'])
+    return Catalog(values, labels)
+
+@dataclass
+class Selection:
+    """Uma combinação (R, L, C) e o desempenho obtido frente às metas"""
+    r: float
+    l: float
+    c: float
+    f0: float
+    zeta: float
+    pf: Optional[float]
+    error: float
+    parts: Tuple[str, str, str]
+
+def _window(sorted_values: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Faixas [início, fim) de índices com lower ≤ valor ≤ upper (bissecção vetorizada)"""
+    return (np.searchsorted(sorted_values, lower, side='left'),
+            np.searchsorted(sorted_values, upper, side='right'))
+
+def _expand(starts: np.ndarray, stops: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pares (linha, índice) para todas as janelas [start, stop) sem laços em Python"""
+    counts = np.maximum(stops - starts, 0)
+    rows = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return rows, np.repeat(starts, counts) + offsets
+
+def select_components(catalog: Catalog, f0: Optional[float] = None, zeta: Optional[float] = None,
+                      pf: Optional[float] = None, frequency: Optional[float] = None,
+                      tolerance: float = 0.05, top_n: int = 10) -> List[Selection]:
+    """Busca inversa: combinações do catálogo que atingem f₀, ζ e/ou FP dentro da tolerância relativa.
+
+    f₀ = 1/(2π√(LC)) fixa o produto LC: para cada L a faixa aceitável de C
+    é encontrada por bissecção no vetor ordenado de capacitores (encontro no
+    meio em vez de L × C × R). Para cada par (L, C) sobrevivente, ζ = R/2·√(C/L)
+    e/ou FP = R/|Z(f)| definem a faixa de R, de novo por bissecção. As
+    combinações são ordenadas pela soma dos erros relativos ao quadrado.
+    """
+    if zeta is None and pf is None:
+        raise ValueError("Informe ζ ou FP para que R possa ser escolhido")
+    if pf is not None and (frequency is None or not 0 < pf <= 1):
+        raise ValueError("FP requer 0 < FP ≤ 1 e a frequência de operação")
+    r_values, l_values, c_values = catalog.values["R"], catalog.values["L"], catalog.values["C"]
+
+    # Pares (L, C): janela de C para cada L a partir da meta de f₀
+    if f0 is not None:
+        omega0 = 2 * np.pi * f0
+        lc_low, lc_high = 1 / (omega0 * (1 + tolerance)) ** 2, 1 / (omega0 * (1 - tolerance)) ** 2
+        l_index, c_index = _expand(*_window(c_values, lc_low / l_values, lc_high / l_values))
+    else:
+        l_index, c_index = (k.ravel() for k in np.meshgrid(np.arange(len(l_values)),
+                                                            np.arange(len(c_values)), indexing='ij'))
+    l_pair, c_pair = l_values[l_index], c_values[c_index]
+
+    # Janela de R para cada par, interseção das metas de ζ e FP
+    r_low = np.zeros(len(l_pair))
+    r_high = np.full(len(l_pair), np.inf)
+    if zeta is not None:
+        scale = 2 * np.sqrt(l_pair / c_pair)
+        r_low = np.maximum(r_low, zeta * (1 - tolerance) * scale)
+        r_high = np.minimum(r_high, zeta * (1 + tolerance) * scale)
+    if pf is not None:
+        omega = 2 * np.pi * frequency
+        reactance = np.abs(omega * l_pair - 1 / (omega * c_pair))
+        # FP = R/√(R² + X²) cresce com R: R = FP·|X|/√(1 − FP²)
+        pf_low, pf_high = pf * (1 - tolerance), min(pf * (1 + tolerance), 1.0)
+        r_low = np.maximum(r_low, pf_low * reactance / np.sqrt(1 - pf_low**2))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r_high = np.minimum(r_high, np.where(pf_high < 1, pf_high * reactance / np.sqrt(1 - pf_high**2), np.inf))
+    pair, r_index = _expand(*_window(r_values, r_low, r_high))
+    if not len(pair):
+        return []
+
+    r, l, c = r_values[r_index], l_pair[pair], c_pair[pair]
+    achieved_f0 = 1 / (2 * np.pi * np.sqrt(l * c))
+    achieved_zeta = r / 2 * np.sqrt(c / l)
+    error = np.zeros(len(r))
+    if f0 is not None:
+        error += ((achieved_f0 - f0) / f0) ** 2
+    if zeta is not None:
+        error += ((achieved_zeta - zeta) / zeta) ** 2
+    achieved_pf = None
+    if pf is not None:
+        omega = 2 * np.pi * frequency
+        achieved_pf = r / np.hypot(r, omega * l - 1 / (omega * c))
+        error += ((achieved_pf - pf) / pf) ** 2
+
+    best = np.argsort(error, kind='stable')[:top_n] if len(error) <= top_n else \
+        np.argpartition(error, top_n - 1)[:top_n]
+    best = best[np.argsort(error[best], kind='stable')]
+    return [
+        Selection(float(r[k]), float(l[k]), float(c[k]), float(achieved_f0[k]), float(achieved_zeta[k]),
+                  None if achieved_pf is None else float(achieved_pf[k]), float(np.sqrt(error[k])),
+                  (catalog.label("R", r_index[k]), catalog.label("L", l_index[pair[k]]),
+                   catalog.label("C", c_index[pair[k]])))
+        for k in best
+    ]
@@ -0,0 +1,143 @@
+# Módulo de exploração do espaço de projeto do RLC série
+# Avalia |Z|, ∠Z, f_res, ζ, ωd, τ e FP sobre grades R × L × C × f em blocos, opcionalmente em vários processos
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple
+
+AXES = ("r", "l", "c", "f")
+AXIS_LABELS = {"r": "R [Ω]", "l": "L [H]", "c": "C [F]", "f": "f [Hz]"}
+QUANTITIES = {
+    "z_mag": "|Z| [Ω]",
+    "z_angle": "∠Z [°]",
+    "f_res": "f_res [Hz]",
+    "zeta": "ζ",
+    "wd": "ωd [rad/s]",
+    "tau": "τ [s]",
+    "pf": "FP",
+}
+REDUCTIONS = ("max", "min", "mean")
+DEFAULT_CHUNK_CELLS = 2_000_000
+# Limite de células por mapa e tamanho a partir do qual vale a pena abrir um pool de processos
+MAX_CELLS = 200_000_000
+PARALLEL_MIN_CELLS = 20_000_000
+
+def cell_quantity(name: str, r, l, c, f) -> np.ndarray:
+    """Grandeza `name` do RLC série com broadcast de R, L, C e f (mesmas fórmulas de calculate_all_parameters)"""
+    if name in ("z_mag", "z_angle", "pf"):
+        omega = 2 * np.pi * f
+        x_total = omega * l - 1 / (omega * c)
+        if name == "z_mag":
+            return np.hypot(r, x_total)
+        angle = np.arctan2(x_total, r)
+        return np.degrees(angle) if name == "z_angle" else np.cos(angle)
+    omega_n = 1 / np.sqrt(l * c)
+    if name == "f_res":
+        return omega_n / (2 * np.pi) + 0 * r
+    zeta = r / 2 * np.sqrt(c / l)
+    if name == "zeta":
+        return zeta
+    if name == "wd":
+        return omega_n * np.sqrt(np.maximum(1 - zeta**2, 0.0))
+    if name == "tau":
+        # τ = 1/(ζωₙ) = 2L/R; no amortecimento crítico vale 1/ωₙ
+        with np.errstate(divide='ignore'):
+            return np.where(zeta == 1, 1 / omega_n, 2 * l / r)
+    raise ValueError(f"Grandeza desconhecida: {name}")
+
+def _reduce(values: np.ndarray, axes: Tuple[int, ...], reduction: str) -> np.ndarray:
+    if not axes:
+        return values
+    if reduction == "max":
+        return values.max(axis=axes)
+    if reduction == "min":
+        return values.min(axis=axes)
+    return values.sum(axis=axes)
+
+def _evaluate_tile(task) -> Tuple[int, np.ndarray]:
+    """Avalia um bloco da grade e reduz os eixos que não aparecem no mapa"""
+    index, name, grids, x_axis, y_axis, reduction = task
+    shaped = [np.asarray(values).reshape([-1 if k == axis else 1 for k in range(4)])
+              for axis, values in enumerate(grids)]
+    values = np.broadcast_to(cell_quantity(name, *shaped), [len(g) for g in grids])
+    reduced_axes = tuple(k for k in range(4) if k not in (x_axis, y_axis))
+    partial = _reduce(values, reduced_axes, reduction)
+    # Ordem (y, x) para o heatmap
+    return index, partial if y_axis < x_axis else partial.T
+
+class DesignSpaceExplorer:
+    """Varredura de uma grandeza sobre R × L × C × f, projetada em dois eixos.
+
+    A grade completa nunca é materializada: ela é dividida ao longo do maior
+    eixo em blocos de no máximo `chunk_cells` células, cada bloco é avaliado
+    (em um pool de processos se `workers` > 1 e a grade tiver ao menos
+    PARALLEL_MIN_CELLS células) e reduzido nos dois eixos que não aparecem no
+    mapa por max, min ou média. Grades acima de MAX_CELLS são recusadas.
+    """
+
+    def __init__(self, r: Sequence[float], l: Sequence[float], c: Sequence[float], f: Sequence[float],
+                 chunk_cells: int = DEFAULT_CHUNK_CELLS, workers: Optional[int] = None):
+        self.grids = [np.atleast_1d(np.asarray(values, dtype=float)) for values in (r, l, c, f)]
+        if self.cells > MAX_CELLS:
+            raise ValueError(f"Grade com {self.cells:,} combinações excede o limite de {MAX_CELLS:,}")
+        self.chunk_cells = chunk_cells
+        self.workers = workers
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(len(g) for g in self.grids)
+
+    @property
+    def cells(self) -> int:
+        return int(np.prod(self.shape))
+
+    def _tiles(self, name: str, x_axis: int, y_axis: int, reduction: str):
+        split_axis = int(np.argmax(self.shape))
+        other_cells = self.cells // self.shape[split_axis]
+        step = max(1, self.chunk_cells // other_cells)
+        tasks = []
+        for index, start in enumerate(range(0, self.shape[split_axis], step)):
+            grids = list(self.grids)
+            grids[split_axis] = grids[split_axis][start:start + step]
+            tasks.append((index, name, grids, x_axis, y_axis, reduction))
+        return split_axis, tasks
+
+    def heatmap(self, name: str, x: str = "f", y: str = "r", reduction: str = "max") -> Dict:
+        """Mapa 2D da grandeza `name` nos eixos (x, y), reduzindo os outros dois.
+
+        Retorna um dicionário com 'x', 'y', 'z' (forma len(y) × len(x)),
+        rótulos e número de células avaliadas.
+        """
+        if name not in QUANTITIES:
+            raise ValueError(f"Grandeza desconhecida: {name}")
+        if reduction not in REDUCTIONS:
+            raise ValueError(f"Redução inválida: {reduction}")
+        if x == y or x not in AXES or y not in AXES:
+            raise ValueError("Escolha dois eixos diferentes entre r, l, c e f")
+        x_axis, y_axis = AXES.index(x), AXES.index(y)
+        split_axis, tasks = self._tiles(name, x_axis, y_axis, reduction)
+
+        if self.workers and self.workers > 1 and len(tasks) > 1 and self.cells >= PARALLEL_MIN_CELLS:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                partials = dict(pool.map(_evaluate_tile, tasks))
+        else:
+            partials = dict(map(_evaluate_tile, tasks))
+        ordered = [partials[k] for k in range(len(tasks))]
+
+        if split_axis in (x_axis, y_axis):
+            # Eixo dividido aparece no mapa: blocos são justapostos
+            z = np.concatenate(ordered, axis=1 if split_axis == x_axis else 0)
+        elif reduction == "max":
+            z = np.maximum.reduce(ordered)
+        elif reduction == "min":
+            z = np.minimum.reduce(ordered)
+        else:
+            z = np.sum(ordered, axis=0)
+        if reduction == "mean":
+            z = z / (self.cells // (self.shape[x_axis] * self.shape[y_axis]))
+
+        return {
+            "x": self.grids[x_axis], "y": self.grids[y_axis], "z": z,
+            "x_label": AXIS_LABELS[x], "y_label": AXIS_LABELS[y],
+            "label": QUANTITIES[name], "cells": self.cells,
+        }
@@ -0,0 +1,161 @@
+# Módulo de modelos de dispositivos não lineares (diodo, TBJ de Ebers-Moll, MOSFET nível 1, indutor saturável)
+# Equações vetorizadas por tipo: correntes nos terminais e suas derivadas para o Newton-Raphson
+
+import numpy as np
+from typing import Dict, Tuple
+
+from circuit_editor import ComponentType
+
+# kT/q a 300 K [V]
+THERMAL_VOLTAGE = 0.025852
+# Acima deste argumento a exponencial segue pela reta tangente (evita estouro durante o Newton)
+EXP_LIMIT = 40.0
+
+# Valor do elemento na netlist: diodo → Iₛ [A], TBJ → β direto, MOSFET → β = K'·W/L [A/V²],
+# indutor saturável → L₀ [H]. Polaridade +1 = NPN / canal N, −1 = PNP / canal P; a capacitância
+# de junção C_j do diodo é constante (linear) e entra em C junto com os capacitores
+DEVICE_DEFAULTS = {
+    ComponentType.DIODE: {"n": 1.0, "cj": 0.0},
+    ComponentType.BJT: {"is": 1e-14, "br": 1.0, "polarity": 1},
+    ComponentType.MOSFET: {"vto": 1.0, "lambda": 0.0, "polarity": 1},
+    ComponentType.SATURABLE_INDUCTOR: {"isat": 1.0, "ratio": 0.05},
+}
+DEVICE_LABELS = {
+    "n": "Coeficiente de emissão n", "cj": "C_j [F]", "is": "Iₛ [A]", "br": "β reverso",
+    "polarity": "Polaridade (+1 NPN/N, −1 PNP/P)", "vto": "V_T0 [V]", "lambda": "λ [1/V]",
+    "isat": "I_sat [A]", "ratio": "L_sat / L₀",
+}
+# Terminais (na ordem node1, node2, node3): diodo A-K, TBJ C-E-B, MOSFET D-S-G
+DEVICE_TERMINALS = {ComponentType.DIODE: 2, ComponentType.BJT: 3, ComponentType.MOSFET: 3}
+
+def device_parameters(element_type: ComponentType, parameters: Dict = None) -> Dict[str, float]:
+    """Parâmetros completos do modelo (valores ausentes assumem DEVICE_DEFAULTS), validados"""
+    merged = {**DEVICE_DEFAULTS[element_type], **(parameters or {})}
+    if "polarity" in merged and merged["polarity"] not in (1, -1):
+        raise ValueError("Polaridade deve ser +1 ou −1")
+    if any(merged.get(name, 1.0) <= 0 for name in ("n", "is", "br", "isat")):
+        raise ValueError("Parâmetros do modelo devem ser positivos")
+    if merged.get("cj", 0.0) < 0 or merged.get("lambda", 0.0) < 0 or not 0 < merged.get("ratio", 1.0) <= 1:
+        raise ValueError("C_j e λ devem ser não negativos e L_sat/L₀ estar em (0, 1]")
+    return merged
+
+def _exp(x):
+    """e^x e sua derivada, continuadas linearmente acima de EXP_LIMIT"""
+    clipped = np.minimum(x, EXP_LIMIT)
+    e = np.exp(clipped)
+    return e * (1 + x - clipped), e
+
+def junction(v, saturation, nvt) -> Tuple[np.ndarray, np.ndarray]:
+    """Corrente Iₛ·(e^{v/nVt} − 1) da junção e sua condutância"""
+    e, de = _exp(v / nvt)
+    return saturation * (e - 1), saturation * de / nvt
+
+def critical_voltage(saturation, nvt):
+    """Tensão a partir da qual a junção passa a ter o passo de Newton limitado (SPICE vcrit)"""
+    return nvt * np.log(nvt / (np.sqrt(2) * saturation))
+
+def limit_junction(v_new, v_old, saturation, nvt):
+    """Limitação logarítmica do passo de tensão da junção (pnjlim do SPICE), vetorizada.
+
+    Acima de vcrit o passo deixa de seguir a exponencial (que erra muito
+    longe do ponto de linearização) e passa a ser vold + nVt·ln(1 + Δv/nVt).
+    """
+    vcrit = critical_voltage(saturation, nvt)
+    active = (v_new > vcrit) & (np.abs(v_new - v_old) > 2 * nvt)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        arg = 1 + (v_new - v_old) / nvt
+        from_on = np.where(arg > 0, v_old + nvt * np.log(np.where(arg > 0, arg, 1.0)), vcrit)
+        from_off = nvt * np.log(np.maximum(v_new, nvt) / nvt)
+    return np.where(active, np.where(v_old > 0, from_on, from_off), v_new)
+
+def ebers_moll(vbe, vbc, saturation, beta_f, beta_r):
+    """Correntes de coletor e base do TBJ NPN (modelo de transporte) e derivadas em vbe e vbc"""
+    ef, gf = junction(vbe, saturation, THERMAL_VOLTAGE)
+    er, gr = junction(vbc, saturation, THERMAL_VOLTAGE)
+    ic = ef - er - er / beta_r
+    ib = ef / beta_f + er / beta_r
+    return ic, ib, gf, -gr - gr / beta_r, gf / beta_f, gr / beta_r
+
+def _level1_forward(vgs, vds, beta, vto, lam):
+    """Corrente de dreno do MOSFET nível 1 (Shichman-Hodges) com vds ≥ 0, gm e gds"""
+    vov = vgs - vto
+    on = vov > 0
+    saturated = vds >= vov
+    clm = 1 + lam * vds
+    square = np.where(saturated, 0.5 * vov * vov, vov * vds - 0.5 * vds * vds)
+    i = np.where(on, beta * square * clm, 0.0)
+    gm = np.where(on, beta * np.where(saturated, vov, vds) * clm, 0.0)
+    gds = np.where(on, beta * (np.where(saturated, 0.0, vov - vds) * clm + square * lam), 0.0)
+    return i, gm, gds
+
+def mosfet_level1(vgs, vds, beta, vto, lam):
+    """Corrente de dreno (canal N) em qualquer sentido: com vds < 0 dreno e fonte trocam de papel"""
+    reverse = vds < 0
+    i, gm, gds = _level1_forward(np.where(reverse, vgs - vds, vgs), np.abs(vds), beta, vto, lam)
+    return (np.where(reverse, -i, i), np.where(reverse, -gm, gm),
+            np.where(reverse, gm + gds, gds))
+
+def saturable_flux(i, inductance, ratio, isat):
+    """Fluxo φ(i) = L_sat·i + (L₀ − L_sat)·I_sat·tanh(i/I_sat) e a indutância incremental dφ/di"""
+    lsat = ratio * inductance
+    t = np.tanh(i / isat)
+    return lsat * i + (inductance - lsat) * isat * t, lsat + (inductance - lsat) * (1 - t * t)
+
+def junction_voltages(element_type: ComponentType, V: np.ndarray, value, parameters: Dict):
+    """Tensões das junções (N × j), suas correntes de saturação e nVt, para limitar o passo"""
+    if element_type == ComponentType.DIODE:
+        v = (V[:, 0] - V[:, 1])[:, None]
+        return v, np.broadcast_to(np.reshape(value, (-1, 1)), v.shape), \
+            np.broadcast_to(np.reshape(parameters["n"] * THERMAL_VOLTAGE, (-1, 1)), v.shape)
+    if element_type == ComponentType.BJT:
+        p = parameters["polarity"]
+        v = np.stack((p * (V[:, 2] - V[:, 1]), p * (V[:, 2] - V[:, 0])), axis=1)
+        return v, np.broadcast_to(np.reshape(parameters["is"], (-1, 1)), v.shape), \
+            np.full(v.shape, THERMAL_VOLTAGE)
+    empty = np.zeros((len(V), 0))
+    return empty, empty, empty
+
+def terminal_currents(element_type: ComponentType, V: np.ndarray, value, parameters: Dict,
+                      gmin: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Correntes que entram no dispositivo por cada terminal (N × m) e o jacobiano dI/dV (N × m × m).
+
+    V traz as tensões dos terminais na ordem node1, node2, node3. Uma
+    condutância gmin em paralelo com cada junção (e com o canal) mantém o
+    jacobiano não singular com o dispositivo cortado.
+    """
+    if element_type == ComponentType.DIODE:
+        v = V[:, 0] - V[:, 1]
+        i, g = junction(v, value, parameters["n"] * THERMAL_VOLTAGE)
+        i, g = i + gmin * v, g + gmin
+        J = g[:, None, None] * np.array([[1.0, -1.0], [-1.0, 1.0]])
+        return np.stack((i, -i), axis=1), J
+
+    p = parameters["polarity"]
+    N = len(V)
+    J = np.zeros((N, 3, 3))
+    if element_type == ComponentType.BJT:
+        # Terminais C, E, B; vbe = p·(VB − VE), vbc = p·(VB − VC)
+        vbe, vbc = p * (V[:, 2] - V[:, 1]), p * (V[:, 2] - V[:, 0])
+        ic, ib, ic_be, ic_bc, ib_be, ib_bc = ebers_moll(vbe, vbc, parameters["is"], value, parameters["br"])
+        # gmin de B para E e de B para C
+        ic, ib = ic - gmin * vbc, ib + gmin * (vbe + vbc)
+        ic_bc, ib_be, ib_bc = ic_bc - gmin, ib_be + gmin, ib_bc + gmin
+        # d(p·f)/dV: ∂/∂VB = f_be + f_bc, ∂/∂VE = −f_be, ∂/∂VC = −f_bc (independe da polaridade)
+        for row, f_be, f_bc in ((0, ic_be, ic_bc), (2, ib_be, ib_bc)):
+            J[:, row, 0] = -f_bc
+            J[:, row, 1] = -f_be
+            J[:, row, 2] = f_be + f_bc
+        J[:, 1] = -(J[:, 0] + J[:, 2])
+        I = np.stack((p * ic, -p * (ic + ib), p * ib), axis=1)
+        return I, J
+
+    # MOSFET: terminais D, S, G; a porta não conduz
+    vgs, vds = p * (V[:, 2] - V[:, 1]), p * (V[:, 0] - V[:, 1])
+    i, gm, gds = mosfet_level1(vgs, vds, value, parameters["vto"], parameters["lambda"])
+    i, gds = i + gmin * vds, gds + gmin
+    J[:, 0, 0] = gds
+    J[:, 0, 1] = -(gm + gds)
+    J[:, 0, 2] = gm
+    J[:, 1] = -J[:, 0]
+    I = np.stack((p * i, -p * i, np.zeros(N)), axis=1)
+    return I, J
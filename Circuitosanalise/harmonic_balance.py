@@ -0,0 +1,343 @@
+# Módulo de regime permanente periódico por balanço harmônico
+# Incógnitas = fasores dos harmônicos 0..K de cada incógnita do MNA; a parte linear é resolvida por
+# harmônico e os dispositivos não lineares são avaliados no tempo (FFT) em um período
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from typing import Callable, Dict, Optional, Tuple
+
+from circuit_editor import ComponentType
+from circuit_solver import BRANCH_TYPES, GMIN, Netlist, assemble_mna
+from device_models import DEVICE_TERMINALS, device_parameters, saturable_flux
+from nonlinear_solver import REUSE_CONTRACTION, SOURCE_STEPS, DeviceGroup, device_current
+from transient_solver import source_function
+
+DEFAULT_HARMONICS = 25
+# Amostras por período: menor potência de 2 ≥ OVERSAMPLING·(K + 1) (reduz o aliasing dos dispositivos)
+OVERSAMPLING = 4
+# Retificadores com pouca capacitância pedem mais iterações que um passo do transitório
+MAX_ITERATIONS = 100
+# Reduções do passo de Newton pela metade antes de aceitar um passo que não reduz o resíduo
+LINE_SEARCH_HALVINGS = 20
+
+def sample_count(harmonics: int) -> int:
+    """Amostras por período usadas na avaliação dos dispositivos"""
+    return int(2 ** np.ceil(np.log2(OVERSAMPLING * (harmonics + 1))))
+
+def synthesis_matrix(harmonics: int, samples: int) -> np.ndarray:
+    """E (amostras × 2K+1): x(tₙ) = X₀ + Σ aₖ·cos kθₙ − bₖ·sin kθₙ, com Xₖ = aₖ + j·bₖ"""
+    theta = 2 * np.pi * np.arange(samples) / samples
+    k = np.arange(1, harmonics + 1)
+    E = np.empty((samples, 2 * harmonics + 1))
+    E[:, 0] = 1.0
+    E[:, 1::2] = np.cos(np.outer(theta, k))
+    E[:, 2::2] = -np.sin(np.outer(theta, k))
+    return E
+
+def analysis_matrix(harmonics: int, samples: int) -> np.ndarray:
+    """P (2K+1 × amostras), inversa à esquerda de E: os coeficientes que a FFT calcula"""
+    P = synthesis_matrix(harmonics, samples).T * (2.0 / samples)
+    P[0] /= 2
+    return P
+
+def to_time(phasors: np.ndarray, samples: int) -> np.ndarray:
+    """Amostras de um período (amostras × incógnitas) a partir dos fasores de pico (K+1 × incógnitas)"""
+    spectrum = np.zeros((samples // 2 + 1,) + phasors.shape[1:], dtype=complex)
+    spectrum[:len(phasors)] = phasors * (samples / 2)
+    spectrum[0] = phasors[0] * samples
+    return np.fft.irfft(spectrum, n=samples, axis=0)
+
+def to_phasors(values: np.ndarray, harmonics: int) -> np.ndarray:
+    """Fasores de pico dos harmônicos 0..K das amostras de um período (FFT real)"""
+    spectrum = np.fft.rfft(values, axis=0)[:harmonics + 1] / len(values)
+    spectrum[1:] *= 2
+    spectrum[0] = spectrum[0].real
+    return spectrum
+
+def _pack(phasors: np.ndarray) -> np.ndarray:
+    """Vetor real [X₀, Re X₁, Im X₁, ...] por incógnita, ordenado por harmônico"""
+    packed = np.empty((2 * len(phasors) - 1,) + phasors.shape[1:])
+    packed[0] = phasors[0].real
+    packed[1::2] = phasors[1:].real
+    packed[2::2] = phasors[1:].imag
+    return packed.reshape(-1)
+
+def _unpack(z: np.ndarray, size: int) -> np.ndarray:
+    z = z.reshape(-1, size)
+    return np.concatenate((z[:1], z[1::2] + 1j * z[2::2]))
+
+class PeriodicSolution:
+    """Regime permanente periódico: fasores de pico Xₖ (k = 0..K) de cada incógnita do MNA.
+
+    x(t) = Re Σ Xₖ·e^{jkωt}; o harmônico 0 é o valor médio (real).
+    """
+
+    def __init__(self, netlist: Netlist, system, phasors: np.ndarray, frequency: float,
+                 sources: Dict[str, np.ndarray], iterations: int = 0, factorizations: int = 0,
+                 gmin: float = GMIN):
+        self.netlist = netlist
+        self.system = system
+        self.phasors = phasors
+        self.frequency = frequency
+        self.sources = sources
+        self.iterations = iterations
+        self.factorizations = factorizations
+        self.gmin = gmin
+
+    @property
+    def harmonics(self) -> int:
+        return len(self.phasors) - 1
+
+    @property
+    def orders(self) -> np.ndarray:
+        return np.arange(self.harmonics + 1)
+
+    def node_phasors(self, node: int) -> np.ndarray:
+        if node == 0:
+            return np.zeros(self.harmonics + 1, dtype=complex)
+        return self.phasors[:, node - 1]
+
+    def element_voltage(self, element_id: str) -> np.ndarray:
+        """Fasores da tensão entre o terminal 1 e o terminal 2 do elemento"""
+        element = self.netlist.element(element_id)
+        return self.node_phasors(element.node1) - self.node_phasors(element.node2)
+
+    def element_current(self, element_id: str) -> np.ndarray:
+        """Fasores da corrente do terminal 1 para o terminal 2 (dispositivos: anodo, coletor ou dreno)"""
+        element = self.netlist.element(element_id)
+        if element.type in BRANCH_TYPES:
+            return self.phasors[:, self.system.branch_index[element.id]]
+        v = self.element_voltage(element_id)
+        jw = 2j * np.pi * self.frequency * self.orders
+        if element.type in (ComponentType.RESISTOR, ComponentType.SWITCH):
+            return v / element.value
+        if element.type == ComponentType.CAPACITOR:
+            return jw * element.value * v
+        if element.type == ComponentType.CURRENT_SOURCE:
+            return self.sources[element.id]
+        if element.type in DEVICE_TERMINALS:
+            samples = sample_count(self.harmonics)
+            voltages = to_time(np.hstack((np.zeros((self.harmonics + 1, 1)),
+                                          self.phasors[:, :self.system.node_count])), samples)
+            current = to_phasors(device_current(element, voltages, self.gmin), self.harmonics)
+            return current + jw * device_parameters(element.type, element.parameters).get("cj", 0.0) * v
+        return np.zeros(self.harmonics + 1, dtype=complex)
+
+    def waveform(self, phasors: np.ndarray, samples: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(t, valores) de um período a partir dos fasores"""
+        samples = samples or sample_count(self.harmonics)
+        return np.arange(samples) / (samples * self.frequency), to_time(phasors, samples)
+
+    def power_metrics(self, element_id: str, delivered: bool = False) -> Dict[str, float]:
+        """Potências e fator de potência não senoidais do elemento.
+
+        P soma V·I de todos os harmônicos, S = V_rms·I_rms e Q é a reativa da
+        fundamental; a potência de distorção D = √(S² − P² − Q²) separa o fator
+        de potência total (P/S) do de deslocamento (cos φ₁). A potência é a
+        absorvida pelo elemento; com delivered=True, a fornecida (fontes).
+        """
+        v = self.element_voltage(element_id)
+        i = -self.element_current(element_id) if delivered else self.element_current(element_id)
+        active = float(v[0].real * i[0].real + 0.5 * np.sum((v[1:] * np.conj(i[1:])).real))
+        reactive = float(0.5 * (v[1] * np.conj(i[1])).imag) if self.harmonics else 0.0
+        v_rms = float(np.sqrt(v[0].real ** 2 + 0.5 * np.sum(np.abs(v[1:]) ** 2)))
+        i_rms = float(np.sqrt(i[0].real ** 2 + 0.5 * np.sum(np.abs(i[1:]) ** 2)))
+        apparent = v_rms * i_rms
+
+        def thd(x):
+            # Sem fundamental (grandezas CC) a THD não é definida: retorna 0
+            fundamental = abs(x[1]) if len(x) > 1 else 0.0
+            if fundamental <= 1e-6 * np.abs(x).max():
+                return 0.0
+            return float(np.sqrt(np.sum(np.abs(x[2:]) ** 2)) / fundamental)
+
+        return {
+            'active': active, 'reactive': reactive, 'apparent': apparent, 'reactive_abs': abs(reactive),
+            'distortion': float(np.sqrt(max(apparent ** 2 - active ** 2 - reactive ** 2, 0.0))),
+            'power_factor': active / apparent if apparent > 0 else 0.0,
+            'displacement_power_factor': float(np.cos(np.angle(v[1]) - np.angle(i[1]))) if self.harmonics else 1.0,
+            'thd_voltage': thd(v), 'thd_current': thd(i),
+            'voltage_rms': v_rms, 'current_rms': i_rms,
+        }
+
+class HarmonicBalanceSolver:
+    """Balanço harmônico: Y(kω)·Xₖ + Iₖ(x) + jkω·Qₖ(x) = Bₖ para k = 0..K.
+
+    A parte linear é o MNA em cada harmônico, Y(kω) = G + jkωC mais as
+    estampas exatas das linhas de transmissão em kω, montado uma única vez
+    como matriz bloco-diagonal real. Correntes i(x) e fluxos q(x) dos
+    dispositivos são avaliados em amostras de um período (iFFT dos fasores)
+    e voltam aos harmônicos por FFT. O jacobiano de cada estampa (linha,
+    coluna) de dispositivo é o bloco denso P·diag(g(tₙ))·E, com g a
+    condutância (ou indutância incremental) amostrada, somado aos blocos
+    diagonais lineares; a fatoração esparsa é reaproveitada entre iterações
+    com a mesma regra de contração do solver de Newton no tempo. O passo é
+    amortecido por busca linear na norma do resíduo (a limitação das junções
+    instante a instante não garante descida quando volta aos harmônicos).
+    """
+
+    def __init__(self, netlist: Netlist, frequency: float, harmonics: int = DEFAULT_HARMONICS,
+                 reltol: float = 1e-4, abstol: float = 1e-9, gmin: float = GMIN,
+                 max_iterations: int = MAX_ITERATIONS):
+        if frequency <= 0 or harmonics < 1:
+            raise ValueError("Frequência deve ser positiva e haver ao menos um harmônico")
+        self.netlist = netlist
+        self.frequency = frequency
+        self.harmonics = harmonics
+        self.samples = sample_count(harmonics)
+        self.reltol = reltol
+        self.abstol = abstol
+        self.gmin = gmin
+        self.max_iterations = max_iterations
+        self.system = assemble_mna(netlist, gmin)
+        size = self.system.size
+        self.groups = [DeviceGroup(element_type, elements, self.system.node_count, size)
+                       for element_type in DEVICE_TERMINALS
+                       for elements in [[e for e in netlist.elements if e.type == element_type]] if elements]
+        saturable = [e for e in netlist.elements if e.type == ComponentType.SATURABLE_INDUCTOR]
+        self._branches = np.array([self.system.branch_index[e.id] for e in saturable], dtype=int)
+        self._inductance = np.array([e.value for e in saturable])
+        merged = [device_parameters(e.type, e.parameters) for e in saturable]
+        self._ratio = np.array([p["ratio"] for p in merged])
+        self._isat = np.array([p["isat"] for p in merged])
+
+        # Blocos lineares por harmônico: [[Re Y, −Im Y], [Im Y, Re Y]] agindo em (Re Xₖ, Im Xₖ)
+        blocks = [self.system.matrix(0.0).real]
+        for k in range(1, harmonics + 1):
+            Y = self.system.matrix(k * frequency)
+            blocks.append(sp.bmat([[Y.real, -Y.imag], [Y.imag, Y.real]]))
+        self.linear = sp.block_diag(blocks, format='csr')
+
+        self.E = synthesis_matrix(harmonics, self.samples)
+        self.P = analysis_matrix(harmonics, self.samples)
+        # Derivada no tempo nos coeficientes: jkω·(a + jb) = −kω·b + j·kω·a
+        omega = 2 * np.pi * frequency * np.arange(1, harmonics + 1)
+        self.derivative = sp.csr_matrix(
+            (np.concatenate((-omega, omega)),
+             (np.concatenate((2 * np.arange(harmonics) + 1, 2 * np.arange(harmonics) + 2)),
+              np.concatenate((2 * np.arange(harmonics) + 2, 2 * np.arange(harmonics) + 1)))),
+            shape=(2 * harmonics + 1, 2 * harmonics + 1))
+        self._entry_rows = np.concatenate([g.jacobian_rows for g in self.groups] + [self._branches])
+        self._entry_cols = np.concatenate([g.jacobian_cols for g in self.groups] + [self._branches])
+        self._lu: Optional[spla.SuperLU] = None
+        self.factorization_count = 0
+        self.iteration_count = 0
+
+    def _excitation(self, sources: Optional[Dict[str, Callable[[float], float]]]):
+        """Bₖ e os fasores de cada fonte: formas de onda periódicas em `sources` são decompostas
+        por FFT; as demais fontes entram na fundamental com o valor da netlist (fasor de pico)"""
+        sources = sources or {}
+        times = np.arange(self.samples) / (self.samples * self.frequency)
+        static = source_function(self.netlist, self.system, {e: (lambda t: 0.0) for e in sources})(0.0)
+        waveform = source_function(self.netlist, self.system, sources)
+        excitation = to_phasors(np.array([waveform(t) for t in times]) - static, self.harmonics)
+        excitation[1] += static
+        phasors = {}
+        for element in self.netlist.elements:
+            if element.type in (ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE):
+                phasors[element.id] = np.zeros(self.harmonics + 1, dtype=complex)
+                if element.id in sources:
+                    phasors[element.id] = to_phasors(np.array([sources[element.id](t) for t in times]),
+                                                     self.harmonics)
+                else:
+                    phasors[element.id][1] = element.value
+        return excitation, phasors
+
+    def _devices(self, x: np.ndarray):
+        """Correntes e fluxos não lineares nas amostras (amostras × incógnitas) e suas derivadas"""
+        currents = np.zeros_like(x)
+        fluxes = np.zeros_like(x)
+        values = []
+        for group in self.groups:
+            group_currents, group_values = group.evaluate(x, self.gmin)
+            currents += group_currents
+            values.append(group_values)
+        i = x[:, self._branches]
+        flux, inductance = saturable_flux(i, self._inductance, self._ratio, self._isat)
+        fluxes[:, self._branches] = -(flux - self._inductance * i)
+        values.append(-(inductance - self._inductance))
+        return currents, fluxes, np.hstack(values)
+
+    def _residual(self, z: np.ndarray, excitation: np.ndarray):
+        """Resíduo, estampas do jacobiano nas amostras e a escala de cada equação (maior termo somado)"""
+        size = self.system.size
+        currents, fluxes, values = self._devices(to_time(_unpack(z, size), self.samples))
+        nonlinear = _pack(to_phasors(currents, self.harmonics))
+        flux = _pack(to_phasors(fluxes, self.harmonics)).reshape(-1, size)
+        nonlinear += (self.derivative @ flux).reshape(-1)
+        rhs = _pack(excitation)
+        terms = abs(self.linear) @ np.abs(z) + np.abs(nonlinear) + np.abs(rhs)
+        return self.linear @ z + nonlinear - rhs, values, terms.reshape(-1, size).max(axis=0)
+
+    def _factorize(self, values: np.ndarray):
+        """Jacobiano: blocos lineares + um bloco denso P·diag(g)·E por estampa de dispositivo"""
+        size, H = self.system.size, 2 * self.harmonics + 1
+        blocks = np.einsum('hn,ne,nl->ehl', self.P, values, self.E)
+        saturable = len(values[0]) - len(self._branches)
+        if len(self._branches):
+            blocks[saturable:] = np.einsum('hm,eml->ehl', self.derivative.toarray(), blocks[saturable:])
+        harmonic = np.arange(H)
+        rows = harmonic[None, :, None] * size + self._entry_rows[:, None, None]
+        cols = harmonic[None, None, :] * size + self._entry_cols[:, None, None]
+        device = sp.coo_matrix((blocks.ravel(), (np.broadcast_to(rows, blocks.shape).ravel(),
+                                                 np.broadcast_to(cols, blocks.shape).ravel())),
+                               shape=self.linear.shape)
+        self.factorization_count += 1
+        self._lu = spla.splu((self.linear + device).tocsc())
+
+    def _newton(self, z: np.ndarray, excitation: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """Newton amortecido por busca linear na norma do resíduo; retorna (z, convergiu)"""
+        size = self.system.size
+        residual, values, terms = self._residual(z, excitation)
+        refactor = True
+        for _ in range(self.max_iterations):
+            if refactor:
+                self._factorize(values)
+            dz = -self._lu.solve(residual)
+            norm = np.linalg.norm(residual)
+            step = 1.0
+            for _ in range(LINE_SEARCH_HALVINGS):
+                trial = self._residual(z + step * dz, excitation)
+                if np.linalg.norm(trial[0]) <= (1 - 1e-4 * step) * norm:
+                    break
+                step /= 2
+            self.iteration_count += 1
+            if step < 1.0 and not refactor:
+                # Direção do jacobiano antigo não reduz o resíduo: refatora no ponto atual
+                refactor = True
+                continue
+            z = z + step * dz
+            residual, values, terms = trial
+            # Passo pequeno diante da maior amplitude harmônica de cada incógnita, ou resíduo
+            # pequeno diante do maior termo da equação (modos quase flutuantes deixam o passo grande)
+            scale = np.abs(z.reshape(-1, size)).max(axis=0)
+            small_step = np.all(np.abs(step * dz.reshape(-1, size)) <= self.reltol * scale + self.abstol)
+            small_residual = np.all(np.abs(residual.reshape(-1, size)) <= self.reltol * terms + self.abstol)
+            if small_residual or (step == 1.0 and small_step):
+                return z, True
+            refactor = step < 1.0 or np.linalg.norm(residual) > REUSE_CONTRACTION * norm
+        return z, False
+
+    def solve(self, sources: Optional[Dict[str, Callable[[float], float]]] = None,
+              initial_guess: Optional[PeriodicSolution] = None) -> PeriodicSolution:
+        """Regime permanente periódico na frequência fundamental do solver.
+
+        `sources` traz formas de onda periódicas (função do tempo) de fontes
+        da netlist; as demais fontes são senoides na fundamental com o valor
+        da netlist como amplitude de pico (como na análise AC). Sem
+        convergência direta, as fontes são aplicadas em rampa.
+        """
+        iterations, factorizations = self.iteration_count, self.factorization_count
+        excitation, phasors = self._excitation(sources)
+        z = np.zeros(self.linear.shape[0]) if initial_guess is None else _pack(initial_guess.phasors)
+        z_new, converged = self._newton(z, excitation)
+        if not converged:
+            for scale in np.arange(1, SOURCE_STEPS + 1) / SOURCE_STEPS:
+                z, converged = self._newton(z, scale * excitation)
+                if not converged:
+                    raise RuntimeError("Balanço harmônico não convergiu")
+            z_new = z
+        return PeriodicSolution(self.netlist, self.system, _unpack(z_new, self.system.size), self.frequency,
+                                phasors, self.iteration_count - iterations,
+                                self.factorization_count - factorizations, self.gmin)
@@ -0,0 +1,106 @@
+# Módulo de fluxo harmônico (harmonic load-flow) de netlists lineares
+# Cada ordem h é uma análise AC independente em h·f com as injeções harmônicas das fontes;
+# as ordens são resolvidas em paralelo e combinadas em THD de tensão por nó
+
+import numpy as np
+import scipy.sparse.linalg as spla
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from circuit_solver import GMIN, Netlist, assemble_mna
+from model_reduction import input_matrix
+
+DEFAULT_MAX_ORDER = 50
+
+def pulse_spectrum(pulses: int = 6, max_order: int = DEFAULT_MAX_ORDER) -> Dict[int, float]:
+    """Espectro característico de um conversor de p pulsos: h = k·p ± 1 com amplitude 1/h do fundamental"""
+    return {h: 1.0 / h for k in range(1, max_order // pulses + 1) for h in (k * pulses - 1, k * pulses + 1)
+            if h <= max_order}
+
+def _order_chunk(task) -> np.ndarray:
+    system, frequency, orders, rhs = task
+    voltages = np.empty((len(orders), system.node_count), dtype=complex)
+    for k, order in enumerate(orders):
+        x = spla.splu(system.matrix(order * frequency)).solve(rhs[k])
+        voltages[k] = x[:system.node_count]
+    return voltages
+
+@dataclass
+class HarmonicFlow:
+    """Tensões nodais (fasores de pico) em cada ordem harmônica resolvida"""
+    netlist: Netlist
+    frequency: float
+    orders: np.ndarray
+    # (ordens × nós); a linha da ordem 1 é a análise AC com os valores da netlist
+    voltages: np.ndarray
+
+    def order_voltages(self, order: int) -> np.ndarray:
+        index = np.flatnonzero(self.orders == order)
+        if not len(index):
+            raise ValueError(f"Ordem {order} não resolvida")
+        return self.voltages[index[0]]
+
+    def node_spectrum(self, node: int) -> np.ndarray:
+        """|V_h| do nó em cada ordem de `orders`"""
+        return np.abs(self.voltages[:, node - 1])
+
+    @property
+    def individual_distortion(self) -> np.ndarray:
+        """|V_h|/|V₁| (ordens × nós); nós sem fundamental ficam com 0"""
+        fundamental = np.abs(self.order_voltages(1))
+        return np.divide(np.abs(self.voltages), fundamental, out=np.zeros(self.voltages.shape),
+                         where=fundamental > 0)
+
+    @property
+    def thd(self) -> np.ndarray:
+        """THD de tensão por nó: √(Σ_{h≠1} |V_h|²)/|V₁|"""
+        distortion = self.individual_distortion
+        distortion[self.orders == 1] = 0.0
+        return np.sqrt(np.sum(distortion ** 2, axis=0))
+
+    @property
+    def rms(self) -> np.ndarray:
+        """Tensão eficaz por nó somando todas as ordens"""
+        return np.sqrt(0.5 * np.sum(np.abs(self.voltages) ** 2, axis=0))
+
+    def worst_nodes(self, count: int = 10) -> np.ndarray:
+        """Nós (numeração da netlist) com maior THD, em ordem decrescente"""
+        return np.argsort(-self.thd, kind='stable')[:count] + 1
+
+def harmonic_load_flow(netlist: Netlist, frequency: float, injections: Dict[str, Dict[int, complex]],
+                       max_order: Optional[int] = None, workers: Optional[int] = None,
+                       gmin: float = GMIN) -> HarmonicFlow:
+    """Fluxo harmônico: uma análise AC por ordem com as fontes harmônicas de `injections`.
+
+    injections[fonte][h] é a amplitude (complexa, com fase) da ordem h
+    relativa ao valor da fonte na netlist, p.ex. pulse_spectrum(6) para uma
+    carga retificadora modelada como fonte de corrente. Na ordem 1 todas as
+    fontes têm os valores da netlist; nas demais, fontes sem injeção valem
+    zero (fonte de tensão em curto, de corrente em aberto), de modo que a
+    rede responde só pelas suas impedâncias em h·f. São resolvidas a ordem 1
+    e as ordens com injeção até max_order; com workers > 1 as ordens são
+    divididas em blocos contíguos entre processos.
+    """
+    if frequency <= 0:
+        raise ValueError("Frequência fundamental deve ser positiva")
+    system = assemble_mna(netlist, gmin)
+    sources = list(injections)
+    B = input_matrix(netlist, system, sources)
+    values = np.array([netlist.element(source).value for source in sources], dtype=float)
+    orders = sorted({1} | {h for spectrum in injections.values() for h in spectrum
+                           if h > 1 and (max_order is None or h <= max_order)})
+    rhs = np.empty((len(orders), system.size), dtype=complex)
+    rhs[0] = system.b
+    for k, order in enumerate(orders[1:], start=1):
+        amplitudes = np.array([injections[source].get(order, 0.0) for source in sources], dtype=complex)
+        rhs[k] = B @ (values * amplitudes)
+
+    chunks = np.array_split(np.arange(len(orders)), max(1, min(workers or 1, len(orders))))
+    tasks = [(system, frequency, [orders[i] for i in chunk], rhs[chunk]) for chunk in chunks]
+    if workers and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_order_chunk, tasks))
+    else:
+        parts = [_order_chunk(task) for task in tasks]
+    return HarmonicFlow(netlist, frequency, np.array(orders), np.vstack(parts))
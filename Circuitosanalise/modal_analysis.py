@@ -0,0 +1,131 @@
+# Módulo de análise modal (polos, zeros e frequências naturais) de netlists
+# Autovalores generalizados do sistema descritor MNA: QZ denso em circuitos pequenos,
+# Arnoldi com deslocamento-inversão perto de uma faixa de frequência em circuitos grandes
+
+import numpy as np
+import scipy.linalg as la
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+from circuit_solver import BRANCH_TYPES, GMIN, Netlist, assemble_mna, expand_lines
+from model_reduction import input_matrix, output_matrix
+
+# Acima deste número de incógnitas só os modos pedidos (count) são calculados por Arnoldi
+DENSE_LIMIT = 400
+DEFAULT_MODE_COUNT = 10
+# Autovalores com |β| abaixo disso (relativo a ‖C‖) são infinitos (restrições algébricas do MNA)
+INFINITE_TOLERANCE = 1e-10
+
+@dataclass
+class Mode:
+    """Modo natural e^{st} associado a um polo s (um por par conjugado)"""
+    pole: complex
+
+    @property
+    def natural_frequency(self) -> float:
+        """fₙ = |s|/2π [Hz]"""
+        return abs(self.pole) / (2 * np.pi)
+
+    @property
+    def damped_frequency(self) -> float:
+        """f_d = |Im s|/2π [Hz]"""
+        return abs(self.pole.imag) / (2 * np.pi)
+
+    @property
+    def damping(self) -> float:
+        """ζ = −Re s/|s| (1 para polos reais estáveis, negativo para modos instáveis)"""
+        return -self.pole.real / abs(self.pole) if self.pole != 0 else 1.0
+
+    @property
+    def time_constant(self) -> float:
+        """τ = −1/Re s [s] (infinito para modos sem amortecimento)"""
+        return -1.0 / self.pole.real if self.pole.real != 0 else np.inf
+
+def _dense_eigenvalues(A: sp.spmatrix, B: sp.spmatrix) -> np.ndarray:
+    """Todos os s finitos com (A + sB)v = 0 pelo QZ (pares homogêneos α/β)"""
+    B = B.toarray()
+    alpha, beta = la.eig(A.toarray(), -B, right=False, homogeneous_eigvals=True)
+    finite = np.abs(beta) > INFINITE_TOLERANCE * max(np.linalg.norm(B), 1e-300)
+    return alpha[finite] / beta[finite]
+
+def _shift_invert_eigenvalues(A: sp.spmatrix, B: sp.spmatrix, count: int, sigma: complex) -> np.ndarray:
+    """Os `count` s finitos mais próximos de σ: μ autovalores de (A + σB)⁻¹B e s = σ − 1/μ.
+
+    A forma padrão do operador evita exigir B semidefinida (no MNA a matriz C
+    tem −L nas linhas dos indutores); μ = 0 corresponde aos autovalores infinitos.
+    """
+    matrix = (A + sigma * B).tocsc()
+    try:
+        lu = spla.splu(matrix)
+    except RuntimeError:
+        # σ coincide com um polo (ex.: laço de indutores em s = 0): desloca levemente
+        sigma = sigma - 1e-3 * (1.0 + abs(sigma))
+        lu = spla.splu((A + sigma * B).tocsc())
+    B = B.tocsr()
+    operator = spla.LinearOperator(A.shape, matvec=lambda x: lu.solve(B @ x.astype(complex)), dtype=complex)
+    # Subespaço maior que o padrão (2k + 1) acelera espectros agrupados (escadas de seções iguais)
+    count = min(count, A.shape[0] - 2)
+    mu = spla.eigs(operator, k=count, which='LM', ncv=min(A.shape[0] - 1, max(2 * count + 1, 30)),
+                   return_eigenvectors=False)
+    mu = mu[np.abs(mu) > INFINITE_TOLERANCE * np.abs(mu).max()]
+    return sigma - 1.0 / mu
+
+def _eigenvalues(A: sp.spmatrix, B: sp.spmatrix, count: Optional[int], frequency: Optional[float],
+                 dense_limit: int) -> np.ndarray:
+    sigma = 2j * np.pi * (frequency or 0.0)
+    if A.shape[0] <= dense_limit:
+        values = _dense_eigenvalues(A, B)
+        if count is not None:
+            values = values[np.argsort(np.abs(values - sigma), kind='stable')[:count]]
+    else:
+        values = _shift_invert_eigenvalues(A, B, count or DEFAULT_MODE_COUNT, sigma)
+    return values[np.argsort(np.abs(values), kind='stable')]
+
+def poles(netlist: Netlist, count: Optional[int] = None, frequency: Optional[float] = None,
+          dense_limit: int = DENSE_LIMIT, gmin: float = GMIN) -> np.ndarray:
+    """Polos do circuito [rad/s]: s com (G + sC)v = 0, ordenados por |s|.
+
+    Até dense_limit incógnitas usa o QZ denso (todos os polos, ou os `count`
+    mais próximos de j2π·frequency); acima disso calcula só os `count`
+    polos mais próximos de j2π·frequency por deslocamento-inversão. Linhas de
+    transmissão são discretizadas em escadas concentradas.
+    """
+    system = assemble_mna(expand_lines(netlist), gmin)
+    return _eigenvalues(system.G, system.C, count, frequency, dense_limit)
+
+def zeros(netlist: Netlist, source: str, output: Union[int, str], count: Optional[int] = None,
+          frequency: Optional[float] = None, dense_limit: int = DENSE_LIMIT, gmin: float = GMIN) -> np.ndarray:
+    """Zeros de transmissão da fonte `source` para a saída (nó ou corrente de ramo de um elemento).
+
+    São os s em que o sistema aumentado [[G + sC, −b], [cᵀ, 0]] é singular,
+    isto é, autovalores generalizados do mesmo tipo dos polos.
+    """
+    netlist = expand_lines(netlist)
+    system = assemble_mna(netlist, gmin)
+    b = input_matrix(netlist, system, [source])
+    if isinstance(output, str):
+        element = netlist.element(output)
+        if element.type not in BRANCH_TYPES:
+            raise ValueError(f"Corrente de {element.label} não é uma incógnita do MNA (use um nó)")
+        c = np.zeros((system.size, 1))
+        c[system.branch_index[element.id]] = 1.0
+    else:
+        c = output_matrix(system, [output])
+    A = sp.bmat([[system.G, sp.csr_matrix(-b)], [sp.csr_matrix(c.T), None]])
+    B = sp.bmat([[system.C, None], [None, sp.csr_matrix((1, 1))]])
+    return _eigenvalues(A, B, count, frequency, dense_limit)
+
+def natural_modes(values: np.ndarray, tolerance: float = 1e-8) -> List[Mode]:
+    """Modos (um por par conjugado, Im s ≥ 0) ordenados por frequência natural"""
+    values = np.asarray(values, dtype=complex)
+    scale = tolerance * np.maximum(np.abs(values), 1e-300)
+    upper = values[values.imag >= -scale]
+    lower = values[values.imag < -scale]
+    # Conjugados que o deslocamento complexo não trouxe junto
+    missing = [s.conjugate() for s in lower
+               if not len(upper) or np.min(np.abs(upper - s.conjugate())) > tolerance * abs(s)]
+    values = np.concatenate((upper, missing))
+    values = np.where(np.abs(values.imag) <= tolerance * np.abs(values), values.real, values)
+    return [Mode(complex(s)) for s in values[np.argsort(np.abs(values), kind='stable')]]
@@ -0,0 +1,144 @@
+# Módulo de análise de tolerâncias por Monte Carlo
+# Sorteia N conjuntos de valores e avalia todos de uma vez (formas fechadas ou solve em lote)
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from circuit_editor import ComponentType
+from circuit_solver import GMIN, Netlist, assemble_mna, element_vector, stamp_coefficient
+
+DISTRIBUTIONS = ("normal", "uniform")
+TOPOLOGIES = ("series", "parallel")
+DEFAULT_CHUNK = 100_000
+DEFAULT_PERCENTILES = (0.5, 2.5, 50, 97.5, 99.5)
+
+def sample_values(nominal: float, tolerance: float, n: int, rng: np.random.Generator,
+                  distribution: str = "normal") -> np.ndarray:
+    """N valores em torno do nominal: uniforme em ±tol ou normal com ±tol = 3σ (truncada em ±tol)"""
+    if distribution == "uniform":
+        deviation = rng.uniform(-tolerance, tolerance, n)
+    elif distribution == "normal":
+        deviation = np.clip(rng.normal(0.0, tolerance / 3, n), -tolerance, tolerance)
+    else:
+        raise ValueError(f"Distribuição inválida: {distribution}")
+    return nominal * (1 + deviation)
+
+def rlc_quantities(topology: str, r, l, c, frequency: float) -> Dict[str, np.ndarray]:
+    """f₀, ζ, |Z| e FP do RLC série ou paralelo em forma fechada (broadcast)"""
+    omega = 2 * np.pi * frequency
+    f0 = 1 / (2 * np.pi * np.sqrt(l * c))
+    if topology == "series":
+        zeta = r / 2 * np.sqrt(c / l)
+        z = r + 1j * (omega * l - 1 / (omega * c))
+    elif topology == "parallel":
+        zeta = 1 / (2 * r) * np.sqrt(l / c)
+        z = 1 / (1 / r + 1j * (omega * c - 1 / (omega * l)))
+    else:
+        raise ValueError(f"Topologia inválida: {topology}")
+    return {'f0': f0, 'zeta': zeta, 'z_mag': np.abs(z), 'pf': np.cos(np.angle(z))}
+
+def _rlc_chunk(task) -> Dict[str, np.ndarray]:
+    topology, nominal, tolerances, frequency, n, seed, distribution = task
+    rng = np.random.default_rng(seed)
+    r, l, c = (sample_values(nominal[k], tolerances[k], n, rng, distribution) for k in ("r", "l", "c"))
+    return rlc_quantities(topology, r, l, c, frequency)
+
+def _netlist_chunk(task) -> Dict[str, np.ndarray]:
+    base, stamps, b, varied, frequency, n, seed, distribution, observe = task
+    rng = np.random.default_rng(seed)
+    # A(s) = A_nominal + Σₑ Δcoefₑ(s)·uₑuₑᵀ, montado em lote (n × tamanho × tamanho)
+    deltas = np.empty((n, len(varied)), dtype=complex)
+    for k, (element_type, nominal, tolerance) in enumerate(varied):
+        values = sample_values(nominal, tolerance, n, rng, distribution)
+        deltas[:, k] = (stamp_coefficient(element_type, values, frequency) -
+                        stamp_coefficient(element_type, nominal, frequency))
+    matrices = base + np.einsum('ie,se,je->sij', stamps, deltas, stamps)
+    x = np.linalg.solve(matrices, np.broadcast_to(b, (n, len(b)))[..., None])[..., 0]
+    return {name: x[:, index] for name, index in observe.items()}
+
+def _run_chunks(worker, tasks, workers: Optional[int]) -> Dict[str, np.ndarray]:
+    if workers and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(worker, tasks))
+    else:
+        parts = [worker(task) for task in tasks]
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+def _chunk_sizes(n: int, chunk: int) -> Iterable[int]:
+    return [min(chunk, n - start) for start in range(0, n, chunk)]
+
+def rlc_monte_carlo(topology: str, r: float, l: float, c: float, tolerances: Dict[str, float],
+                    frequency: float, n: int = 100_000, distribution: str = "normal",
+                    seed: Optional[int] = None, chunk: int = DEFAULT_CHUNK,
+                    workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Amostras de f₀, ζ, |Z| e FP do RLC série/paralelo com tolerâncias relativas {'r', 'l', 'c'}.
+
+    As amostras são geradas e avaliadas em blocos de `chunk`, cada um com a
+    sua semente derivada de `seed` (resultado reprodutível com qualquer
+    número de processos).
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Topologia inválida: {topology}")
+    nominal = {'r': r, 'l': l, 'c': c}
+    tolerances = {k: tolerances.get(k, 0.0) for k in nominal}
+    sizes = _chunk_sizes(n, chunk)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(topology, nominal, tolerances, frequency, size, s, distribution) for size, s in zip(sizes, seeds)]
+    return _run_chunks(_rlc_chunk, tasks, workers)
+
+def netlist_monte_carlo(netlist: Netlist, tolerances: Dict[str, float], frequency: float = 0.0,
+                        observe_nodes: Sequence[int] = (), n: int = 10_000,
+                        distribution: str = "normal", seed: Optional[int] = None,
+                        chunk: int = 20_000, workers: Optional[int] = None,
+                        gmin: float = GMIN) -> Dict[str, np.ndarray]:
+    """Amostras das tensões nodais (complexas) de uma netlist com tolerâncias por elemento.
+
+    O sistema MNA nominal é montado uma vez; cada amostra soma as variações
+    de posto um dos elementos com tolerância e todas as amostras do bloco
+    são resolvidas por um único np.linalg.solve sobre matrizes empilhadas
+    (adequado a circuitos pequenos; o custo é O(N·n³)).
+    """
+    system = assemble_mna(netlist, gmin)
+    base = system.matrix(frequency).toarray().astype(complex)
+    varied = []
+    stamps = []
+    for element_id, tolerance in tolerances.items():
+        element = netlist.element(element_id)
+        if element.type in (ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE):
+            raise ValueError(f"Tolerância em fontes não é suportada: {element.label}")
+        varied.append((element.type, element.value, tolerance))
+        stamps.append(element_vector(element, system))
+    stamps = np.array(stamps).reshape(len(varied), system.size).T
+    observe = {f"V{node}": node - 1 for node in observe_nodes if node > 0}
+    if not observe:
+        raise ValueError("Informe ao menos um nó a observar")
+
+    sizes = _chunk_sizes(n, chunk)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(base, stamps, system.b.astype(complex), varied, frequency, size, s, distribution, observe)
+             for size, s in zip(sizes, seeds)]
+    return _run_chunks(_netlist_chunk, tasks, workers)
+
+def summarize(samples: Dict[str, np.ndarray], percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+              limits: Optional[Dict[str, Tuple[float, float]]] = None) -> Dict[str, Dict[str, float]]:
+    """Média, desvio, percentis e rendimento (fração dentro de `limits`) por grandeza.
+
+    Amostras complexas são resumidas pelo módulo.
+    """
+    limits = limits or {}
+    summary = {}
+    for name, values in samples.items():
+        values = np.abs(values) if np.iscomplexobj(values) else values
+        row = {'mean': float(np.mean(values)), 'std': float(np.std(values))}
+        row.update({f"p{p:g}": float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))})
+        if name in limits:
+            low, high = limits[name]
+            row['yield'] = float(np.mean((values >= low) & (values <= high)))
+        summary[name] = row
+    return summary
+
+def histograms(samples: Dict[str, np.ndarray], bins: int = 50) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Histogramas (contagens, bordas) por grandeza; complexas pelo módulo"""
+    return {name: np.histogram(np.abs(values) if np.iscomplexobj(values) else values, bins=bins)
+            for name, values in samples.items()}
@@ -0,0 +1,366 @@
+# Módulo de análises derivadas da solução nodal (MNA) de netlists
+# Reaproveita a fatoração LU do CircuitSolver para sensibilidades e outras análises de múltiplos lados direitos
+
+import numpy as np
+import scipy.sparse as sp
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple, Union
+
+from circuit_editor import ComponentType
+from circuit_solver import BRANCH_TYPES, CircuitSolver, MNASystem, Netlist, NetlistElement
+
+OUTPUTS = {
+    "node_voltage": "Tensão nodal",
+    "element_voltage": "Tensão no elemento",
+    "element_current": "Corrente no elemento",
+    "power": "Potência no elemento",
+}
+
+# Elementos cujo valor é parâmetro das sensibilidades (a chave tem resistência fixa)
+PARAMETER_TYPES = (ComponentType.RESISTOR, ComponentType.CAPACITOR, ComponentType.INDUCTOR,
+                   ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE)
+
+@dataclass
+class Sensitivity:
+    """Derivada da saída em relação ao valor de um elemento.
+
+    `relative` = p·∂y/∂p é a variação da saída para 100 % de variação do
+    valor (mesma unidade da saída), o que permite ordenar elementos de
+    naturezas diferentes.
+    """
+    element_id: str
+    label: str
+    value: float
+    derivative: complex
+    relative: complex
+
+def _padded_index(element: NetlistElement, system: MNASystem) -> Tuple[int, int]:
+    """Índices (i, j) do vetor u = e_i − e_j da estampa em um vetor com o terra na posição 0"""
+    if element.type in BRANCH_TYPES:
+        return system.branch_index[element.id] + 1, 0
+    return element.node1, element.node2
+
+def _pad(vectors: np.ndarray) -> np.ndarray:
+    return np.concatenate((np.zeros((1,) + vectors.shape[1:], dtype=vectors.dtype), vectors))
+
+def _output_functional(netlist: Netlist, system: MNASystem, x: np.ndarray, frequency: float,
+                       kind: str, target: Union[int, str]) -> Tuple[np.ndarray, Dict[str, complex]]:
+    """Saída linear y = cᵀx + (termo explícito no valor de um elemento).
+
+    Retorna c e as derivadas parciais explícitas ∂y/∂p (ex.: I = V/R depende
+    de R também diretamente, não só através de x).
+    """
+    dtype = complex if frequency != 0 else float
+    c = np.zeros(system.size + 1, dtype=dtype)
+    if kind == "node_voltage":
+        c[int(target)] = 1.0
+        return c[1:], {}
+    element = netlist.element(target)
+    c[element.node1] += 1.0
+    c[element.node2] -= 1.0
+    if kind == "element_voltage":
+        return c[1:], {}
+    if kind != "element_current":
+        raise ValueError(f"Saída desconhecida: {kind}")
+    if element.type in BRANCH_TYPES:
+        c[:] = 0.0
+        c[system.branch_index[element.id] + 1] = 1.0
+        return c[1:], {}
+    voltage = c[1:] @ x
+    if element.type in (ComponentType.RESISTOR, ComponentType.SWITCH):
+        return c[1:] / element.value, {element.id: -voltage / element.value**2}
+    if element.type == ComponentType.CAPACITOR:
+        # Em DC o capacitor é circuito aberto (corrente nula)
+        jw = 2j * np.pi * frequency if frequency != 0 else 0.0
+        return jw * element.value * c[1:], {element.id: jw * voltage}
+    # Fonte de corrente: a corrente é o próprio valor
+    return np.zeros(system.size, dtype=dtype), {element.id: 1.0}
+
+def _stamp_derivative(element: NetlistElement, frequency: float) -> complex:
+    """Derivada do coeficiente da estampa em relação ao valor do elemento"""
+    if element.type == ComponentType.RESISTOR:
+        return -1.0 / element.value**2
+    if element.type == ComponentType.CAPACITOR:
+        return 2j * np.pi * frequency
+    if element.type == ComponentType.INDUCTOR:
+        return -2j * np.pi * frequency
+    return 0.0
+
+def _adjoint_derivatives(solver: CircuitSolver, x: np.ndarray, frequency: float,
+                         functionals: np.ndarray, elements: List[NetlistElement]) -> np.ndarray:
+    """∂y/∂p de todas as saídas (colunas de `functionals`) para todos os elementos.
+
+    Uma única substituição transposta Aᵀλ = c (com a LU já fatorada) dá
+    ∂y/∂p = λᵀ(∂b/∂p − ∂A/∂p·x). Para estampas coef·u·uᵀ o termo vale
+    −coef'·(λᵀu)(uᵀx); fontes de tensão somam λ na linha do ramo e fontes de
+    corrente −(λ₁ − λ₂).
+    """
+    system = solver.system
+    adjoint = solver.factorize(frequency).solve(functionals, trans='T')
+    index = np.array([_padded_index(element, system) for element in elements], dtype=int).reshape(-1, 2)
+    x_padded, adjoint_padded = _pad(x), _pad(adjoint)
+    u_x = x_padded[index[:, 0]] - x_padded[index[:, 1]]
+    u_adjoint = adjoint_padded[index[:, 0]] - adjoint_padded[index[:, 1]]
+
+    coefficient = np.array([_stamp_derivative(element, frequency) for element in elements], dtype=complex)
+    source = np.array([1.0 if element.type == ComponentType.VOLTAGE_SOURCE else
+                       -1.0 if element.type == ComponentType.CURRENT_SOURCE else 0.0
+                       for element in elements])
+    return (source - coefficient * u_x)[:, None] * u_adjoint
+
+def output_value(solver: CircuitSolver, kind: str, target: Union[int, str], frequency: float = 0.0) -> complex:
+    """Valor da saída escolhida na solução atual"""
+    solution = solver.solve(frequency)
+    if kind == "node_voltage":
+        return solution.node_voltage(int(target))
+    if kind == "element_voltage":
+        return solution.element_voltage(target)
+    if kind == "element_current":
+        return solution.element_current(target)
+    if kind == "power":
+        return solution.power(target)
+    raise ValueError(f"Saída desconhecida: {kind}")
+
+def adjoint_sensitivities(solver: CircuitSolver, kind: str, target: Union[int, str],
+                          frequency: float = 0.0) -> List[Sensitivity]:
+    """Sensibilidades da saída em relação a todos os valores de R, L, C e fontes.
+
+    `kind` é uma das chaves de OUTPUTS e `target` o nó (inteiro) ou o id do
+    elemento. Custa uma substituição transposta adicional com a fatoração do
+    solver (duas colunas para a potência S = V·I*, que usa dS = dV·I* + V·dI*),
+    em vez de uma nova solução por componente. Retorna a lista ordenada por
+    |p·∂y/∂p| decrescente.
+    """
+    if kind not in OUTPUTS:
+        raise ValueError(f"Saída desconhecida: {kind}")
+    netlist, system = solver.netlist, solver.system
+    x = solver.solve_vector(frequency)
+    elements = [element for element in netlist.elements if element.type in PARAMETER_TYPES]
+    position = {element.id: k for k, element in enumerate(elements)}
+
+    linear_kinds = ("element_voltage", "element_current") if kind == "power" else (kind,)
+    columns = [_output_functional(netlist, system, x, frequency, linear, target) for linear in linear_kinds]
+    derivatives = _adjoint_derivatives(solver, x, frequency, np.column_stack([c for c, _ in columns]), elements)
+    for k, (_, explicit) in enumerate(columns):
+        for element_id, partial in explicit.items():
+            if element_id in position:
+                derivatives[position[element_id], k] += partial
+
+    if kind == "power":
+        solution = solver.solve(frequency)
+        voltage, current = solution.element_voltage(target), solution.element_current(target)
+        derivative = derivatives[:, 0] * np.conj(current) + voltage * np.conj(derivatives[:, 1])
+    else:
+        derivative = derivatives[:, 0]
+    if frequency == 0:
+        derivative = derivative.real
+
+    sensitivities = [
+        Sensitivity(element.id, element.label, element.value, derivative[k], element.value * derivative[k])
+        for k, element in enumerate(elements)
+    ]
+    return sorted(sensitivities, key=lambda s: -abs(s.relative))
+
+@dataclass
+class PortEquivalent:
+    """Equivalente de Thévenin/Norton visto entre node1 (+) e node2 (−).
+
+    Fasores de pico (ou valores DC); a impedância é calculada com as fontes
+    independentes anuladas.
+    """
+    node1: int
+    node2: int
+    voltage: complex
+    impedance: complex
+
+    @property
+    def current(self) -> complex:
+        """Corrente de Norton (curto-circuito de node1 para node2); infinita em porta de fonte ideal"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.divide(self.voltage, self.impedance)
+
+    @property
+    def admittance(self) -> complex:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.divide(1.0, self.impedance)
+
+    @property
+    def matched_load(self) -> complex:
+        """Carga de máxima transferência de potência (conjugado de Z_th)"""
+        return np.conj(self.impedance)
+
+    @property
+    def max_power(self) -> float:
+        """Potência média entregue à carga casada: |V_th|²/(8·Re Z_th) para fasores de pico"""
+        resistance = np.real(self.impedance)
+        return abs(self.voltage) ** 2 / (8 * resistance) if resistance > 0 else np.inf
+
+def _port_incidence(system: MNASystem, ports: Sequence[Tuple[int, int]], dtype) -> np.ndarray:
+    """Matriz size × portas com colunas e₁ − e₂ (injeção de 1 A em node1, retirada em node2)"""
+    incidence = np.zeros((system.size + 1, len(ports)), dtype=dtype)
+    for k, (node1, node2) in enumerate(ports):
+        if not (0 <= node1 <= system.node_count and 0 <= node2 <= system.node_count) or node1 == node2:
+            raise ValueError(f"Porta inválida: ({node1}, {node2})")
+        incidence[node1, k] += 1.0
+        incidence[node2, k] -= 1.0
+    return incidence[1:]
+
+def port_impedance_matrix(solver: CircuitSolver, ports: Sequence[Tuple[int, int]],
+                          frequency: float = 0.0) -> np.ndarray:
+    """Matriz de impedâncias Z (portas × portas) do multiporta visto nos pares de nós.
+
+    Z = Uᵀ·A⁻¹·U com uma única substituição de múltiplos lados direitos; a
+    diagonal são as impedâncias de Thévenin e os termos fora dela, as
+    transimpedâncias entre portas (modelo reduzido de um sub-bloco).
+    """
+    incidence = _port_incidence(solver.system, ports, complex if frequency != 0 else float)
+    return incidence.T @ solver.factorize(frequency).solve(incidence)
+
+def port_equivalents(solver: CircuitSolver, ports: Sequence[Tuple[int, int]],
+                     frequency: float = 0.0) -> List[PortEquivalent]:
+    """Equivalentes de Thévenin/Norton em todas as portas (pares de nós) com uma fatoração.
+
+    As fontes independentes só aparecem em b, então a mesma LU dá a tensão
+    de circuito aberto (solução normal) e, com todas as colunas de injeção
+    resolvidas juntas, a impedância vista em cada porta.
+    """
+    incidence = _port_incidence(solver.system, ports, complex if frequency != 0 else float)
+    lu = solver.factorize(frequency)
+    open_circuit = incidence.T @ solver.solve_vector(frequency)
+    impedance = np.einsum('ij,ij->j', incidence, lu.solve(incidence))
+    return [PortEquivalent(node1, node2, open_circuit[k], impedance[k])
+            for k, (node1, node2) in enumerate(ports)]
+
+@dataclass
+class Superposition:
+    """Contribuição de cada fonte independente (linhas) em cada grandeza (colunas).
+
+    As grandezas são as tensões nodais seguidas das correntes de todos os
+    elementos (terminal 1 → terminal 2); a soma das linhas é a solução completa.
+    """
+    sources: List[str]
+    source_labels: List[str]
+    quantities: List[str]
+    contributions: np.ndarray
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.contributions.sum(axis=0)
+
+def _current_map(netlist: Netlist, system: MNASystem, frequency: float) -> sp.csr_matrix:
+    """Matriz M (elementos × incógnitas) com I_elemento = M·x (fontes de corrente ficam nulas)"""
+    jw = 2j * np.pi * frequency if frequency != 0 else 0.0
+    rows, cols, vals = [], [], []
+    for row, element in enumerate(netlist.elements):
+        if element.type in BRANCH_TYPES:
+            rows.append(row)
+            cols.append(system.branch_index[element.id] + 1)
+            vals.append(1.0)
+            continue
+        if element.type in (ComponentType.RESISTOR, ComponentType.SWITCH):
+            admittance = 1.0 / element.value
+        elif element.type == ComponentType.CAPACITOR:
+            admittance = jw * element.value
+        else:
+            continue
+        rows.extend((row, row))
+        cols.extend((element.node1, element.node2))
+        vals.extend((admittance, -admittance))
+    # Coluna 0 é o terra (descartada)
+    current_map = sp.csr_matrix((vals, (rows, cols)), shape=(len(netlist.elements), system.size + 1))
+    return current_map[:, 1:]
+
+def superposition(solver: CircuitSolver, frequency: float = 0.0) -> Superposition:
+    """Matriz (fontes × grandezas) de contribuições por superposição.
+
+    Cada fonte independente vira uma coluna do lado direito (as demais
+    anuladas) e todas são resolvidas juntas com a fatoração do solver, de
+    modo que centenas de fontes custam uma fatoração e uma substituição
+    múltipla em vez de uma solução completa por fonte.
+    """
+    netlist, system = solver.netlist, solver.system
+    sources = [element for element in netlist.elements
+               if element.type in (ComponentType.VOLTAGE_SOURCE, ComponentType.CURRENT_SOURCE)]
+    dtype = complex if frequency != 0 else float
+    rhs = np.zeros((system.size + 1, len(sources)), dtype=dtype)
+    for k, source in enumerate(sources):
+        if source.type == ComponentType.VOLTAGE_SOURCE:
+            rhs[system.branch_index[source.id] + 1, k] = source.value
+        else:
+            rhs[source.node1, k] -= source.value
+            rhs[source.node2, k] += source.value
+    solutions = solver.factorize(frequency).solve(rhs[1:]) if sources else rhs[1:]
+
+    currents = (_current_map(netlist, system, frequency) @ solutions).T
+    position = {element.id: k for k, element in enumerate(netlist.elements)}
+    for k, source in enumerate(sources):
+        if source.type == ComponentType.CURRENT_SOURCE:
+            currents[k, position[source.id]] = source.value
+
+    names = [netlist.node_names.get(node, f"N{node}") for node in range(1, system.node_count + 1)]
+    return Superposition(
+        sources=[source.id for source in sources],
+        source_labels=[source.label for source in sources],
+        quantities=[f"V({name})" for name in names] + [f"I({element.label})" for element in netlist.elements],
+        contributions=np.hstack((solutions[:system.node_count].T, currents)),
+    )
+
+@dataclass
+class FaultStudy:
+    """Correntes de falta presumidas em cada nó (falta franca ou com impedância para o terra)"""
+    nodes: np.ndarray
+    node_names: List[str]
+    prefault_voltage: np.ndarray
+    impedance: np.ndarray
+    fault_impedance: complex
+
+    @property
+    def current(self) -> np.ndarray:
+        """I_f = V_pré / (Z_kk + Z_f); infinita em nós fixados por fonte ideal com falta franca"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.prefault_voltage / (self.impedance + self.fault_impedance)
+
+    def ranking(self) -> np.ndarray:
+        """Índices dos nós da maior para a menor corrente de falta"""
+        return np.argsort(-np.abs(self.current), kind='stable')
+
+def impedance_diagonal(solver: CircuitSolver, frequency: float = 0.0, nodes: Sequence[int] = None,
+                       block: int = 256) -> np.ndarray:
+    """Z_kk = e_kᵀ·A⁻¹·e_k dos nós pedidos (padrão: todos), sem formar a inversa densa.
+
+    As colunas unitárias são resolvidas em blocos de `block` com a LU
+    esparsa do solver e só a entrada diagonal de cada coluna é guardada: a
+    memória fica em O(n·block) e o custo em uma substituição por nó.
+    """
+    system = solver.system
+    nodes = np.arange(1, system.node_count + 1) if nodes is None else np.asarray(nodes, dtype=int)
+    if np.any((nodes < 1) | (nodes > system.node_count)):
+        raise ValueError("Nós de falta devem estar entre 1 e o número de nós")
+    lu = solver.factorize(frequency)
+    dtype = complex if frequency != 0 else float
+    diagonal = np.empty(len(nodes), dtype=dtype)
+    for start in range(0, len(nodes), block):
+        rows = nodes[start:start + block] - 1
+        columns = np.zeros((system.size, len(rows)), dtype=dtype)
+        columns[rows, np.arange(len(rows))] = 1.0
+        diagonal[start:start + len(rows)] = lu.solve(columns)[rows, np.arange(len(rows))]
+    return diagonal
+
+def fault_study(solver: CircuitSolver, frequency: float = 0.0, fault_impedance: complex = 0.0,
+                nodes: Sequence[int] = None, block: int = 256) -> FaultStudy:
+    """Estudo de curto-circuito nó a terra em todos os nós (ou nos informados).
+
+    Pelo teorema de Thévenin, a corrente de falta no nó k é a tensão
+    pré-falta dividida por Z_kk + Z_f, com Z_kk a diagonal da matriz de
+    impedâncias nodais (fontes anuladas), obtida por impedance_diagonal.
+    """
+    system = solver.system
+    nodes = np.arange(1, system.node_count + 1) if nodes is None else np.asarray(nodes, dtype=int)
+    prefault = solver.solve_vector(frequency)[nodes - 1]
+    return FaultStudy(
+        nodes=nodes,
+        node_names=[solver.netlist.node_names.get(int(node), f"N{node}") for node in nodes],
+        prefault_voltage=prefault,
+        impedance=impedance_diagonal(solver, frequency, nodes, block),
+        fault_impedance=fault_impedance,
+    )
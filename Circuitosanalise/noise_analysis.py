@@ -0,0 +1,109 @@
+# Módulo de análise de ruído térmico (4kTR) de netlists
+# Método adjunto: uma substituição transposta por frequência dá a transferência de todos os
+# resistores para a saída; os pontos de frequência são divididos entre processos
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+from circuit_editor import ComponentType
+from circuit_solver import GMIN, Netlist, assemble_mna
+
+BOLTZMANN = 1.380649e-23
+# Temperatura padrão [K] (a mesma de THERMAL_VOLTAGE nos modelos de dispositivos)
+DEFAULT_TEMPERATURE = 300.0
+
+def _noise_chunk(task) -> np.ndarray:
+    system, frequencies, output, incidence, sources = task
+    gains = np.empty((len(frequencies), incidence.shape[1]))
+    for k, frequency in enumerate(frequencies):
+        # Aᵀλ = c: a tensão de saída devida a uma corrente i entre os terminais do resistor é (uᵀλ)·i
+        matrix = system.matrix(frequency)
+        adjoint = spla.splu(matrix).solve(output.astype(matrix.dtype), trans='T')
+        gains[k] = np.abs(incidence.T @ adjoint) ** 2
+    return gains * sources
+
+@dataclass
+class NoiseResult:
+    """Densidades espectrais de ruído na saída [V²/Hz] por resistor em cada frequência"""
+    frequencies: np.ndarray
+    element_ids: List[str]
+    labels: List[str]
+    # (frequências × resistores)
+    contributions: np.ndarray
+
+    @property
+    def total_density(self) -> np.ndarray:
+        """S_v(f) total na saída [V²/Hz] (fontes de ruído descorrelacionadas somam em potência)"""
+        return self.contributions.sum(axis=1)
+
+    @property
+    def density(self) -> np.ndarray:
+        """Densidade espectral de tensão na saída [V/√Hz]"""
+        return np.sqrt(self.total_density)
+
+    def _integrate(self, values: np.ndarray) -> np.ndarray:
+        # Regra do trapézio na grade de frequências (que pode ser logarítmica)
+        df = np.diff(self.frequencies)
+        return np.tensordot(df, 0.5 * (values[1:] + values[:-1]), axes=(0, 0))
+
+    @property
+    def component_rms(self) -> np.ndarray:
+        """Ruído eficaz na saída devido a cada resistor na faixa varrida [V]"""
+        return np.sqrt(self._integrate(self.contributions))
+
+    @property
+    def rms(self) -> float:
+        """Ruído eficaz total integrado na faixa varrida [V]"""
+        return float(np.sqrt(self._integrate(self.total_density)))
+
+    def ranking(self) -> np.ndarray:
+        """Índices dos resistores do maior para o menor ruído integrado"""
+        return np.argsort(-self.component_rms, kind='stable')
+
+def noise_analysis(netlist: Netlist, output: int, frequencies: np.ndarray, reference: int = 0,
+                   temperature: float = DEFAULT_TEMPERATURE, workers: Optional[int] = None,
+                   gmin: float = GMIN) -> NoiseResult:
+    """Ruído térmico na tensão V(output) − V(reference) em cada frequência.
+
+    Cada resistor é um gerador de corrente de ruído 4kT/R [A²/Hz] em
+    paralelo, descorrelacionado dos demais. Por frequência, uma única
+    substituição transposta Aᵀλ = c dá a transimpedância uᵀλ de todos os
+    resistores para a saída, e a contribuição vale 4kT/R·|uᵀλ|². Fontes
+    independentes ficam zeradas (tensão em curto, corrente em aberto); com
+    workers > 1 os pontos de frequência são divididos entre processos.
+    """
+    if not 1 <= output <= netlist.node_count or not 0 <= reference <= netlist.node_count:
+        raise ValueError(f"Nó de saída inválido: {output}")
+    frequencies = np.asarray(frequencies, dtype=float)
+    system = assemble_mna(netlist, gmin)
+    resistors = [element for element in netlist.elements if element.type == ComponentType.RESISTOR]
+    if not resistors:
+        raise ValueError("Circuito sem resistores: não há ruído térmico")
+
+    c = np.zeros(system.size)
+    c[output - 1] = 1.0
+    if reference > 0:
+        c[reference - 1] = -1.0
+    rows, cols, values = [], [], []
+    for k, element in enumerate(resistors):
+        for node, sign in ((element.node1, 1.0), (element.node2, -1.0)):
+            if node > 0:
+                rows.append(node - 1)
+                cols.append(k)
+                values.append(sign)
+    incidence = sp.csr_matrix((values, (rows, cols)), shape=(system.size, len(resistors)))
+    sources = 4 * BOLTZMANN * temperature / np.array([element.value for element in resistors])
+
+    chunks = np.array_split(frequencies, max(1, min(workers or 1, len(frequencies))))
+    tasks = [(system, chunk, c, incidence, sources) for chunk in chunks]
+    if workers and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_noise_chunk, tasks))
+    else:
+        parts = [_noise_chunk(task) for task in tasks]
+    return NoiseResult(frequencies, [element.id for element in resistors],
+                       [element.label for element in resistors], np.vstack(parts))
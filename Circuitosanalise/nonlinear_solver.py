@@ -0,0 +1,401 @@
+# Módulo de solução não linear (Newton-Raphson) de netlists com diodos, transistores e indutores saturáveis
+# A parte linear do MNA é montada uma vez; a cada iteração só as estampas dos dispositivos são reavaliadas
+# e a fatoração do jacobiano é reaproveitada enquanto o Newton converge depressa
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from circuit_editor import ComponentType
+from circuit_solver import GMIN, CircuitSolution, MNASystem, Netlist, NetlistElement, assemble_mna, expand_lines
+from device_models import (DEVICE_TERMINALS, device_parameters, junction_voltages, limit_junction,
+                           saturable_flux, terminal_currents)
+from transient_solver import GrowableBuffer, SwitchEvent, TransientResult, source_function
+
+MAX_ITERATIONS = 50
+# A fatoração do jacobiano é mantida enquanto cada passo de Newton encolhe ao menos este fator
+REUSE_CONTRACTION = 0.25
+# Menor fração do passo de Newton aceita pelo amortecimento das junções (só evita passo nulo: o
+# limite das junções vale mesmo quando o modo comum de nós quase flutuantes pede saltos enormes)
+MIN_DAMPING = 1e-12
+# Passos da rampa de fontes quando o Newton não converge direto no ponto de operação
+SOURCE_STEPS = 10
+# Quantas vezes o passo de tempo é dividido por 2 antes de desistir
+MAX_STEP_HALVINGS = 8
+
+INTEGRATION_METHODS = ("trap", "euler")
+
+class DeviceGroup:
+    """Dispositivos de um mesmo tipo, avaliados juntos (vetorizados).
+
+    x pode ser um vetor de incógnitas ou uma matriz com uma linha por instante
+    (amostras de um período no balanço harmônico).
+    """
+
+    def __init__(self, element_type: ComponentType, elements: List[NetlistElement], node_count: int,
+                 size: int):
+        self.type = element_type
+        self.node_count = node_count
+        self.ids = [element.id for element in elements]
+        terminals = DEVICE_TERMINALS[element_type]
+        self.nodes = np.array([[element.node1, element.node2, element.node3][:terminals]
+                               for element in elements], dtype=int)
+        self.value = np.array([element.value for element in elements])
+        merged = [device_parameters(element_type, element.parameters) for element in elements]
+        self.parameters = {name: np.array([p[name] for p in merged], dtype=float) for name in merged[0]}
+        # Índices fixos das estampas: soma das correntes nos nós e (linha, coluna) do jacobiano fora do terra
+        self.size = size
+        self.residual_mask = self.nodes > 0
+        self.residual_rows = self.nodes[self.residual_mask] - 1
+        rows = np.repeat(self.nodes[:, :, None], terminals, axis=2)
+        cols = np.repeat(self.nodes[:, None, :], terminals, axis=1)
+        self.jacobian_mask = (rows > 0) & (cols > 0)
+        self.jacobian_rows = rows[self.jacobian_mask] - 1
+        self.jacobian_cols = cols[self.jacobian_mask] - 1
+
+    def voltages(self, x: np.ndarray) -> np.ndarray:
+        """Tensões dos terminais (... × dispositivos × terminais)"""
+        ground = np.zeros(x.shape[:-1] + (1,))
+        return np.concatenate((ground, x[..., :self.node_count]), axis=-1)[..., self.nodes]
+
+    def _flat(self, V: np.ndarray):
+        # Parâmetros repetidos por instante, na ordem das linhas de V achatada
+        reps = V.size // self.nodes.size
+        if reps == 1:
+            return V, self.value, self.parameters
+        return (V.reshape(-1, V.shape[-1]), np.tile(self.value, reps),
+                {name: np.tile(values, reps) for name, values in self.parameters.items()})
+
+    def evaluate(self, x: np.ndarray, gmin: float):
+        """Correntes nos nós (... × incógnitas) e estampas do jacobiano (... × entradas)"""
+        V = self.voltages(x)
+        I, J = terminal_currents(self.type, *self._flat(V), gmin)
+        I = I.reshape(V.shape)[..., self.residual_mask]
+        samples = I.size // max(len(self.residual_rows), 1)
+        rows = (self.size * np.arange(samples)[:, None] + self.residual_rows).ravel()
+        currents = np.bincount(rows, I.ravel(), minlength=samples * self.size)
+        values = J.reshape(V.shape + (V.shape[-1],))[..., self.jacobian_mask]
+        return currents.reshape(x.shape), values
+
+    def junctions(self, x: np.ndarray):
+        """Tensões de junção, correntes de saturação e nVt (achatadas) para limitar o passo"""
+        return junction_voltages(self.type, *self._flat(self.voltages(x)))
+
+def junction_damping(groups: List[DeviceGroup], x: np.ndarray, dx: np.ndarray) -> float:
+    """Fração do passo de Newton permitida pela limitação logarítmica das junções"""
+    damping = 1.0
+    for group in groups:
+        old, saturation, nvt = group.junctions(x)
+        if not old.size:
+            continue
+        new, _, _ = group.junctions(x + dx)
+        step = new - old
+        limited = limit_junction(new, old, saturation, nvt) - old
+        moving = np.abs(step) > 0
+        if moving.any():
+            damping = min(damping, float(np.min(limited[moving] / step[moving])))
+    return float(np.clip(damping, MIN_DAMPING, 1.0))
+
+def device_current(element: NetlistElement, node_voltages: np.ndarray, gmin: float = GMIN) -> np.ndarray:
+    """Corrente do terminal 1 (anodo, coletor ou dreno) do dispositivo para cada linha de tensões nodais"""
+    terminals = DEVICE_TERMINALS[element.type]
+    nodes = [element.node1, element.node2, element.node3][:terminals]
+    V = np.atleast_2d(node_voltages)[:, nodes]
+    I, _ = terminal_currents(element.type, V, element.value,
+                             device_parameters(element.type, element.parameters), gmin)
+    return I[:, 0]
+
+class NonlinearSolution(CircuitSolution):
+    """Ponto de operação DC de um circuito não linear, com as estatísticas do Newton"""
+
+    def __init__(self, netlist: Netlist, system: MNASystem, x: np.ndarray, iterations: int,
+                 factorizations: int, gmin: float = GMIN):
+        super().__init__(netlist, system, x)
+        self.iterations = iterations
+        self.factorizations = factorizations
+        self.gmin = gmin
+
+    def element_current(self, element_id: str) -> complex:
+        element = self.netlist.element(element_id)
+        if element.type in DEVICE_TERMINALS:
+            return float(device_current(element, self.node_voltages, self.gmin)[0])
+        return super().element_current(element_id)
+
+@dataclass
+class NonlinearResult(TransientResult):
+    """Formas de onda de uma simulação transitória não linear"""
+    newton_iterations: int = 0
+    gmin: float = GMIN
+
+    @property
+    def factorizations_per_step(self) -> float:
+        return self.factorizations / max(self.accepted_steps, 1)
+
+    @property
+    def iterations_per_step(self) -> float:
+        return self.newton_iterations / max(self.accepted_steps, 1)
+
+    def element_current(self, element_id: str) -> np.ndarray:
+        element = self.netlist.element(element_id)
+        if element.type in DEVICE_TERMINALS:
+            voltages = np.hstack((np.zeros((len(self.time), 1)), self.states[:, :self.system.node_count]))
+            return device_current(element, voltages, self.gmin)
+        return super().element_current(element_id)
+
+class NonlinearSimulator:
+    """Solver de Newton-Raphson para f(x) = G·x + i(x) + d[C·x + q(x)]/dt − b(t) = 0.
+
+    G, C e b são a parte linear do MNA, montada uma única vez (o indutor
+    saturável entra com L₀); i(x) são as correntes dos diodos e transistores
+    e q(x) a parte não linear do fluxo dos indutores saturáveis. Em cada
+    passo o jacobiano é J = G + c·C + ∂i/∂x + c·∂q/∂x, com c = α/h, e só os
+    termos dos dispositivos são recalculados, com índices de estampa fixos.
+
+    O passo de Newton é amortecido pela limitação logarítmica das tensões de
+    junção (pnjlim). A fatoração de J é reaproveitada entre iterações e entre
+    passos de tempo (Newton modificado) e só é refeita quando a contração de
+    ‖Δx‖ fica pior que REUSE_CONTRACTION, quando o passo foi amortecido ou
+    quando o passo de tempo muda.
+    """
+
+    def __init__(self, netlist: Netlist, method: str = "trap", reltol: float = 1e-6,
+                 abstol: float = 1e-9, gmin: float = GMIN, max_iterations: int = MAX_ITERATIONS):
+        if method not in INTEGRATION_METHODS:
+            raise ValueError(f"Método de integração inválido: {method}")
+        self.netlist = expand_lines(netlist)
+        self.method = method
+        self.reltol = reltol
+        self.abstol = abstol
+        self.gmin = gmin
+        self.max_iterations = max_iterations
+        self.system = assemble_mna(self.netlist, gmin)
+        self.switch_ids = [e.id for e in self.netlist.elements if e.type == ComponentType.SWITCH]
+        self._mask = (1 << len(self.switch_ids)) - 1
+        self.groups = []
+        for element_type in DEVICE_TERMINALS:
+            elements = [e for e in self.netlist.elements if e.type == element_type]
+            if elements:
+                self.groups.append(DeviceGroup(element_type, elements, self.system.node_count,
+                                               self.system.size))
+        saturable = [e for e in self.netlist.elements if e.type == ComponentType.SATURABLE_INDUCTOR]
+        self._branches = np.array([self.system.branch_index[e.id] for e in saturable], dtype=int)
+        self._inductance = np.array([e.value for e in saturable])
+        merged = [device_parameters(e.type, e.parameters) for e in saturable]
+        self._ratio = np.array([p["ratio"] for p in merged])
+        self._isat = np.array([p["isat"] for p in merged])
+        self._device_rows = np.concatenate([g.jacobian_rows for g in self.groups] + [self._branches])
+        self._device_cols = np.concatenate([g.jacobian_cols for g in self.groups] + [self._branches])
+        self._linear: Dict[float, Tuple[sp.csr_matrix, sp.coo_matrix]] = {}
+        self._lu: Optional[spla.SuperLU] = None
+        self._lu_coefficient = None
+        self.factorization_count = 0
+        self.iteration_count = 0
+
+    def _linear_matrix(self, coefficient: float) -> Tuple[sp.csr_matrix, sp.coo_matrix]:
+        """G + c·C (CSR para o resíduo, COO para somar as estampas na fatoração), em cache por c"""
+        if coefficient not in self._linear:
+            matrix = self.system.G + coefficient * self.system.C if coefficient else self.system.G
+            self._linear[coefficient] = (matrix.tocsr(), matrix.tocoo())
+        return self._linear[coefficient]
+
+    def _devices(self, x: np.ndarray):
+        """Correntes i(x) e fluxos q(x) dos dispositivos e os valores das suas estampas no jacobiano"""
+        currents = np.zeros(len(x))
+        fluxes = np.zeros(len(x))
+        values = []
+        for group in self.groups:
+            group_currents, group_values = group.evaluate(x, self.gmin)
+            currents += group_currents
+            values.append(group_values)
+        flux, inductance = saturable_flux(x[self._branches], self._inductance, self._ratio, self._isat)
+        # Linha de ramo: V₁ − V₂ − dφ/dt = 0, com −L₀·di/dt já em C
+        fluxes[self._branches] = -(flux - self._inductance * x[self._branches])
+        return currents, fluxes, values, -(inductance - self._inductance)
+
+    def _damping(self, x: np.ndarray, dx: np.ndarray) -> float:
+        return junction_damping(self.groups, x, dx)
+
+    def _factorize(self, coefficient: float, device_values: List[np.ndarray], flux_values: np.ndarray):
+        _, linear = self._linear_matrix(coefficient)
+        values = np.concatenate(device_values + [coefficient * flux_values])
+        matrix = sp.csc_matrix((np.concatenate((linear.data, values)),
+                                (np.concatenate((linear.row, self._device_rows)),
+                                 np.concatenate((linear.col, self._device_cols)))),
+                               shape=linear.shape)
+        self.factorization_count += 1
+        self._lu, self._lu_coefficient = spla.splu(matrix), coefficient
+
+    def _newton(self, x: np.ndarray, coefficient: float, rhs: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """Resolve (G + c·C)·x + i(x) + c·q(x) = rhs a partir de x; retorna (x, convergiu)"""
+        linear, _ = self._linear_matrix(coefficient)
+        refactor = self._lu is None or self._lu_coefficient != coefficient
+        previous = None
+        for _ in range(self.max_iterations):
+            currents, fluxes, device_values, flux_values = self._devices(x)
+            if refactor:
+                self._factorize(coefficient, device_values, flux_values)
+            residual = linear @ x + currents + coefficient * fluxes - rhs
+            dx = -self._lu.solve(residual)
+            damping = self._damping(x, dx)
+            x = x + damping * dx
+            self.iteration_count += 1
+            norm = float(np.max(np.abs(damping * dx) / (self.reltol * np.abs(x) + self.abstol)))
+            if damping == 1.0 and norm <= 1.0:
+                return x, True
+            # Jacobiano velho com convergência lenta (ou passo amortecido): refatora na próxima iteração
+            refactor = damping < 1.0 or (previous is not None and norm > REUSE_CONTRACTION * previous)
+            previous = norm
+        return x, False
+
+    def _set_switches(self, mask: int):
+        """Remonta a parte linear com a topologia da máscara (bit k = 1 se a k-ésima chave está fechada)"""
+        if mask == self._mask:
+            return
+        self._mask = mask
+        open_switches = [sid for bit, sid in enumerate(self.switch_ids) if not (mask >> bit) & 1]
+        self.system = assemble_mna(self.netlist, self.gmin, open_switches)
+        self._linear.clear()
+        self._lu = None
+
+    def _apply_event(self, event: SwitchEvent):
+        bit = 1 << self.switch_ids.index(event.switch_id)
+        self._set_switches(self._mask | bit if event.closed else self._mask & ~bit)
+
+    def _operating_vector(self, b: np.ndarray, x0: np.ndarray = None) -> np.ndarray:
+        x = np.zeros(self.system.size) if x0 is None else np.asarray(x0, dtype=float)
+        x_new, converged = self._newton(x, 0.0, b)
+        if converged:
+            return x_new
+        # Rampa das fontes: cada ponto parte da solução do anterior
+        for scale in np.arange(1, SOURCE_STEPS + 1) / SOURCE_STEPS:
+            x, converged = self._newton(x, 0.0, scale * b)
+            if not converged:
+                raise RuntimeError("Newton-Raphson não convergiu no ponto de operação")
+        return x
+
+    def operating_point(self, sources: Optional[Dict[str, Callable[[float], float]]] = None,
+                        t: float = 0.0, initial_guess: np.ndarray = None) -> NonlinearSolution:
+        """Ponto de operação DC (capacitores abertos, indutores em curto) com as fontes no instante t"""
+        iterations, factorizations = self.iteration_count, self.factorization_count
+        b = source_function(self.netlist, self.system, sources)(t)
+        x = self._operating_vector(b, initial_guess)
+        return NonlinearSolution(self.netlist, self.system, x, self.iteration_count - iterations,
+                                 self.factorization_count - factorizations, self.gmin)
+
+    def _static(self, x: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Termos resistivo F(x) = G·x + i(x) − b e reativo Q(x) = C·x + q(x) num ponto convergido"""
+        currents, fluxes, _, _ = self._devices(x)
+        return self.system.G @ x + currents - b, self.system.C @ x + fluxes
+
+    def run(self, t_stop: float, h: float, sources: Optional[Dict[str, Callable[[float], float]]] = None,
+            initial_state: np.ndarray = None, switch_events: Iterable[SwitchEvent] = ()) -> NonlinearResult:
+        """Simula de 0 a t_stop com passo h (dividido ao meio onde o Newton não converge).
+
+        Sem initial_state a simulação parte do ponto de operação em t = 0.
+        Trapézio: c·[Q(x₊) − Q(x)] + F(x₊) + F(x) = 0 com c = 2/h; Euler
+        implícito: c·[Q(x₊) − Q(x)] + F(x₊) = 0 com c = 1/h. O chute inicial
+        de cada passo é a solução do passo anterior. Chaves começam fechadas
+        e mudam de estado exatamente nos instantes dos switch_events: o passo
+        é encurtado até o evento, a parte linear é remontada e o passo seguinte
+        usa Euler implícito (derivadas descontínuas).
+        """
+        if t_stop <= 0 or h <= 0:
+            raise ValueError("Tempo de simulação e passo devem ser positivos")
+        events = sorted(switch_events, key=lambda event: event.time)
+        for event in events:
+            if event.switch_id not in self.switch_ids:
+                raise ValueError(f"Chave {event.switch_id} não existe na netlist")
+        iterations, factorizations = self.iteration_count, self.factorization_count
+        self._set_switches((1 << len(self.switch_ids)) - 1)
+        while events and events[0].time <= 0:
+            self._apply_event(events.pop(0))
+        b = source_function(self.netlist, self.system, sources)
+        x = self._operating_vector(b(0.0)) if initial_state is None else np.asarray(initial_state, float)
+
+        time_buffer = GrowableBuffer(1)
+        state_buffer = GrowableBuffer(self.system.size)
+        mask_buffer = GrowableBuffer(1, dtype=np.int64)
+        time_buffer.append([0.0])
+        state_buffer.append(x)
+        mask_buffer.append([self._mask])
+        F, Q = self._static(x, b(0.0))
+        t, accepted, rejected = 0.0, 0, 0
+        step = h
+        first_order = self.method != "trap"
+        while t < t_stop * (1 - 1e-12):
+            step = min(step, t_stop - t, *(event.time - t for event in events[:1]))
+            alpha, history = (1.0, 0.0) if first_order else (2.0, 1.0)
+            coefficient = float(f"{alpha / step:.12g}")
+            b_next = b(t + step)
+            x_new, converged = self._newton(x, coefficient, b_next + coefficient * Q - history * F)
+            if not converged:
+                rejected += 1
+                step /= 2
+                self._lu = None
+                if step < h / 2 ** MAX_STEP_HALVINGS:
+                    raise RuntimeError(f"Newton-Raphson não convergiu em t = {t:.6g} s")
+                continue
+            x, t = x_new, t + step
+            first_order = self.method != "trap"
+            while events and events[0].time <= t * (1 + 1e-12):
+                self._apply_event(events.pop(0))
+                first_order = True
+            F, Q = self._static(x, b_next)
+            time_buffer.append([t])
+            state_buffer.append(x)
+            mask_buffer.append([self._mask])
+            accepted += 1
+            step = h
+
+        return NonlinearResult(
+            time=time_buffer.data[:, 0].copy(), states=state_buffer.data.copy(),
+            netlist=self.netlist, system=self.system, accepted_steps=accepted, rejected_steps=rejected,
+            factorizations=self.factorization_count - factorizations,
+            newton_iterations=self.iteration_count - iterations, gmin=self.gmin,
+            switch_ids=list(self.switch_ids), switch_states=mask_buffer.data[:, 0].copy(),
+        )
+
+def bridge_rectifier(amplitude: float = 311.0, frequency: float = 60.0, capacitance: float = 470e-6,
+                     load: float = 100.0, saturation: float = 1e-12, junction_capacitance: float = 15e-12,
+                     source_resistance: float = 0.5) -> Tuple[Netlist, Dict[str, Callable[[float], float]]]:
+    """Retificador em ponte com filtro capacitivo: (netlist, formas de onda das fontes).
+
+    Nós: 1 e 2 fase e neutro (depois da resistência da fonte), 3 barramento
+    CC, 4 saída da fonte; o negativo do barramento é o terra. Com os quatro
+    diodos cortados o modo comum da fonte só é definido pelas capacitâncias
+    de junção (sem elas, por correntes de fuga de pA).
+    """
+    netlist = Netlist(node_count=0, node_names={0: "GND", 1: "L", 2: "N", 3: "VDC", 4: "Vs"})
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 4, 2, 0.0, "Vac")
+    netlist.add_element(ComponentType.RESISTOR, 4, 1, source_resistance, "Rs")
+    diode = {"cj": junction_capacitance}
+    netlist.add_element(ComponentType.DIODE, 1, 3, saturation, "D1", parameters=diode)
+    netlist.add_element(ComponentType.DIODE, 2, 3, saturation, "D2", parameters=diode)
+    netlist.add_element(ComponentType.DIODE, 0, 1, saturation, "D3", parameters=diode)
+    netlist.add_element(ComponentType.DIODE, 0, 2, saturation, "D4", parameters=diode)
+    netlist.add_element(ComponentType.CAPACITOR, 3, 0, capacitance, "C")
+    netlist.add_element(ComponentType.RESISTOR, 3, 0, load, "Rload")
+    return netlist, {"Vac": lambda t: amplitude * np.sin(2 * np.pi * frequency * t)}
+
+def boost_pfc(amplitude: float = 311.0, frequency: float = 60.0, switching_frequency: float = 20e3,
+              duty: float = 0.5, inductance: float = 1e-3, saturation_current: float = 10.0,
+              capacitance: float = 470e-6, load: float = 200.0, gate_voltage: float = 12.0
+              ) -> Tuple[Netlist, Dict[str, Callable[[float], float]]]:
+    """Estágio de potência de um PFC boost (ponte, indutor saturável, MOSFET, diodo e barramento).
+
+    A porta é comandada em malha aberta por PWM de razão cíclica fixa; nós
+    3 (retificado), 5 (dreno), 6 (barramento CC) e 7 (porta).
+    """
+    netlist, sources = bridge_rectifier(amplitude, frequency, capacitance=1e-6, load=1e6)
+    netlist.node_names.update({5: "SW", 6: "VBUS", 7: "G"})
+    netlist.add_element(ComponentType.SATURABLE_INDUCTOR, 3, 5, inductance, "L",
+                        parameters={"isat": saturation_current, "ratio": 0.1})
+    netlist.add_element(ComponentType.MOSFET, 5, 0, 5.0, "M", parameters={"vto": 3.0}, node3=7)
+    netlist.add_element(ComponentType.DIODE, 5, 6, 1e-12, "Dboost", parameters={"cj": 15e-12})
+    netlist.add_element(ComponentType.CAPACITOR, 6, 0, capacitance, "Cbus")
+    netlist.add_element(ComponentType.RESISTOR, 6, 0, load, "Rbus")
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 7, 0, 0.0, "Vg")
+    sources["Vg"] = lambda t: gate_voltage if (t * switching_frequency) % 1.0 < duty else 0.0
+    return netlist, sources
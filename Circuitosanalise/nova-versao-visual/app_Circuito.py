@@ -8,6 +8,15 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import matplotlib.patches as patches
+import os
+import threading
+import queue
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import rlc_transient
+import resistive_grid
+from adaptive_sweep import adaptive_frequency_sweep, series_rlc_poles
 
 class CircuitAnalyzer:
     def __init__(self):
@@ -349,6 +358,11 @@ class CircuitAnalyzer:
                                     bg='#6366f1', fg='white', relief=tk.FLAT, pady=12, cursor="hand2")
         calc_circuit_btn.pack(fill=tk.X, padx=15, pady=20)
         
+        self.grid_demo_btn = tk.Button(circuit_params_frame, text="🧪 DEMO: MALHA RESISTIVA 300×300",
+                                       command=self.run_grid_demo, font=("Segoe UI", 10, "bold"),
+                                       bg='#2d3561', fg='white', relief=tk.FLAT, pady=8, cursor="hand2")
+        self.grid_demo_btn.pack(fill=tk.X, padx=15, pady=(0, 10))
+        
         # Info panel
         info_frame = tk.Frame(circuit_params_frame, bg='#2d3561')
         info_frame.pack(fill=tk.X, padx=15, pady=10)
@@ -957,6 +971,70 @@ Onde:
         
         self.results_text.insert(tk.END, result)
     
+    def run_grid_demo(self):
+        # Demonstração independente do circuito do usuário: roda fora da thread do Tk e
+        # devolve o texto por uma fila que a thread do Tk consulta com root.after
+        vs, r = self.vs_voltage.get(), self.r.get()
+        self.grid_demo_btn.config(state=tk.DISABLED)
+        results = queue.Queue()
+        threading.Thread(target=self._grid_demo_worker, args=(vs, r, results), daemon=True).start()
+        self.root.after(100, self._poll_grid_demo, results)
+    
+    def _poll_grid_demo(self, results):
+        try:
+            result = results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self._poll_grid_demo, results)
+            return
+        self.results_text.insert(tk.END, result)
+        self.grid_demo_btn.config(state=tk.NORMAL)
+    
+    def _grid_demo_worker(self, vs, r, results):
+        # Qualquer falha (memória, multigrid, SciPy) vira mensagem: o botão sempre volta a ficar ativo
+        try:
+            results.put(self._grid_demo_text(vs, r))
+        except Exception as e:
+            results.put(f"\n❌ Demonstração da malha: {e}\n")
+    
+    def _grid_demo_text(self, vs, r):
+        # Malha resistiva quadrada com R em cada segmento: fonte no canto superior
+        # esquerdo e terra no canto oposto, resolvida por gradiente conjugado + multigrid
+        size = 300
+        network = resistive_grid.grid_network(size, size, r)
+        corner, opposite = 1, size * size
+        network.fixed = {corner: vs, opposite: 0.0}
+        solver = resistive_grid.GridSolver(network)
+        solution = solver.solve()
+        i_source = solution.source_currents()[corner]
+        segment_currents = np.abs(solution.resistor_currents)
+        # Com V = 0 não circula corrente e Req = V/I fica indefinida
+        req = (f"{vs / i_source:.4f} Ω ({vs / i_source / r:.4f} R)" if i_source != 0
+               else "indefinida (fonte de 0 V, sem corrente)")
+        
+        return f"""
+🧪 DEMONSTRAÇÃO - MALHA RESISTIVA {size} × {size} (independente do circuito acima)
+═══════════════════════════════════════════════════════════
+
+📐 MONTAGEM:
+   Nós: {network.node_count}   Resistores: {len(network.conductance)}   R = {r:.2f} Ω por segmento
+   Fonte de {vs:.1f} V entre os cantos opostos da malha
+   Sistema G·V = I (condutância SPD) resolvido por gradiente conjugado
+   pré-condicionado com multigrid algébrico por agregação
+
+⚡ RESULTADOS:
+• Corrente da fonte: I = {i_source:.4f} A
+• Resistência equivalente: Req = V/I = {req}
+• Potência dissipada: P = {solution.dissipated_power:.2f} W (V·I = {vs * i_source:.2f} W)
+• Maior corrente num segmento: {segment_currents.max():.4f} A
+• Tensão no centro da malha: {solution.voltages[1 + (size // 2) * size + size // 2]:.3f} V
+
+🔢 SOLVER:
+• {solution.iterations} iterações do PCG (resíduo {solution.residuals[-1]:.1e})
+• Pré-condicionador em {solver.setup_time * 1000:.0f} ms, solução em {solution.elapsed * 1000:.0f} ms
+
+═══════════════════════════════════════════════════════════
+"""
+    
     def calc_impedance(self):
         try:
             f = self.f.get()
@@ -1568,32 +1646,8 @@ RESULTADOS APÓS CORREÇÃO:
         self.ax_transient1.clear()
         self.ax_transient2.clear()
         
-        if zeta > 1:  # Overdamped
-            s1 = -zeta * omega_n + omega_n * math.sqrt(zeta**2 - 1)
-            s2 = -zeta * omega_n - omega_n * math.sqrt(zeta**2 - 1)
-            
-            A1 = amplitude * s2 / (s2 - s1)
-            A2 = -amplitude * s1 / (s2 - s1)
-            
-            vc = amplitude + A1 * np.exp(s1 * t) + A2 * np.exp(s2 * t)
-            il = (A1 * s1 * np.exp(s1 * t) + A2 * s2 * np.exp(s2 * t)) / l
-            
-            regime = "Superamortecido (ζ > 1)"
-            
-        elif zeta == 1:  # Critically damped
-            vc = amplitude * (1 - (1 + omega_n * t) * np.exp(-omega_n * t))
-            il = (amplitude * omega_n**2 * t * np.exp(-omega_n * t)) / l
-            
-            regime = "Criticamente Amortecido (ζ = 1)"
-            
-        else:  # Underdamped
-            omega_d = omega_n * math.sqrt(1 - zeta**2)  # Damped frequency
-            
-            vc = amplitude * (1 - np.exp(-zeta * omega_n * t) * 
-                             (np.cos(omega_d * t) + (zeta * omega_n / omega_d) * np.sin(omega_d * t)))
-            il = (amplitude * omega_n**2 * np.exp(-zeta * omega_n * t) * np.sin(omega_d * t)) / (l * omega_d)
-            
-            regime = "Subamortecido (ζ < 1)"
+        vc, il = rlc_transient.step_response(t, r, l, c, amplitude)
+        regime = rlc_transient.response_regime(zeta)
         
         # Plot voltage
         self.ax_transient1.plot(t * 1000, vc, 'r-', linewidth=2.5, label=f'Tensão no Capacitor - {regime}')
@@ -1658,21 +1712,9 @@ RESULTADOS APÓS CORREÇÃO:
         self.ax_transient1.clear()
         self.ax_transient2.clear()
         
-        if zeta > 1:  # Overdamped
-            s1 = -zeta * omega_n + omega_n * math.sqrt(zeta**2 - 1)
-            s2 = -zeta * omega_n - omega_n * math.sqrt(zeta**2 - 1)
-            
-            h = (amplitude / (l * (s1 - s2))) * (np.exp(s1 * t) - np.exp(s2 * t))
-            regime = "Superamortecido"
-            
-        elif zeta == 1:  # Critically damped
-            h = (amplitude * omega_n**2 * t * np.exp(-omega_n * t)) / l
-            regime = "Criticamente Amortecido"
-            
-        else:  # Underdamped
-            omega_d = omega_n * math.sqrt(1 - zeta**2)
-            h = (amplitude * omega_n * np.exp(-zeta * omega_n * t) * np.sin(omega_d * t)) / (l * omega_d)
-            regime = "Subamortecido"
+        # Impulso de tensão de área `amplitude` (V·s): corrente na malha
+        vc, h = rlc_transient.impulse_response(t, r, l, c, amplitude)
+        regime = rlc_transient.response_regime(zeta)
         
         # Plot impulse response
         self.ax_transient1.plot(t * 1000, h, 'g-', linewidth=2.5, label=f'Resposta ao Impulso - {regime}')
@@ -1686,7 +1728,7 @@ RESULTADOS APÓS CORREÇÃO:
         self.ax_transient1.grid(True, alpha=0.4)
         
         # Energy decay
-        energy = 0.5 * l * h**2
+        energy = 0.5 * l * h**2 + 0.5 * c * vc**2
         self.ax_transient2.plot(t * 1000, energy * 1000, 'm-', linewidth=2.5, label='Energia Armazenada')
         
         self.ax_transient2.set_title('Energia no Sistema', 
@@ -1709,23 +1751,7 @@ RESULTADOS APÓS CORREÇÃO:
         self.ax_transient1.clear()
         self.ax_transient2.clear()
         
-        if zeta > 1:  # Overdamped
-            s1 = -zeta * omega_n + omega_n * math.sqrt(zeta**2 - 1)
-            s2 = -zeta * omega_n - omega_n * math.sqrt(zeta**2 - 1)
-            
-            A1 = amplitude * s2 / (s2 - s1)
-            A2 = -amplitude * s1 / (s2 - s1)
-            
-            vc = A1 * np.exp(s1 * t) + A2 * np.exp(s2 * t)
-            il = c * (A1 * s1 * np.exp(s1 * t) + A2 * s2 * np.exp(s2 * t))
-            
-        else:  # Underdamped (most common case)
-            omega_d = omega_n * math.sqrt(1 - zeta**2) if zeta < 1 else omega_n
-            
-            vc = amplitude * np.exp(-zeta * omega_n * t) * np.cos(omega_d * t)
-            il = -(amplitude * c * zeta * omega_n * np.exp(-zeta * omega_n * t) * 
-                   np.cos(omega_d * t) + amplitude * c * omega_d * np.exp(-zeta * omega_n * t) * 
-                   np.sin(omega_d * t))
+        vc, il = rlc_transient.natural_response(t, r, l, c, amplitude)
         
         # Plot natural response
         self.ax_transient1.plot(t * 1000, vc, 'c-', linewidth=2.5, label='Tensão no Capacitor')
@@ -1762,13 +1788,13 @@ RESULTADOS APÓS CORREÇÃO:
             f_end = self.f_end.get()
             plot_type = self.plot_type.get()
             
-            # Frequency vector (logarithmic)
-            f = np.logspace(np.log10(f_start), np.log10(f_end), 1000)
-            omega = 2 * np.pi * f
-            
-            # Transfer function H(jω) = 1 / (1 + jωRC + (jω)²LC) for RLC
-            s = 1j * omega
-            H = 1 / (1 + s * r * c + s**2 * l * c)
+            # Transfer function H(jω) = 1 / (1 + jωRC + (jω)²LC) for RLC,
+            # sampled adaptively (dense only where the curve bends)
+            def transfer(f):
+                s = 2j * np.pi * f
+                return 1 / (1 + s * r * c + s**2 * l * c)
+            f, H = adaptive_frequency_sweep(transfer, f_start, f_end,
+                                            poles=series_rlc_poles(r, l, c))
             
             # Clear plots
             self.ax_freq1.clear()
@@ -1777,7 +1803,7 @@ RESULTADOS APÓS CORREÇÃO:
             if plot_type == "bode":
                 self.plot_bode_diagram(f, H)
             elif plot_type == "nyquist":
-                self.plot_nyquist_diagram(H)
+                self.plot_nyquist_diagram(f, H)
             elif plot_type == "mag_phase":
                 self.plot_magnitude_phase(f, H)
             
@@ -1869,7 +1895,7 @@ RESULTADOS APÓS CORREÇÃO:
         
         self.results_text.insert(tk.END, result)
     
-    def plot_nyquist_diagram(self, H):
+    def plot_nyquist_diagram(self, f, H):
         """Plot Nyquist diagram with enhanced styling"""
         real_part = np.real(H)
         imag_part = np.imag(H)
@@ -1916,7 +1942,6 @@ RESULTADOS APÓS CORREÇÃO:
         self.ax_freq1.set_aspect('equal')
         
         # Magnitude vs frequency on second subplot
-        f = np.logspace(np.log10(self.f_start.get()), np.log10(self.f_end.get()), 1000)
         magnitude = np.abs(H)
         
         self.ax_freq2.loglog(f, magnitude, color='#f59e0b', linewidth=3, 
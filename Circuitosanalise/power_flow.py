@@ -0,0 +1,374 @@
+# Módulo de fluxo de potência (barras PQ/PV/referência) sobre a netlist do construtor
+# Newton-Raphson em coordenadas polares com jacobiano esparso, ou desacoplado rápido com B' e B''
+# fatorados uma única vez; escala para milhares de barras
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from circuit_calculator import CalculationResults, PowerFactorCorrector
+from circuit_editor import ComponentType
+from circuit_solver import GMIN, Netlist
+from transmission_line import line_admittance
+
+SLACK, PV, PQ = "slack", "PV", "PQ"
+METHODS = ("newton", "fast_decoupled")
+MAX_ITERATIONS = {"newton": 20, "fast_decoupled": 100}
+
+# Elementos passivos que viram ramos (entre barras) ou derivações (para o terra)
+PASSIVE_TYPES = (ComponentType.RESISTOR, ComponentType.SWITCH, ComponentType.CAPACITOR,
+                 ComponentType.INDUCTOR, ComponentType.TRANSMISSION_LINE)
+# Derivações que podem virar carga de potência constante (chaves e linhas ficam sempre na Ybus)
+LOAD_TYPES = (ComponentType.RESISTOR, ComponentType.CAPACITOR, ComponentType.INDUCTOR)
+# Maior |S_carga|·|Z_th|/|E_th|² da barra convertida em carga PQ (Thévenin visto da barra com as
+# fontes em curto): o ponto de máxima transferência fica entre 0,25 (alimentador resistivo) e
+# 0,5 (indutivo) e além dele o fluxo não tem solução; acima do limite a carga fica na Ybus
+MAX_LOAD_ADMITTANCE_RATIO = 0.15
+# Colunas de Z_bus calculadas por vez ao obter a impedância de Thévenin das barras de carga
+THEVENIN_BLOCK = 256
+
+@dataclass
+class PowerFlowCase:
+    """Dados de barras e ramos do fluxo de potência (tensões eficazes, potências em VA)"""
+    names: List[str]
+    # Nó da netlist de cada barra
+    nodes: np.ndarray
+    # Matriz de admitância nodal (barras × barras), sem o terra
+    ybus: sp.csr_matrix
+    bus_types: np.ndarray
+    # Referência: V∠θ; PV: |V| (o ângulo é o ponto de partida); PQ: ponto de partida
+    voltage: np.ndarray
+    # Potência consumida pela carga de potência constante e gerada (P das barras PV) em cada barra
+    load: np.ndarray
+    generation: np.ndarray
+    # Ramos: id do(s) elemento(s), barras (índices 0..n−1, −1 = terra) e parâmetros Y do quadripolo
+    branch_ids: List[str]
+    from_bus: np.ndarray
+    to_bus: np.ndarray
+    y11: np.ndarray
+    y12: np.ndarray
+    y22: np.ndarray
+
+    @property
+    def bus_count(self) -> int:
+        return len(self.names)
+
+def _element_stamp(element, frequency: float):
+    # (y₁₁, y₁₂, y₂₂) do elemento: i₁ = y₁₁V₁ + y₁₂V₂ entra pelo nó 1, −i₂ = y₁₂V₁ + y₂₂V₂
+    if element.type == ComponentType.TRANSMISSION_LINE:
+        return tuple(complex(v) for v in line_admittance(element.parameters, element.value, frequency))
+    if element.type in (ComponentType.RESISTOR, ComponentType.SWITCH):
+        y = 1.0 / element.value
+    elif element.type == ComponentType.CAPACITOR:
+        y = 2j * np.pi * frequency * element.value
+    else:
+        y = 1.0 / (2j * np.pi * frequency * element.value)
+    return y, -y, y
+
+def _series_chain(first, second, node):
+    # Elimina o nó interno entre dois ramos em série (Kron): Y' = Y_aa − Y_am·Y_mm⁻¹·Y_ma
+    def oriented(branch):
+        i, j, y11, y12, y22 = branch
+        return (i, y11, y12, y22) if j == node else (j, y22, y12, y11)
+    p, a11, a12, a22 = oriented(first)
+    q, b22, b12, b11 = oriented(second)
+    d = a22 + b11
+    return p, q, a11 - a12 ** 2 / d, -a12 * b12 / d, b22 - b12 ** 2 / d, d
+
+def _assemble_ybus(branches, index, size: int) -> sp.csr_matrix:
+    # Estampa os ramos (nó 1, nó 2, y₁₁, y₁₂, y₂₂) nas barras dadas por index (−1 = terra)
+    rows, cols, values = [], [], []
+    for i, j, y11, y12, y22 in branches:
+        i, j = index[i], index[j]
+        for row, col, value in ((i, i, y11), (i, j, y12), (j, i, y12), (j, j, y22)):
+            if row >= 0 and col >= 0:
+                rows.append(row)
+                cols.append(col)
+                values.append(value)
+    return sp.csr_matrix((np.array(values, dtype=complex), (rows, cols)), shape=(size, size))
+
+def _thevenin(ybus: sp.csr_matrix, sources: np.ndarray, voltage: np.ndarray, buses: np.ndarray):
+    # Equivalente de Thévenin das barras: E_th = tensão em vazio imposta pelas fontes e
+    # Z_th = diagonal de Z_bus com as fontes em curto (só as colunas de `buses`); barras
+    # sem caminho até uma fonte ficam com E_th ≈ 0 graças ao GMIN
+    size = ybus.shape[0]
+    free = np.setdiff1d(np.arange(size), sources)
+    e_th = np.array(voltage, dtype=complex)
+    z_th = np.zeros(size, dtype=complex)
+    if len(free) == 0:
+        return e_th, z_th
+    position = np.full(size, -1)
+    position[free] = np.arange(len(free))
+    lu = spla.splu((ybus[free][:, free] + GMIN * sp.identity(len(free))).tocsc())
+    e_th[free] = lu.solve(-(ybus[free][:, sources] @ voltage[sources]))
+    targets = position[buses]
+    targets = targets[targets >= 0]
+    for start in range(0, len(targets), THEVENIN_BLOCK):
+        block = targets[start:start + THEVENIN_BLOCK]
+        unit = np.zeros((len(free), len(block)), dtype=complex)
+        unit[block, np.arange(len(block))] = 1.0
+        z_th[free[block]] = lu.solve(unit)[block, np.arange(len(block))]
+    return e_th, z_th
+
+def case_from_netlist(netlist: Netlist, frequency: float, generation: Optional[Dict[str, float]] = None,
+                      constant_power_loads: bool = True) -> PowerFlowCase:
+    """Monta o caso de fluxo de potência a partir da netlist do construtor.
+
+    A primeira fonte de tensão ligada ao terra define a barra de referência
+    (|V| = valor/√2, ângulo 0 ou 180° conforme a polaridade) e as demais são
+    barras PV com a potência ativa de `generation` (por id da fonte, padrão
+    0). Elementos passivos entre dois nós são ramos; os ligados ao terra são
+    cargas: com constant_power_loads cada um vira uma carga PQ de potência
+    constante igual à que consome sob a tensão da referência, senão fica na
+    Ybus como impedância constante. Chaves e linhas ficam sempre na Ybus, e
+    também as cargas de barras fracas: com E_th e Z_th do equivalente de
+    Thévenin da barra na rede já reduzida e sem as cargas, a carga só vira PQ
+    se |S_carga|·|Z_th|/|E_th|² ≤ MAX_LOAD_ADMITTANCE_RATIO (cada barra é
+    avaliada isoladamente). Nós internos de uma série (só dois ramos, sem
+    carga nem fonte, como o ponto entre o R e o L de um alimentador) são
+    eliminados e a série vira um único ramo equivalente; os demais nós são as
+    barras.
+    """
+    if frequency <= 0:
+        raise ValueError("Frequência deve ser positiva")
+    generation = generation or {}
+    n = netlist.node_count
+    bus_types = np.full(n, PQ, dtype=object)
+    voltage = np.ones(n, dtype=complex)
+    load = np.zeros(n, dtype=complex)
+    injected = np.zeros(n, dtype=complex)
+    unsupported, sources = [], []
+    for element in netlist.elements:
+        if element.type == ComponentType.VOLTAGE_SOURCE:
+            if (element.node1 == 0) == (element.node2 == 0):
+                unsupported.append(f"{element.label} (fonte sem terminal no terra)")
+                continue
+            bus = max(element.node1, element.node2) - 1
+            if bus_types[bus] != PQ:
+                unsupported.append(f"{element.label} (duas fontes na mesma barra)")
+                continue
+            sign = 1.0 if element.node1 > 0 else -1.0
+            bus_types[bus] = PV if sources else SLACK
+            voltage[bus] = sign * element.value / np.sqrt(2)
+            injected[bus] = generation.get(element.id, 0.0)
+            sources.append(bus)
+        elif element.type not in PASSIVE_TYPES:
+            unsupported.append(element.label)
+    if unsupported:
+        raise ValueError(f"Elementos sem modelo no fluxo de potência: {', '.join(unsupported)}")
+    if not sources:
+        raise ValueError("Circuito sem fonte de tensão ligada ao terra para a barra de referência")
+    nominal = abs(voltage[sources[0]])
+    # Barras PQ partem da tensão da referência (partida plana)
+    voltage[bus_types == PQ] = voltage[sources[0]]
+
+    # Ramos por id: (nó 1, nó 2, y₁₁, y₁₂, y₂₂) com nós 0..n−1 e −1 = terra
+    branches: Dict[str, tuple] = {}
+    blocked = set(sources)
+    loads: Dict[str, int] = {}
+    for element in netlist.elements:
+        if element.type not in PASSIVE_TYPES:
+            continue
+        i, j = element.node1 - 1, element.node2 - 1
+        y11, y12, y22 = _element_stamp(element, frequency)
+        if (i < 0) != (j < 0):
+            blocked.add(max(i, j))
+            if element.type in LOAD_TYPES:
+                loads[element.id] = max(i, j)
+        branches[element.id] = (i, j, y11, y12, y22)
+
+    adjacency: Dict[int, List[str]] = {}
+    for branch_id, (i, j, *_) in branches.items():
+        for node in {i, j} - {-1}:
+            adjacency.setdefault(node, []).append(branch_id)
+    eliminated = set()
+    for node in range(n):
+        chain = adjacency.get(node, [])
+        if node in blocked or len(chain) != 2:
+            continue
+        p, q, y11, y12, y22, d = _series_chain(branches[chain[0]], branches[chain[1]], node)
+        if p == q or abs(d) == 0:
+            continue
+        merged = f"{chain[0]}+{chain[1]}"
+        for branch_id, other in ((chain[0], p), (chain[1], q)):
+            del branches[branch_id]
+            adjacency[other][adjacency[other].index(branch_id)] = merged
+        branches[merged] = (p, q, y11, y12, y22)
+        eliminated.add(node)
+
+    kept = np.array([node for node in range(n) if node not in eliminated], dtype=int)
+    index = np.full(n + 1, -1)
+    index[kept] = np.arange(len(kept))
+    if constant_power_loads and loads:
+        # Admitância das cargas de cada barra, sob a tensão da referência: S = V²·Y*
+        demand = np.zeros(len(kept), dtype=complex)
+        for branch_id, node in loads.items():
+            i, _, y11, _, y22 = branches[branch_id]
+            demand[index[node]] += y11 if i >= 0 else y22
+        network = _assemble_ybus([b for k, b in branches.items() if k not in loads], index, len(kept))
+        e_th, z_th = _thevenin(network, index[sources], voltage[kept], np.flatnonzero(demand))
+        converted = nominal ** 2 * np.abs(demand) * np.abs(z_th) <= \
+            MAX_LOAD_ADMITTANCE_RATIO * np.abs(e_th) ** 2
+        for branch_id, node in loads.items():
+            if converted[index[node]]:
+                i, _, y11, _, y22 = branches.pop(branch_id)
+                load[node] += nominal ** 2 * np.conj(y11 if i >= 0 else y22)
+    ybus = _assemble_ybus(branches.values(), index, len(kept))
+    stamps = np.array([branch[2:] for branch in branches.values()], dtype=complex).reshape(-1, 3)
+    ends = np.array([branch[:2] for branch in branches.values()], dtype=int).reshape(-1, 2)
+    return PowerFlowCase([netlist.node_names.get(node + 1, f"N{node + 1}") for node in kept], kept + 1,
+                         ybus, bus_types[kept], voltage[kept], load[kept], injected[kept], list(branches),
+                         index[ends[:, 0]], index[ends[:, 1]], stamps[:, 0], stamps[:, 1], stamps[:, 2])
+
+@dataclass
+class PowerFlowResult:
+    """Tensões eficazes das barras na solução do fluxo de potência"""
+    case: PowerFlowCase
+    voltages: np.ndarray
+    method: str
+    iterations: int
+    # Maior desbalanço de potência restante [VA]
+    mismatch: float
+
+    @property
+    def magnitude(self) -> np.ndarray:
+        return np.abs(self.voltages)
+
+    @property
+    def angle(self) -> np.ndarray:
+        """Ângulo das tensões [graus]"""
+        return np.degrees(np.angle(self.voltages))
+
+    @property
+    def injection(self) -> np.ndarray:
+        """Potência líquida injetada pela rede em cada barra S = V·(Ybus·V)* [VA]"""
+        return self.voltages * np.conj(self.case.ybus @ self.voltages)
+
+    @property
+    def source_power(self) -> np.ndarray:
+        """Potência entregue pelas fontes (referência e PV); zero nas barras PQ [VA]"""
+        power = self.injection + self.case.load
+        return np.where(self.case.bus_types == PQ, 0.0, power)
+
+    def branch_flows(self):
+        """Potências que entram em cada ramo pelos terminais 1 e 2 [VA]"""
+        voltages = np.append(self.voltages, 0.0)
+        v1, v2 = voltages[self.case.from_bus], voltages[self.case.to_bus]
+        case = self.case
+        return (v1 * np.conj(case.y11 * v1 + case.y12 * v2),
+                v2 * np.conj(case.y12 * v1 + case.y22 * v2))
+
+    @property
+    def losses(self) -> complex:
+        """Perdas ativas e reativas nos ramos entre barras (derivações para o terra são carga) [VA]"""
+        start, end = self.branch_flows()
+        series = (self.case.from_bus >= 0) & (self.case.to_bus >= 0)
+        return complex(np.sum((start + end)[series]))
+
+def _mismatch(ybus, voltage, specified):
+    return voltage * np.conj(ybus @ voltage) - specified
+
+def _newton_jacobian(ybus, voltage, pvpq, pq):
+    # Derivadas de S = V·(YV)* em relação a θ e |V| (forma matricial esparsa)
+    current = ybus @ voltage
+    diag_v = sp.diags(voltage)
+    diag_norm = sp.diags(voltage / np.abs(voltage))
+    ds_dangle = 1j * diag_v @ np.conj(sp.diags(current) - ybus @ diag_v)
+    ds_dmagnitude = diag_v @ np.conj(ybus @ diag_norm) + sp.diags(np.conj(current)) @ diag_norm
+    ds_dangle, ds_dmagnitude = ds_dangle.tocsr(), ds_dmagnitude.tocsr()
+    return sp.bmat([
+        [ds_dangle[pvpq][:, pvpq].real, ds_dmagnitude[pvpq][:, pq].real],
+        [ds_dangle[pq][:, pvpq].imag, ds_dmagnitude[pq][:, pq].imag],
+    ], format='csc')
+
+def solve_power_flow(case: PowerFlowCase, method: str = "newton", tolerance: float = 1e-8,
+                     max_iterations: Optional[int] = None) -> PowerFlowResult:
+    """Resolve o fluxo de potência pelo método de Newton-Raphson ou desacoplado rápido.
+
+    Internamente trabalha em pu com base na tensão da referência (a Ybus não
+    muda com S_base = V_base²·1 S). O Newton resolve J·[Δθ; Δ|V|] = −[ΔP; ΔQ]
+    com o jacobiano esparso montado a cada iteração; o desacoplado rápido
+    alterna Δθ = B'⁻¹·ΔP/|V| e Δ|V| = B''⁻¹·ΔQ/|V| com B' = −Im(Ybus) nas
+    barras PV+PQ e B'' = −Im(Ybus) nas PQ, fatoradas uma vez (exige rede com
+    X/R alto). Converge quando o maior desbalanço fica abaixo de tolerance
+    vezes a soma das potências especificadas e das absorvidas pelas
+    derivações da Ybus na partida.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Método inválido: {method}")
+    max_iterations = max_iterations or MAX_ITERATIONS[method]
+    types = case.bus_types
+    slack = np.flatnonzero(types == SLACK)
+    pv, pq = np.flatnonzero(types == PV), np.flatnonzero(types == PQ)
+    pvpq = np.concatenate([pv, pq])
+    base = abs(case.voltage[slack[0]])
+    voltage = case.voltage / base
+    specified = (case.generation - case.load) / base ** 2
+    ybus = case.ybus
+    # Escala: potências especificadas mais a que as derivações da Ybus absorvem na partida
+    scale = np.abs(specified).sum() + np.abs(_mismatch(ybus, voltage, 0.0)).sum()
+    limit = tolerance * (scale if scale > 0 else 1.0)
+
+    def error(mismatch):
+        return max(np.abs(mismatch[pvpq].real).max(initial=0.0), np.abs(mismatch[pq].imag).max(initial=0.0))
+
+    mismatch = _mismatch(ybus, voltage, specified)
+    iterations = 0
+    if method == "newton":
+        while error(mismatch) > limit:
+            if iterations == max_iterations:
+                raise RuntimeError("Fluxo de potência (Newton) não convergiu")
+            jacobian = _newton_jacobian(ybus, voltage, pvpq, pq)
+            step = spla.splu(jacobian).solve(-np.concatenate([mismatch[pvpq].real, mismatch[pq].imag]))
+            angle, magnitude = np.angle(voltage), np.abs(voltage)
+            angle[pvpq] += step[:len(pvpq)]
+            magnitude[pq] += step[len(pvpq):]
+            voltage = magnitude * np.exp(1j * angle)
+            mismatch = _mismatch(ybus, voltage, specified)
+            iterations += 1
+    else:
+        susceptance = -ybus.imag.tocsr()
+        try:
+            b_angle = spla.splu(susceptance[pvpq][:, pvpq].tocsc())
+            b_magnitude = spla.splu(susceptance[pq][:, pq].tocsc()) if len(pq) else None
+        except RuntimeError:
+            raise ValueError("B' singular: rede sem reatância série, use o método de Newton")
+        while error(mismatch) > limit:
+            if iterations == max_iterations:
+                raise RuntimeError("Fluxo de potência (desacoplado rápido) não convergiu")
+            angle, magnitude = np.angle(voltage), np.abs(voltage)
+            angle[pvpq] -= b_angle.solve(mismatch[pvpq].real / magnitude[pvpq])
+            voltage = magnitude * np.exp(1j * angle)
+            mismatch = _mismatch(ybus, voltage, specified)
+            if b_magnitude is not None:
+                magnitude[pq] -= b_magnitude.solve(mismatch[pq].imag / magnitude[pq])
+                voltage = magnitude * np.exp(1j * angle)
+                mismatch = _mismatch(ybus, voltage, specified)
+            iterations += 1
+    return PowerFlowResult(case, voltage * base, method, iterations, error(mismatch) * base ** 2)
+
+def power_factor_corrections(result: PowerFlowResult, frequency: float, desired_fp: float) -> Dict[int, Dict]:
+    """Dimensiona a correção do FP de cada barra de carga com a tensão calculada no fluxo.
+
+    Para cada barra com carga ativa, alimenta o PowerFactorCorrector com P e Q
+    da carga e o |V| da barra, de modo que o capacitor sai para a tensão real
+    de operação e não para a nominal. Retorna {nó da netlist: correção}.
+    """
+    corrector = PowerFactorCorrector()
+    corrections = {}
+    for bus in np.flatnonzero(result.case.load.real > 0):
+        power, vrms = result.case.load[bus], float(result.magnitude[bus])
+        current = abs(power) / vrms
+        angle = float(np.degrees(np.angle(power)))
+        results = CalculationResults(
+            voltage_rms=vrms, current_rms=current, power_factor=power.real / abs(power),
+            power_active=power.real, power_reactive=power.imag, power_apparent=abs(power),
+            impedance_magnitude=vrms / current, impedance_angle=angle,
+            circuit_type="Barra PQ", phase_difference=angle,
+        )
+        correction = corrector.calculate_correction(results, vrms, frequency, desired_fp)
+        if correction:
+            corrections[int(result.case.nodes[bus])] = correction
+    return corrections
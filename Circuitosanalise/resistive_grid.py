@@ -0,0 +1,362 @@
+# Módulo de solução DC de redes resistivas grandes (malhas, malhas de aterramento, redes de alimentação)
+# Matriz de condutância SPD resolvida por gradiente conjugado pré-condicionado, com partida a quente
+
+import time
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from circuit_editor import ComponentType
+from circuit_solver import GMIN, Netlist
+
+PRECONDITIONERS = ("jacobi", "ilu", "amg")
+
+# Multigrid por agregação suavizada: nível mais grosso resolvido por LU esparsa
+COARSE_SIZE = 500
+MAX_LEVELS = 20
+# Conexões com |a_ij| < θ·√(a_ii·a_jj) não entram na agregação (resistências muito desiguais)
+STRENGTH_THRESHOLD = 0.05
+
+@dataclass
+class ResistorNetwork:
+    """Rede resistiva em arrays: o resistor k liga node1[k] a node2[k] com condutância conductance[k].
+
+    Nós 1..node_count (0 = terra); injection[n] é a corrente injetada no nó n
+    (posição 0 ignorada) e fixed mapeia nós a potenciais impostos (fontes de
+    tensão para a terra).
+    """
+    node_count: int
+    node1: np.ndarray
+    node2: np.ndarray
+    conductance: np.ndarray
+    injection: Optional[np.ndarray] = None
+    fixed: Dict[int, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.node1 = np.asarray(self.node1, dtype=np.int64)
+        self.node2 = np.asarray(self.node2, dtype=np.int64)
+        self.conductance = np.asarray(self.conductance, dtype=float)
+        if self.injection is None:
+            self.injection = np.zeros(self.node_count + 1)
+        self.injection = np.asarray(self.injection, dtype=float)
+
+def grid_network(rows: int, cols: int, resistance: float,
+                 ground_resistance: Optional[float] = None) -> ResistorNetwork:
+    """Malha retangular rows × cols com resistência `resistance` em cada segmento.
+
+    O nó da linha i e coluna j é 1 + i·cols + j. Com ground_resistance, cada
+    nó é ligado ao terra por essa resistência (hastes de aterramento, fugas).
+    """
+    index = 1 + np.arange(rows * cols).reshape(rows, cols)
+    node1 = [index[:, :-1].ravel(), index[:-1, :].ravel()]
+    node2 = [index[:, 1:].ravel(), index[1:, :].ravel()]
+    if ground_resistance is not None:
+        node1.append(index.ravel())
+        node2.append(np.zeros(rows * cols, dtype=np.int64))
+    node1, node2 = np.concatenate(node1), np.concatenate(node2)
+    conductance = np.full(len(node1), 1.0 / resistance)
+    if ground_resistance is not None:
+        conductance[-rows * cols:] = 1.0 / ground_resistance
+    return ResistorNetwork(rows * cols, node1, node2, conductance)
+
+def network_from_netlist(netlist: Netlist) -> ResistorNetwork:
+    """Rede resistiva de uma netlist DC (resistores, chaves, fontes de corrente e de tensão para o terra).
+
+    Capacitores são circuitos abertos em DC e ficam de fora; indutores e
+    fontes de tensão flutuantes não cabem na forma SPD e devem ir para o
+    CircuitSolver.
+    """
+    node1, node2, conductance = [], [], []
+    injection = np.zeros(netlist.node_count + 1)
+    fixed: Dict[int, float] = {}
+    for element in netlist.elements:
+        if element.type in (ComponentType.RESISTOR, ComponentType.SWITCH):
+            node1.append(element.node1)
+            node2.append(element.node2)
+            conductance.append(1.0 / element.value)
+        elif element.type == ComponentType.CURRENT_SOURCE:
+            # Corrente entra no circuito pelo terminal 2 (sentido da seta)
+            injection[element.node1] -= element.value
+            injection[element.node2] += element.value
+        elif element.type == ComponentType.VOLTAGE_SOURCE and 0 in (element.node1, element.node2):
+            node, sign = (element.node1, 1.0) if element.node2 == 0 else (element.node2, -1.0)
+            if node in fixed and fixed[node] != sign * element.value:
+                raise ValueError(f"Fontes de tensão em conflito no nó {node}")
+            fixed[node] = sign * element.value
+        elif element.type != ComponentType.CAPACITOR:
+            raise ValueError(f"{element.label} não é suportado pela rede resistiva (use o solver nodal)")
+    injection[0] = 0.0
+    return ResistorNetwork(netlist.node_count, node1, node2, conductance, injection, fixed)
+
+def conductance_matrix(network: ResistorNetwork) -> sp.csr_matrix:
+    """Matriz de condutância (laplaciano ponderado) de ordem node_count + 1, incluindo o terra"""
+    n1, n2, g = network.node1, network.node2, network.conductance
+    rows = np.concatenate((n1, n2, n1, n2))
+    cols = np.concatenate((n1, n2, n2, n1))
+    values = np.concatenate((g, g, -g, -g))
+    size = network.node_count + 1
+    return sp.coo_matrix((values, (rows, cols)), shape=(size, size)).tocsr()
+
+def _row_max(S: sp.csr_matrix, values: np.ndarray) -> np.ndarray:
+    """max de values[j] sobre os vizinhos j de cada linha (S contém a diagonal: nenhuma linha vazia)"""
+    return np.maximum.reduceat(values[S.indices], S.indptr[:-1])
+
+def _strength(A: sp.csr_matrix, theta: float) -> sp.csr_matrix:
+    """Grafo das conexões fortes |a_ij| ≥ θ·√(a_ii·a_jj), com a diagonal"""
+    A = A.tocoo()
+    diagonal = np.abs(A.diagonal())
+    strong = np.abs(A.data) >= theta * np.sqrt(diagonal[A.row] * diagonal[A.col])
+    S = sp.csr_matrix((np.ones(strong.sum()), (A.row[strong], A.col[strong])), shape=A.shape)
+    return (S + sp.identity(A.shape[0], format='csr')).tocsr()
+
+def _aggregate(S: sp.csr_matrix, rng: np.random.Generator) -> np.ndarray:
+    """Agregados a partir de um conjunto independente maximal de distância 2 (Luby vetorizado).
+
+    Raízes são os nós de maior peso aleatório na vizinhança de distância 2;
+    cada nó vizinho de uma raiz entra no seu agregado e os restantes (a
+    distância 2) entram no agregado de um vizinho.
+    """
+    n = S.shape[0]
+    weight = 1.0 + rng.random(n)
+    state = np.zeros(n, dtype=np.int8)  # 0 indefinido, 1 raiz, −1 coberto por uma raiz
+    while (state == 0).any():
+        candidate = np.where(state == 0, weight, 0.0)
+        roots = (state == 0) & (candidate == _row_max(S, _row_max(S, candidate)))
+        state[roots] = 1
+        covered = _row_max(S, _row_max(S, roots.astype(float))) > 0
+        state[covered & (state == 0)] = -1
+    aggregate = np.full(n, -1, dtype=np.int64)
+    roots = np.flatnonzero(state == 1)
+    aggregate[roots] = np.arange(len(roots))
+    while (aggregate < 0).any():
+        unassigned = aggregate < 0
+        aggregate[unassigned] = _row_max(S, aggregate)[unassigned]
+    return aggregate
+
+def _jacobi_weight(A: sp.csr_matrix) -> np.ndarray:
+    """ω·D⁻¹ com ω = 4/(3ρ), ρ(D⁻¹A) limitado por Gershgorin"""
+    diagonal = A.diagonal()
+    rho = (abs(A).sum(axis=1).A1 / diagonal).max()
+    return 4.0 / (3.0 * rho) / diagonal
+
+class MultigridPreconditioner:
+    """Multigrid algébrico por agregação suavizada (um V-ciclo por aplicação).
+
+    Agregados vêm de um conjunto independente de distância 2 no grafo das
+    conexões fortes; o prolongador tentativo é constante por agregado (o
+    núcleo do laplaciano) e é suavizado por Jacobi: P = (I − ωD⁻¹A)·T. O
+    operador grosso é PᵀAP. Pré e pós-suavização de Jacobi amortecido
+    idênticas tornam o V-ciclo simétrico e positivo definido, como o PCG exige.
+    """
+
+    def __init__(self, A: sp.csr_matrix, coarse_size: int = COARSE_SIZE, theta: float = STRENGTH_THRESHOLD,
+                 sweeps: int = 1, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.sweeps = sweeps
+        self.levels = []  # (A, ωD⁻¹, P, Pᵀ)
+        A = A.tocsr()
+        while A.shape[0] > coarse_size and len(self.levels) < MAX_LEVELS - 1:
+            aggregate = _aggregate(_strength(A, theta), rng)
+            count = np.bincount(aggregate)
+            if len(count) >= A.shape[0]:
+                break
+            T = sp.csr_matrix((1.0 / np.sqrt(count[aggregate]), (np.arange(A.shape[0]), aggregate)),
+                              shape=(A.shape[0], len(count)))
+            smoother = _jacobi_weight(A)
+            P = (T - sp.diags(smoother) @ (A @ T)).tocsr()
+            self.levels.append((A, smoother, P, P.T.tocsr()))
+            A = (P.T @ A @ P).tocsr()
+        self._coarse = spla.splu(A.tocsc())
+
+    @property
+    def sizes(self) -> List[int]:
+        return [level[0].shape[0] for level in self.levels] + [self._coarse.shape[0]]
+
+    def _cycle(self, depth: int, r: np.ndarray) -> np.ndarray:
+        if depth == len(self.levels):
+            return self._coarse.solve(r)
+        A, smoother, P, R = self.levels[depth]
+        x = smoother * r
+        for _ in range(self.sweeps - 1):
+            x += smoother * (r - A @ x)
+        x += P @ self._cycle(depth + 1, R @ (r - A @ x))
+        for _ in range(self.sweeps):
+            x += smoother * (r - A @ x)
+        return x
+
+    def __call__(self, r: np.ndarray) -> np.ndarray:
+        return self._cycle(0, r)
+
+def make_preconditioner(A: sp.csr_matrix, kind: str = "amg") -> Callable[[np.ndarray], np.ndarray]:
+    """M⁻¹ como função: Jacobi (diagonal), ILU simétrica do SuperLU ou multigrid por agregação"""
+    if kind == "jacobi":
+        inverse = 1.0 / A.diagonal()
+        return lambda r: inverse * r
+    if kind == "ilu":
+        ilu = spla.spilu(A.tocsc(), drop_tol=1e-4, fill_factor=10, diag_pivot_thresh=0.0,
+                         permc_spec="MMD_AT_PLUS_A", options={"SymmetricMode": True})
+        return ilu.solve
+    if kind == "amg":
+        return MultigridPreconditioner(A)
+    raise ValueError(f"Pré-condicionador inválido: {kind}")
+
+def conjugate_gradient(A: sp.csr_matrix, b: np.ndarray, precondition: Callable[[np.ndarray], np.ndarray],
+                       x0: Optional[np.ndarray] = None, rtol: float = 1e-8,
+                       maxiter: int = 1000) -> tuple:
+    """Gradiente conjugado pré-condicionado: (x, histórico de ‖r‖/‖b‖)"""
+    x = np.zeros(len(b)) if x0 is None else np.array(x0, dtype=float)
+    r = b - A @ x
+    scale = np.linalg.norm(b) or 1.0
+    history = [np.linalg.norm(r) / scale]
+    if history[-1] <= rtol:
+        return x, history
+    z = precondition(r)
+    p = z.copy()
+    rz = r @ z
+    for _ in range(maxiter):
+        Ap = A @ p
+        alpha = rz / (p @ Ap)
+        x += alpha * p
+        r -= alpha * Ap
+        history.append(np.linalg.norm(r) / scale)
+        if history[-1] <= rtol:
+            break
+        z = precondition(r)
+        rz, rz_previous = r @ z, rz
+        p = z + (rz / rz_previous) * p
+    return x, history
+
+@dataclass
+class GridSolution:
+    """Potenciais nodais (terra na posição 0) e estatísticas da solução iterativa"""
+    network: ResistorNetwork
+    voltages: np.ndarray
+    residuals: List[float]
+    converged: bool
+    elapsed: float
+
+    @property
+    def iterations(self) -> int:
+        return len(self.residuals) - 1
+
+    @property
+    def resistor_currents(self) -> np.ndarray:
+        """Corrente em cada resistor, de node1 para node2"""
+        n = self.network
+        return n.conductance * (self.voltages[n.node1] - self.voltages[n.node2])
+
+    @property
+    def dissipated_power(self) -> float:
+        n = self.network
+        return float(np.sum(n.conductance * (self.voltages[n.node1] - self.voltages[n.node2]) ** 2))
+
+    def source_currents(self) -> Dict[int, float]:
+        """Corrente fornecida ao circuito por cada nó de potencial imposto"""
+        drawn = conductance_matrix(self.network) @ self.voltages - self.network.injection
+        return {node: float(drawn[node]) for node in self.network.fixed}
+
+class GridSolver:
+    """Solver DC de redes resistivas por PCG com pré-condicionador reaproveitado e partida a quente.
+
+    Os nós de potencial imposto saem do sistema (condição de Dirichlet), e o
+    que resta é SPD. Alterar injeções, valores das fontes ou condutâncias de
+    alguns resistores só remonta b e A: o pré-condicionador continua
+    espectralmente próximo e o PCG parte da solução anterior, de modo que
+    pequenas alterações convergem em poucas iterações.
+    """
+
+    def __init__(self, network: ResistorNetwork, preconditioner: str = "amg", rtol: float = 1e-8,
+                 maxiter: int = 1000, gmin: float = GMIN):
+        if preconditioner not in PRECONDITIONERS:
+            raise ValueError(f"Pré-condicionador inválido: {preconditioner}")
+        self.network = network
+        self.preconditioner = preconditioner
+        self.rtol = rtol
+        self.maxiter = maxiter
+        self.gmin = gmin
+        self.setup_time = 0.0
+        self._fixed_nodes = None
+        self._x = None
+        self._assemble()
+
+    def _assemble(self):
+        """Monta A = L_ff + gmin·I e a parte de b que vem dos potenciais impostos"""
+        network = self.network
+        fixed_nodes = np.array(sorted(network.fixed), dtype=np.int64)
+        if len(fixed_nodes) and (fixed_nodes.min() < 1 or fixed_nodes.max() > network.node_count):
+            raise ValueError("Nó de potencial imposto inválido")
+        free = np.setdiff1d(np.arange(1, network.node_count + 1), fixed_nodes)
+        self.free = free
+        # Posição de cada nó no sistema reduzido (livres) ou no vetor de contorno (impostos)
+        position = np.full(network.node_count + 1, -1, dtype=np.int64)
+        position[free] = np.arange(len(free))
+        boundary = np.full(network.node_count + 1, -1, dtype=np.int64)
+        boundary[fixed_nodes] = np.arange(len(fixed_nodes))
+
+        n1, n2, g = network.node1, network.node2, network.conductance
+        p1, p2 = position[n1], position[n2]
+        diagonal = np.bincount(p1[p1 >= 0], g[p1 >= 0], len(free)) + \
+            np.bincount(p2[p2 >= 0], g[p2 >= 0], len(free)) + self.gmin
+        inner = (p1 >= 0) & (p2 >= 0)
+        rows = np.concatenate((np.arange(len(free)), p1[inner], p2[inner]))
+        cols = np.concatenate((np.arange(len(free)), p2[inner], p1[inner]))
+        values = np.concatenate((diagonal, -g[inner], -g[inner]))
+        self.A = sp.csr_matrix((values, (rows, cols)), shape=(len(free), len(free)))
+        # Acoplamento livre–imposto: b = injeção − L_fb·V_b
+        b1, b2 = boundary[n1], boundary[n2]
+        first, second = (p1 >= 0) & (b2 >= 0), (p2 >= 0) & (b1 >= 0)
+        self._coupling = sp.csr_matrix(
+            (-np.concatenate((g[first], g[second])),
+             (np.concatenate((p1[first], p2[second])), np.concatenate((b2[first], b1[second])))),
+            shape=(len(free), len(fixed_nodes)))
+        if self._fixed_nodes is None or not np.array_equal(fixed_nodes, self._fixed_nodes):
+            self._fixed_nodes = fixed_nodes
+            self._x = None
+            self.refresh_preconditioner()
+
+    def refresh_preconditioner(self):
+        """Reconstrói o pré-condicionador para a matriz atual"""
+        start = time.perf_counter()
+        self._precondition = make_preconditioner(self.A, self.preconditioner)
+        self.setup_time = time.perf_counter() - start
+
+    def update_conductances(self, resistors: Sequence[int], conductances: Sequence[float]):
+        """Altera a condutância dos resistores indicados (índices nos arrays da rede)"""
+        self.network.conductance[np.asarray(resistors)] = conductances
+        self._assemble()
+
+    def solve(self, injection: Optional[np.ndarray] = None,
+              fixed: Optional[Dict[int, float]] = None) -> GridSolution:
+        """Resolve com novas injeções e/ou potenciais impostos (opcionais), partindo da solução anterior.
+
+        Trocar o conjunto de nós impostos muda a ordem do sistema e reconstrói
+        o pré-condicionador; trocar apenas os valores não.
+        """
+        if injection is not None:
+            self.network.injection = np.asarray(injection, dtype=float)
+        if fixed is not None:
+            self.network.fixed = dict(fixed)
+            self._assemble()
+        start = time.perf_counter()
+        boundary = np.array([self.network.fixed[node] for node in self._fixed_nodes], dtype=float)
+        b = self.network.injection[self.free] - self._coupling @ boundary
+        x, residuals = conjugate_gradient(self.A, b, self._precondition, self._x, self.rtol, self.maxiter)
+        self._x = x
+        voltages = np.zeros(self.network.node_count + 1)
+        voltages[self.free] = x
+        voltages[self._fixed_nodes] = boundary
+        return GridSolution(self.network, voltages, residuals, residuals[-1] <= self.rtol,
+                            time.perf_counter() - start)
+
+def equivalent_resistance(network: ResistorNetwork, node_a: int, node_b: int = 0,
+                          preconditioner: str = "amg") -> float:
+    """Resistência vista entre dois nós (1 A injetado em a com b no potencial 0, demais fontes desligadas)"""
+    injection = np.zeros(network.node_count + 1)
+    injection[node_a] = 1.0
+    # b como referência evita o sistema quase singular de uma rede sem ligação ao terra
+    probe = ResistorNetwork(network.node_count, network.node1, network.node2, network.conductance,
+                            injection, {node_b: 0.0} if node_b else {})
+    voltages = GridSolver(probe, preconditioner, rtol=1e-10).solve().voltages
+    return float(voltages[node_a] - voltages[node_b])
@@ -0,0 +1,189 @@
+# Módulo de atlas normalizado das respostas de segunda ordem
+# Tabela c(ζ, τ) e s(ζ, τ) com τ = ωₙ·t; qualquer (R, L, C) é servido por reescala e interpolação
+
+import json
+import os
+import numpy as np
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import rlc_transient
+
+ATLAS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rlc_atlas.npy")
+ZETA_MAX = 3.0
+ZETA_STEP = 0.005
+TAU_MAX = 60.0
+TAU_STEP = 0.05
+# Colunas de τ agrupadas por bloco na tabela de limites de erro
+BOUND_BLOCK = 100
+DEFAULT_TOLERANCE = 1e-3
+
+def _stencil(x: np.ndarray, step: float, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Índice inicial e pesos de Lagrange cúbicos (4 nós) para uma grade uniforme"""
+    position = x / step
+    start = np.clip(np.floor(position).astype(np.intp) - 1, 0, count - 4)
+    u = position - start
+    weights = np.stack([
+        -(u - 1) * (u - 2) * (u - 3) / 6,
+        u * (u - 2) * (u - 3) / 2,
+        -u * (u - 1) * (u - 3) / 2,
+        u * (u - 1) * (u - 2) / 6,
+    ])
+    return start, weights
+
+def _interpolate(table: np.ndarray, zeta: np.ndarray, tau: np.ndarray,
+                 zeta_step: float, tau_step: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Interpolação bicúbica de Lagrange dos dois modos da tabela (erro O(h⁴))"""
+    iz, wz = _stencil(zeta, zeta_step, table.shape[1])
+    it, wt = _stencil(tau, tau_step, table.shape[2])
+    cos_mode = np.zeros(zeta.shape)
+    sin_mode = np.zeros(zeta.shape)
+    for a in range(4):
+        for b in range(4):
+            weight = wz[a] * wt[b]
+            cos_mode += weight * table[0, iz + a, it + b]
+            sin_mode += weight * table[1, iz + a, it + b]
+    return cos_mode, sin_mode
+
+class ResponseAtlas:
+    """Atlas normalizado do RLC série, mapeado em memória a partir de um .npy.
+
+    A tabela guarda c(ζ, τ) = e^{-ζτ}·cos(√(1−ζ²)τ) e s(ζ, τ) = e^{-ζτ}·sin(√(1−ζ²)τ)/√(1−ζ²)
+    (com continuação analítica para ζ ≥ 1). O erro de interpolação é medido
+    nos pontos médios das células ao construir o atlas e guardado por bloco
+    (célula de ζ × BOUND_BLOCK colunas de τ); pontos fora da faixa tabelada
+    ou em blocos cujo limite excede a tolerância são avaliados diretamente.
+    """
+
+    def __init__(self, table: np.ndarray, zeta_step: float, tau_step: float,
+                 bounds: np.ndarray, tolerance: float = DEFAULT_TOLERANCE):
+        self.table = table
+        self.zeta_step = zeta_step
+        self.tau_step = tau_step
+        self.bounds = bounds
+        self.tolerance = tolerance
+        self.zeta_max = zeta_step * (table.shape[1] - 1)
+        self.tau_max = tau_step * (table.shape[2] - 1)
+
+    @staticmethod
+    def _metadata_path(path: str) -> str:
+        return os.path.splitext(path)[0] + ".json"
+
+    @classmethod
+    def build(cls, path: Optional[str] = None, zeta_max: float = ZETA_MAX, zeta_step: float = ZETA_STEP,
+              tau_max: float = TAU_MAX, tau_step: float = TAU_STEP,
+              tolerance: float = DEFAULT_TOLERANCE) -> "ResponseAtlas":
+        """Calcula o atlas e mede os limites de erro; grava .npy + .json se `path` for dado"""
+        zeta = np.linspace(0, zeta_max, int(round(zeta_max / zeta_step)) + 1)
+        tau = np.linspace(0, tau_max, int(round(tau_max / tau_step)) + 1)
+        table = np.stack(rlc_transient.normalized_modes(zeta[:, None], tau[None, :]))
+
+        # Erro nos pontos médios das células, agrupado por blocos de τ
+        tau_mid = tau[:-1] + tau_step / 2
+        blocks = -(-len(tau_mid) // BOUND_BLOCK)
+        bounds = np.empty((len(zeta) - 1, blocks))
+        for k, z in enumerate(zeta[:-1] + zeta_step / 2):
+            z_row = np.full_like(tau_mid, z)
+            exact = rlc_transient.normalized_modes(z_row, tau_mid)
+            approx = _interpolate(table, z_row, tau_mid, zeta_step, tau_step)
+            error = np.maximum(np.abs(exact[0] - approx[0]), np.abs(exact[1] - approx[1]))
+            padded = np.zeros(blocks * BOUND_BLOCK)
+            padded[:len(error)] = error
+            bounds[k] = padded.reshape(blocks, BOUND_BLOCK).max(axis=1)
+
+        if path is not None:
+            temporary = path + ".tmp.npy"
+            np.save(temporary, table)
+            os.replace(temporary, path)
+            with open(cls._metadata_path(path), "w", encoding="utf-8") as file:
+                json.dump({"zeta_step": zeta_step, "tau_step": tau_step,
+                           "shape": list(table.shape), "bounds": bounds.tolist()}, file)
+        return cls(table, zeta_step, tau_step, bounds, tolerance)
+
+    @classmethod
+    def load(cls, path: str = ATLAS_PATH, tolerance: float = DEFAULT_TOLERANCE) -> "ResponseAtlas":
+        """Abre o atlas com mmap (só as páginas usadas são lidas do disco)"""
+        with open(cls._metadata_path(path), encoding="utf-8") as file:
+            metadata = json.load(file)
+        table = np.load(path, mmap_mode="r")
+        if list(table.shape) != metadata["shape"]:
+            raise ValueError(f"Atlas inconsistente com os metadados: {path}")
+        return cls(table, metadata["zeta_step"], metadata["tau_step"],
+                   np.asarray(metadata["bounds"]), tolerance)
+
+    def error_bound(self, zeta, tau) -> np.ndarray:
+        """Limite de erro medido para cada ponto (inf fora da faixa tabelada)"""
+        zeta, tau = np.broadcast_arrays(np.asarray(zeta, dtype=float), np.asarray(tau, dtype=float))
+        inside = (zeta >= 0) & (zeta <= self.zeta_max) & (tau >= 0) & (tau <= self.tau_max)
+        row = np.clip((np.where(inside, zeta, 0) / self.zeta_step).astype(np.intp), 0, self.bounds.shape[0] - 1)
+        column = np.clip((np.where(inside, tau, 0) / self.tau_step).astype(np.intp) // BOUND_BLOCK,
+                         0, self.bounds.shape[1] - 1)
+        return np.where(inside, self.bounds[row, column], np.inf)
+
+    def modes(self, zeta, tau) -> Tuple[np.ndarray, np.ndarray]:
+        """Modos normalizados c(ζ, τ) e s(ζ, τ), com avaliação direta onde o atlas não serve"""
+        zeta, tau = np.broadcast_arrays(np.asarray(zeta, dtype=float), np.asarray(tau, dtype=float))
+        served = self.error_bound(zeta, tau) <= self.tolerance
+        cos_mode = np.empty(zeta.shape)
+        sin_mode = np.empty(zeta.shape)
+        if served.any() and np.all(zeta == zeta.flat[0]):
+            # Um único ζ (caso do slider): combina 4 linhas e interpola só em τ
+            iz, wz = _stencil(zeta.flat[0], self.zeta_step, self.table.shape[1])
+            rows = np.tensordot(wz, self.table[:, iz:iz + 4, :], axes=([0], [1]))
+            it, wt = _stencil(tau[served], self.tau_step, self.table.shape[2])
+            for mode, output in enumerate((cos_mode, sin_mode)):
+                output[served] = sum(wt[b] * rows[mode, it + b] for b in range(4))
+        elif served.any():
+            cos_mode[served], sin_mode[served] = _interpolate(
+                self.table, zeta[served], tau[served], self.zeta_step, self.tau_step)
+        if not served.all():
+            cos_mode[~served], sin_mode[~served] = rlc_transient.normalized_modes(zeta[~served], tau[~served])
+        return cos_mode, sin_mode
+
+    def _scaled_modes(self, t, r, l, c, amplitude):
+        r, l, c, amplitude = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (r, l, c, amplitude)))
+        t = np.asarray(t, dtype=float)
+        expand = (...,) + (None,) * t.ndim
+        omega_n, zeta = rlc_transient.damping_parameters(r, l, c)
+        omega_n, zeta, l, amplitude = omega_n[expand], zeta[expand], l[expand], amplitude[expand]
+        cos_mode, sin_mode = self.modes(zeta, omega_n * t)
+        return omega_n, zeta, l, amplitude, cos_mode, sin_mode
+
+    def responses(self, t, r, l, c, amplitude=1.0) -> dict:
+        """Degrau, impulso e resposta natural (vC, i) a partir de uma única consulta ao atlas.
+
+        Mesmas convenções de rlc_transient.step_response, impulse_response e
+        natural_response; útil quando a interface mostra as três curvas.
+        """
+        omega_n, zeta, l, amplitude, cos_mode, sin_mode = self._scaled_modes(t, r, l, c, amplitude)
+        current = amplitude / (l * omega_n) * sin_mode
+        return {
+            "step": (amplitude * (1 - cos_mode - zeta * sin_mode), current),
+            "impulse": (amplitude * omega_n * sin_mode, amplitude / l * (cos_mode - zeta * sin_mode)),
+            "natural": (amplitude * (cos_mode + zeta * sin_mode), -current),
+        }
+
+    def step_response(self, t, r, l, c, amplitude=1.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Degrau no RLC série (vC, i)"""
+        return self.responses(t, r, l, c, amplitude)["step"]
+
+    def impulse_response(self, t, r, l, c, amplitude=1.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Impulso de tensão no RLC série (vC, i)"""
+        return self.responses(t, r, l, c, amplitude)["impulse"]
+
+    def natural_response(self, t, r, l, c, amplitude=1.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Descarga livre com vC(0) = amplitude (vC, i)"""
+        return self.responses(t, r, l, c, amplitude)["natural"]
+
+@lru_cache(maxsize=1)
+def get_atlas(path: str = ATLAS_PATH) -> ResponseAtlas:
+    """Atlas compartilhado: carrega do disco ou constrói (e tenta gravar) na primeira chamada"""
+    try:
+        return ResponseAtlas.load(path)
+    except (OSError, ValueError, KeyError):
+        pass
+    try:
+        return ResponseAtlas.build(path)
+    except OSError:
+        # Diretório somente leitura (ex.: deploy online): mantém o atlas só em memória
+        return ResponseAtlas.build()
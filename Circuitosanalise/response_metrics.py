@@ -0,0 +1,155 @@
+# Módulo de pontos característicos das respostas do RLC série
+# Banda de -3 dB, Q, ganho de pico, sobressinal, tempo de subida e de acomodação, vetorizados em (R, L, C)
+
+import numpy as np
+from typing import Callable, Dict, Tuple
+
+import rlc_transient
+
+def bracketed_root(func: Callable[..., np.ndarray], lower, upper, args: Tuple = (),
+                   iterations: int = 100, rtol: float = 1e-11) -> np.ndarray:
+    """Raiz de func(x, *args) em [lower, upper] por regula falsi (Illinois), vetorizada.
+
+    `lower`, `upper` e cada array de `args` são combinados por broadcast;
+    cada elemento precisa de um intervalo com troca de sinal. Só os elementos
+    ainda não convergidos são reavaliados a cada iteração. Elementos sem
+    troca de sinal retornam NaN.
+    """
+    arrays = np.broadcast_arrays(np.asarray(lower, dtype=float), np.asarray(upper, dtype=float),
+                                 *(np.asarray(arg, dtype=float) for arg in args))
+    shape = arrays[0].shape
+    a, b = (array.ravel().copy() for array in arrays[:2])
+    params = [array.ravel() for array in arrays[2:]]
+    fa, fb = func(a, *params), func(b, *params)
+    root = np.where(fa == 0, a, np.where(fb == 0, b, np.nan))
+    active = np.nonzero((np.sign(fa) * np.sign(fb) < 0))[0]
+    a, b, fa, fb = a[active], b[active], fa[active], fb[active]
+    params = [param[active] for param in params]
+    side = np.zeros(len(active), dtype=int)
+
+    for _ in range(iterations):
+        if not len(active):
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = b - fb * (b - a) / (fb - fa)
+        x = np.where((x > np.minimum(a, b)) & (x < np.maximum(a, b)), x, 0.5 * (a + b))
+        fx = func(x, *params)
+        left = np.sign(fx) == np.sign(fa)
+        # Illinois: reduz à metade o valor do extremo que ficou parado duas vezes
+        fb = np.where(left & (side == 1), fb / 2, fb)
+        fa = np.where(~left & (side == -1), fa / 2, fa)
+        a, fa = np.where(left, x, a), np.where(left, fx, fa)
+        b, fb = np.where(left, b, x), np.where(left, fb, fx)
+        side = np.where(left, 1, -1)
+
+        done = (fx == 0) | (np.abs(b - a) <= rtol * np.maximum(np.abs(a), np.abs(b)))
+        root[active[done]] = x[done]
+        keep = ~done
+        active, a, b, fa, fb, side = active[keep], a[keep], b[keep], fa[keep], fb[keep], side[keep]
+        params = [param[keep] for param in params]
+    root[active] = 0.5 * (a + b)
+    return root.reshape(shape)
+
+def _step_error(tau: np.ndarray, zeta: np.ndarray) -> np.ndarray:
+    """Erro normalizado vC(τ) − 1 do degrau unitário, τ = ωₙ·t"""
+    cos_mode, sin_mode = rlc_transient.normalized_modes(zeta, tau)
+    return -(cos_mode + zeta * sin_mode)
+
+def _monotone_bracket(zeta: np.ndarray, target: float) -> np.ndarray:
+    """Limite superior τ com erro do degrau ≥ target, dobrando o intervalo (respostas monótonas)"""
+    # Estimativa inicial pelo polo lento |s₁| = 1/(ζ + √(ζ² − 1)) (normalizado)
+    slow = 1 / (zeta + np.sqrt(np.maximum(zeta**2 - 1, 0.0)))
+    upper = np.maximum(1.0, np.log(1 / abs(target)) / slow)
+    for _ in range(200):
+        below = _step_error(upper, zeta) < target
+        if not below.any():
+            break
+        upper = np.where(below, 2 * upper, upper)
+    return upper
+
+def step_metrics(r, l, c, settling_band: float = 0.02) -> Dict[str, np.ndarray]:
+    """Sobressinal [%], tempo de pico, subida (10–90 %) e acomodação [s] do degrau em vC.
+
+    Os tempos são obtidos no domínio normalizado τ = ωₙ·t (dependem só de ζ)
+    e reescalados por 1/ωₙ. Para ζ < 1 os extremos do erro ocorrem em
+    τₖ = kπ/√(1−ζ²) com |erro| = e^{-ζτₖ}, o que dá intervalos exatos para
+    o último cruzamento da faixa de acomodação; para ζ ≥ 1 a resposta é
+    monótona e o intervalo é expandido até conter o cruzamento.
+    """
+    omega_n, zeta = rlc_transient.damping_parameters(r, l, c)
+    omega_n, zeta = np.broadcast_arrays(omega_n, zeta)
+    under = zeta < 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        damped = np.sqrt(np.where(under, 1 - zeta**2, 1.0))
+        peak_tau = np.where(under, np.pi / damped, np.inf)
+        overshoot = np.where(under, np.exp(-np.pi * zeta / damped), 0.0)
+
+    monotone_upper = _monotone_bracket(zeta, -settling_band)
+    rise_upper = np.where(under, peak_tau, monotone_upper)
+    t10 = bracketed_root(lambda tau, z: _step_error(tau, z) + 0.9, 0.0, rise_upper, args=(zeta,))
+    t90 = bracketed_root(lambda tau, z: _step_error(tau, z) + 0.1, 0.0, rise_upper, args=(zeta,))
+
+    # Último extremo fora da faixa: k = ⌊ln(1/faixa)·√(1−ζ²)/(πζ)⌋
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = np.floor(np.log(1 / settling_band) * damped / (np.pi * zeta))
+        k = np.where(under & np.isfinite(k), k, 0)
+        settle_lower = np.where(under, k * peak_tau, 0.0)
+        settle_upper = np.where(under, (k + 1) * peak_tau, monotone_upper)
+    settling = bracketed_root(lambda tau, z: np.abs(_step_error(tau, z)) - settling_band,
+                              settle_lower, settle_upper, args=(zeta,))
+    # ζ = 0: oscilação sem amortecimento nunca acomoda
+    settling = np.where(zeta > 0, settling, np.inf)
+
+    return {
+        'overshoot_pct': 100 * overshoot,
+        'peak_time': peak_tau / omega_n,
+        'rise_time': (t90 - t10) / omega_n,
+        'settling_time': settling / omega_n,
+    }
+
+def frequency_metrics(r, l, c) -> Dict[str, np.ndarray]:
+    """Pontos característicos em frequência [Hz] do RLC série.
+
+    Admitância Y = I/V (passa-faixa): f₀, ganho de pico 1/R, frequências
+    de -3 dB, banda e Q = f₀/banda. Tensão no capacitor H = Vc/V
+    (passa-baixa): frequência e ganho do pico e banda de -3 dB em relação
+    ao ganho DC. Os cruzamentos de -3 dB são raízes de |H|² − alvo em
+    intervalos delimitados pelo pico.
+    """
+    r, l, c = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (r, l, c)))
+    omega_n, zeta = rlc_transient.damping_parameters(r, l, c)
+    f0 = omega_n / (2 * np.pi)
+
+    # Admitância normalizada: |Y·R|² = 1 / (1 + (u − 1/u)²/(2ζ)²), u = ω/ωₙ
+    def admittance_db3(u, z):
+        return (u - 1 / u) ** 2 - 4 * z**2
+    # As raízes são ∓ζ + √(ζ² + 1): ficam em [1/(2ζ + 2), 1] e [1, 2ζ + 2]
+    upper_bound = 2 * zeta + 2
+    u_low = bracketed_root(admittance_db3, 1 / upper_bound, 1.0, args=(zeta,))
+    u_high = bracketed_root(admittance_db3, 1.0, upper_bound, args=(zeta,))
+    bandwidth = (u_high - u_low) * f0
+
+    # Passa-baixa: |H|⁻² = (1 − u²)² + (2ζu)²
+    def lowpass_inverse(u, z):
+        return (1 - u**2) ** 2 + (2 * z * u) ** 2
+    resonant = zeta < 1 / np.sqrt(2)
+    u_peak = np.sqrt(np.where(resonant, 1 - 2 * zeta**2, 0.0))
+    u_cut = bracketed_root(lambda u, z: lowpass_inverse(u, z) - 2, u_peak, 2.0, args=(zeta,))
+
+    with np.errstate(divide='ignore'):
+        lowpass_peak = 1 / np.sqrt(lowpass_inverse(u_peak, zeta))
+        return {
+            'f0': f0,
+            'peak_admittance': 1 / r,
+            'f_low': u_low * f0,
+            'f_high': u_high * f0,
+            'bandwidth': bandwidth,
+            'q_factor': f0 / bandwidth,
+            'vc_peak_frequency': u_peak * f0,
+            'vc_peak_gain_db': 20 * np.log10(lowpass_peak),
+            'vc_bandwidth': u_cut * f0,
+        }
+
+def characteristic_points(r, l, c) -> Dict[str, np.ndarray]:
+    """Todos os pontos característicos (frequência e degrau) para lotes de (R, L, C)"""
+    return {**frequency_metrics(r, l, c), **step_metrics(r, l, c)}
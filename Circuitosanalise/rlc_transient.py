@@ -0,0 +1,138 @@
+# Módulo de respostas transitórias em forma fechada do RLC série
+# Avalia degrau, impulso e resposta natural para vetores de (R, L, C, amplitude) de uma vez
+
+import math
+import numpy as np
+from typing import Tuple
+
+# Abaixo deste |β²·t²| usa-se a série de Taylor (ramo quase crítico)
+SERIES_THRESHOLD = 1.0
+SERIES_TERMS = 9
+
+def damping_parameters(r, l, c) -> Tuple[np.ndarray, np.ndarray]:
+    """Frequência natural ωₙ = 1/√(LC) e fator de amortecimento ζ = R/2·√(C/L)"""
+    r, l, c = (np.asarray(x, dtype=float) for x in (r, l, c))
+    return 1.0 / np.sqrt(l * c), r / 2.0 * np.sqrt(c / l)
+
+def response_regime(zeta, tolerance: float = 1e-6):
+    """Classifica o regime de amortecimento com tolerância em torno de ζ = 1"""
+    zeta = np.asarray(zeta, dtype=float)
+    labels = np.where(zeta < 1 - tolerance, "Subamortecido",
+                      np.where(zeta > 1 + tolerance, "Superamortecido", "Criticamente Amortecido"))
+    return labels if labels.ndim else str(labels)
+
+def _modal_terms(t: np.ndarray, alpha: np.ndarray, beta2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Retorna e^{-αt}·cos(βt) e e^{-αt}·sin(βt)/β para β² de qualquer sinal.
+
+    β² > 0: subamortecido; β² < 0: superamortecido (cosh/sinh, calculados
+    como soma de exponenciais estáveis); |β²·t²| pequeno: série de Taylor,
+    contínua em ζ = 1 e sem divisão por β ≈ 0.
+    """
+    q = beta2 * t * t
+    beta = np.sqrt(np.abs(beta2))
+    near = np.abs(q) < SERIES_THRESHOLD
+
+    # Série: cos = Σ (−q)^k/(2k)!, sin/β = t·Σ (−q)^k/(2k+1)!
+    cos_series = np.zeros_like(q)
+    sin_series = np.zeros_like(q)
+    for k in range(SERIES_TERMS, -1, -1):
+        cos_series = cos_series * -q + 1.0 / math.factorial(2 * k)
+        sin_series = sin_series * -q + 1.0 / math.factorial(2 * k + 1)
+    decay = np.exp(-alpha * t)
+    cos_term = decay * cos_series
+    sin_term = decay * t * sin_series
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        under = ~near & (beta2 > 0)
+        cos_term = np.where(under, decay * np.cos(beta * t), cos_term)
+        sin_term = np.where(under, decay * np.sin(beta * t) / beta, sin_term)
+
+        # s₁ = −α + |β| calculado sem cancelamento: −ωₙ²/(α + |β|)
+        over = ~near & (beta2 < 0)
+        s1 = -(beta2 + alpha * alpha) / (alpha + beta)
+        s2 = -alpha - beta
+        e1, e2 = np.exp(s1 * t), np.exp(s2 * t)
+        cos_term = np.where(over, 0.5 * (e1 + e2), cos_term)
+        sin_term = np.where(over, (e1 - e2) / (2 * beta), sin_term)
+
+    return cos_term, sin_term
+
+def normalized_modes(zeta, tau) -> Tuple[np.ndarray, np.ndarray]:
+    """Modos normalizados (ωₙ = 1) em função de ζ e τ = ωₙ·t (broadcast).
+
+    Toda resposta do RLC série é combinação destes dois termos; com
+    α = ζ·ωₙ vale e^{-αt}·cos(βt) = c(ζ, τ) e e^{-αt}·sin(βt)/β = s(ζ, τ)/ωₙ.
+    """
+    zeta, tau = np.broadcast_arrays(np.asarray(zeta, dtype=float), np.asarray(tau, dtype=float))
+    return _modal_terms(tau, zeta, 1.0 - zeta * zeta)
+
+def _prepare(t, r, l, c, amplitude):
+    """Converte parâmetros para arrays com um eixo final de tempo (broadcast)"""
+    r, l, c, amplitude = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (r, l, c, amplitude)))
+    t = np.asarray(t, dtype=float)
+    expand = (...,) + (None,) * t.ndim
+    r, l, c, amplitude = r[expand], l[expand], c[expand], amplitude[expand]
+    alpha = r / (2 * l)
+    omega_n2 = 1.0 / (l * c)
+    beta2 = omega_n2 - alpha * alpha
+    return t, l, c, amplitude, alpha, beta2
+
+def step_response(t, r, l, c, amplitude=1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Degrau de tensão no RLC série partindo do repouso: retorna (vC, i).
+
+    Os parâmetros podem ser escalares ou arrays (broadcast); o resultado tem
+    forma (forma dos parâmetros) + (forma de t).
+    """
+    t, l, c, amplitude, alpha, beta2 = _prepare(t, r, l, c, amplitude)
+    cos_term, sin_term = _modal_terms(t, alpha, beta2)
+    vc = amplitude * (1 - cos_term - alpha * sin_term)
+    current = amplitude / l * sin_term
+    return vc, current
+
+def impulse_response(t, r, l, c, amplitude=1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Impulso de tensão de área `amplitude` (V·s) no RLC série: retorna (vC, i)"""
+    t, l, c, amplitude, alpha, beta2 = _prepare(t, r, l, c, amplitude)
+    cos_term, sin_term = _modal_terms(t, alpha, beta2)
+    vc = amplitude / (l * c) * sin_term
+    current = amplitude / l * (cos_term - alpha * sin_term)
+    return vc, current
+
+def natural_response(t, r, l, c, amplitude=1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Descarga livre com vC(0) = amplitude e i(0) = 0: retorna (vC, i)"""
+    t, l, c, amplitude, alpha, beta2 = _prepare(t, r, l, c, amplitude)
+    cos_term, sin_term = _modal_terms(t, alpha, beta2)
+    vc = amplitude * (cos_term + alpha * sin_term)
+    current = -amplitude / l * sin_term
+    return vc, current
+
+def benchmark(circuits: int = 200, points: int = 2000) -> dict:
+    """Compara o tempo do motor vetorizado com scipy.signal.step/impulse por circuito"""
+    import time
+    import scipy.signal as signal
+
+    rng = np.random.default_rng(0)
+    r = rng.uniform(1, 200, circuits)
+    l = rng.uniform(1e-3, 1e-1, circuits)
+    c = rng.uniform(1e-6, 1e-3, circuits)
+    t = np.linspace(0, 0.1, points)
+
+    start = time.perf_counter()
+    step_response(t, r, l, c)
+    impulse_response(t, r, l, c)
+    engine_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for ri, li, ci in zip(r, l, c):
+        system = signal.TransferFunction([1 / (li * ci)], [1, ri / li, 1 / (li * ci)])
+        signal.step(system, T=t)
+        signal.impulse(system, T=t)
+    scipy_time = time.perf_counter() - start
+
+    return {'circuits': circuits, 'points': points, 'engine_s': engine_time,
+            'scipy_s': scipy_time, 'speedup': scipy_time / engine_time}
+
+if __name__ == "__main__":
+    result = benchmark()
+    print(f"⚡ {result['circuits']} circuitos × {result['points']} pontos: "
+          f"motor {result['engine_s']*1000:.1f} ms, scipy {result['scipy_s']*1000:.1f} ms "
+          f"({result['speedup']:.0f}× mais rápido)")
@@ -0,0 +1,121 @@
+# Módulo de simulação por espaço de estados com discretização exata
+# Circuito RLC série: estados x = [vC, iL], entrada v(t), saída vC
+
+import numpy as np
+import scipy.signal as signal
+from functools import lru_cache
+from scipy.linalg import expm
+from typing import Tuple
+
+HOLD_METHODS = ("zoh", "foh")
+
+def series_rlc_matrices(r: float, l: float, c: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Matrizes contínuas A e B do RLC série (dvC/dt = iL/C, diL/dt = (v − R·iL − vC)/L)"""
+    A = np.array([[0.0, 1.0 / c],
+                  [-1.0 / l, -r / l]])
+    B = np.array([[0.0], [1.0 / l]])
+    return A, B
+
+@lru_cache(maxsize=256)
+def discretize(r: float, l: float, c: float, dt: float,
+               method: str = "zoh") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Matrizes discretas exatas (Φ, Γ, D) via exponencial de matriz, com cache por parâmetros.
+
+    O sistema discreto é ξ[k+1] = Φ·ξ[k] + Γ·u[k], x[k] = ξ[k] + D·u[k].
+    Para ZOH (entrada constante entre amostras) D = 0 e ξ = x. Para FOH
+    (entrada linear entre amostras) o termo de u[k+1] é absorvido em D.
+    """
+    if method not in HOLD_METHODS:
+        raise ValueError(f"Método de discretização inválido: {method}")
+    A, B = series_rlc_matrices(r, l, c)
+    n, m = B.shape
+
+    if method == "zoh":
+        M = np.zeros((n + m, n + m))
+        M[:n, :n], M[:n, n:] = A, B
+        E = expm(M * dt)
+        return E[:n, :n], E[:n, n:], np.zeros((n, m))
+
+    M = np.zeros((n + 2 * m, n + 2 * m))
+    M[:n, :n], M[:n, n:n + m] = A, B
+    M[n:n + m, n + m:] = np.eye(m) / dt
+    E = expm(M * dt)
+    phi, gamma1, gamma2 = E[:n, :n], E[:n, n:n + m], E[:n, n + m:]
+    # x[k+1] = Φx[k] + (Γ1 − Γ2)u[k] + Γ2·u[k+1]  ->  ξ = x − Γ2·u
+    return phi, phi @ gamma2 + gamma1 - gamma2, gamma2
+
+@lru_cache(maxsize=256)
+def _filter_coefficients(r: float, l: float, c: float, dt: float, method: str):
+    """Coeficientes (b, a) de lfilter para cada estado, com cache por parâmetros"""
+    phi, gamma, d = discretize(r, l, c, dt, method)
+    num, den = signal.ss2tf(phi, gamma, np.eye(2), d)
+    return num, den
+
+def _initial_filter_state(phi: np.ndarray, x0: np.ndarray, den: np.ndarray, row: int) -> np.ndarray:
+    """Estado zi do lfilter que reproduz a resposta livre Φ^k·x0 da saída `row`"""
+    order = len(den) - 1
+    free = np.empty(order)
+    state = x0.copy()
+    for k in range(order):
+        free[k] = state[row]
+        state = phi @ state
+    zi = np.empty(order)
+    for j in range(order):
+        zi[j] = free[j] + np.dot(den[1:j + 1], free[j - 1::-1][:j]) if j else free[0]
+    return zi
+
+def simulate(u: np.ndarray, dt: float, r: float, l: float, c: float,
+             x0: Tuple[float, float] = (0.0, 0.0), method: str = "zoh") -> Tuple[np.ndarray, np.ndarray]:
+    """Simula o RLC série para uma entrada amostrada arbitrária em O(N).
+
+    Retorna (vC, iL) nos instantes k·dt. As matrizes discretas são calculadas
+    uma vez por (R, L, C, dt, método); a recorrência roda em C via lfilter.
+    """
+    u = np.asarray(u, dtype=float)
+    phi, gamma, d = discretize(r, l, c, dt, method)
+    num, den = _filter_coefficients(r, l, c, dt, method)
+    # ξ0 = x0 − D·u[0]
+    xi0 = np.asarray(x0, dtype=float) - d[:, 0] * (u[0] if len(u) else 0.0)
+
+    states = []
+    for row in range(2):
+        zi = _initial_filter_state(phi, xi0, den, row)
+        y, _ = signal.lfilter(num[row], den, u, zi=zi)
+        states.append(y)
+    return states[0], states[1]
+
+@lru_cache(maxsize=64)
+def _cached_response(kind: str, r: float, l: float, c: float, t_stop: float, points: int,
+                     amplitude: float, frequency: float, phase: float, method: str):
+    t = np.linspace(0, t_stop, points)
+    dt = t[1] - t[0]
+    _, B = series_rlc_matrices(r, l, c)
+    if kind == "step":
+        vc, il = simulate(np.full(points, amplitude), dt, r, l, c, method="zoh")
+    elif kind == "impulse":
+        # Impulso de área `amplitude`: salto do estado para amplitude·B em t = 0⁺
+        vc, il = simulate(np.zeros(points), dt, r, l, c, x0=tuple(amplitude * B[:, 0]))
+    elif kind == "sine":
+        u = amplitude * np.sin(2 * np.pi * frequency * t + phase)
+        vc, il = simulate(u, dt, r, l, c, method=method)
+    else:
+        raise ValueError(f"Tipo de resposta inválido: {kind}")
+    for array in (t, vc, il):
+        array.setflags(write=False)
+    return t, vc, il
+
+def step_response(r: float, l: float, c: float, t_stop: float, points: int = 2000,
+                  amplitude: float = 1.0):
+    """Resposta ao degrau (t, vC, iL), exata nas amostras e em cache por parâmetros"""
+    return _cached_response("step", r, l, c, t_stop, points, amplitude, 0.0, 0.0, "zoh")
+
+def impulse_response(r: float, l: float, c: float, t_stop: float, points: int = 2000,
+                     amplitude: float = 1.0):
+    """Resposta ao impulso (t, vC, iL), exata nas amostras e em cache por parâmetros"""
+    return _cached_response("impulse", r, l, c, t_stop, points, amplitude, 0.0, 0.0, "zoh")
+
+def switched_sine_response(r: float, l: float, c: float, t_stop: float, frequency: float,
+                           points: int = 2000, amplitude: float = 1.0, phase: float = 0.0,
+                           method: str = "foh"):
+    """Resposta a uma senoide ligada em t = 0 (t, vC, iL), em cache por parâmetros"""
+    return _cached_response("sine", r, l, c, t_stop, points, amplitude, frequency, phase, method)
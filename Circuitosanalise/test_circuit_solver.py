@@ -0,0 +1,663 @@
+"""
+Testes do solver nodal (MNA) do construtor de circuitos
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+
+import harmonic_balance
+import harmonic_flow
+import modal_analysis
+import model_reduction
+import monte_carlo
+import netlist_analysis
+import noise_analysis
+import power_flow
+import nonlinear_solver
+import resistive_grid
+import three_phase
+
+from circuit_editor import CircuitBuilder, ComponentType
+from circuit_solver import CircuitSolver, IncrementalSolver, Netlist, SWITCH_ON_RESISTANCE, build_netlist, expand_lines
+from device_models import THERMAL_VOLTAGE, saturable_flux
+from transmission_line import voltage_profile
+from transient_solver import SwitchEvent, TransientSimulator
+
+def make_divider_builder():
+    """Divisor resistivo 12 V com 1 kΩ e 2 kΩ desenhado no construtor"""
+    builder = CircuitBuilder()
+    v1 = builder.add_component(ComponentType.VOLTAGE_SOURCE, 100, 100, 12.0, "V")
+    r1 = builder.add_component(ComponentType.RESISTOR, 200, 100, 1.0, "kΩ")
+    r2 = builder.add_component(ComponentType.RESISTOR, 300, 100, 2000.0, "Ω")
+    gnd = builder.add_component(ComponentType.GROUND, 300, 300)
+    builder.connect_components(v1, r1, "terminal1", "terminal1")
+    builder.connect_components(r1, r2, "terminal2", "terminal1")
+    builder.connect_components(r2, gnd, "terminal2", "terminal1")
+    builder.connect_components(v1, gnd, "terminal2", "terminal1")
+    return builder, v1, r1, r2
+
+def make_ladder(sections: int) -> Netlist:
+    """Escada RLC gerada diretamente como netlist"""
+    netlist = Netlist(node_count=0)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 1.0, "V1")
+    for k in range(1, sections + 1):
+        netlist.add_element(ComponentType.RESISTOR, k, k + 1, 1.0, f"RS{k}")
+        netlist.add_element(ComponentType.RESISTOR, k + 1, 0, 100.0, f"RP{k}")
+        netlist.add_element(ComponentType.CAPACITOR, k + 1, 0, 1e-6, f"C{k}")
+        if k % 10 == 0:
+            netlist.add_element(ComponentType.INDUCTOR, k, k + 1, 1e-5, f"L{k}")
+    return netlist
+
+def test_divider_dc():
+    builder, v1, r1, r2 = make_divider_builder()
+    netlist = build_netlist(builder)
+    solution = CircuitSolver(netlist).solve()
+
+    assert netlist.node_count == 2
+    assert np.isclose(solution.element_voltage(r2), 8.0)
+    assert np.isclose(solution.element_current(r1), 4e-3)
+    # Corrente da fonte entra pelo terminal positivo (convenção SPICE)
+    assert np.isclose(solution.element_current(v1), -4e-3)
+    assert np.isclose(solution.power(r1).real, 16e-3)
+
+def test_incremental_matches_full_solve():
+    for frequency in (0.0, 1e3):
+        netlist = make_ladder(200)
+        solver = IncrementalSolver(netlist, frequency=frequency, max_updates=8)
+        rng = np.random.default_rng(1)
+        for step in range(20):
+            name = ["RS", "RP", "C", "L"][step % 4] + str(10 * rng.integers(1, 21))
+            solver.update_value(name, netlist.element(name).value * rng.uniform(0.5, 2.0))
+        solver.update_value("V1", 2.0)
+
+        reference = CircuitSolver(netlist).solve(frequency)
+        assert np.allclose(solver.solution().node_voltages, reference.node_voltages, atol=1e-10)
+        assert solver.refactor_count >= 2
+
+def test_incremental_repeated_edit_reuses_column():
+    netlist = make_ladder(50)
+    solver = IncrementalSolver(netlist)
+    for value in (2.0, 5.0, 1.0):
+        solver.update_value("RS3", value)
+    assert solver.update_count == 1
+    assert solver.refactor_count == 1
+    assert np.allclose(solver.solution().node_voltages, CircuitSolver(netlist).solve().node_voltages)
+
+def test_incremental_updates_saturable_inductor_and_diode():
+    # L₀ do indutor saturável entra na matriz como o indutor; o diodo (só cj) é refatorado
+    netlist = Netlist(node_count=3)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 10.0, "V")
+    netlist.add_element(ComponentType.RESISTOR, 1, 2, 10.0, "R")
+    netlist.add_element(ComponentType.SATURABLE_INDUCTOR, 2, 0, 1e-3, "L",
+                        parameters={"isat": 1.0, "ratio": 0.1})
+    netlist.add_element(ComponentType.DIODE, 2, 3, 1e-14, "D", parameters={"cj": 1e-6})
+    netlist.add_element(ComponentType.RESISTOR, 3, 0, 50.0, "RD")
+    solver = IncrementalSolver(netlist, frequency=1e3)
+    solver.update_value("L", 10e-3)
+    assert solver.update_count == 1
+    assert np.allclose(solver.solution().node_voltages, CircuitSolver(netlist).solve(1e3).node_voltages)
+    netlist.element("D").parameters["cj"] = 2e-6
+    solver.update_value("D", 1e-13)
+    assert solver.refactor_count == 2
+    assert np.allclose(solver.solution().node_voltages, CircuitSolver(netlist).solve(1e3).node_voltages)
+
+def test_netlist_monte_carlo_matches_per_sample_solves():
+    netlist = make_ladder(12)
+    tolerances = {"RS3": 0.05, "RP7": 0.1, "C5": 0.2, "L10": 0.1}
+    samples = monte_carlo.netlist_monte_carlo(netlist, tolerances, frequency=2e3, observe_nodes=[6, 13],
+                                              n=40, seed=7, chunk=15)
+    assert samples["V13"].shape == (40,)
+
+    # Repete o sorteio de cada bloco e resolve amostra a amostra
+    offset = 0
+    for size, seed in zip((15, 15, 10), np.random.SeedSequence(7).spawn(3)):
+        rng = np.random.default_rng(seed)
+        values = {name: monte_carlo.sample_values(netlist.element(name).value, tolerance, size, rng)
+                  for name, tolerance in tolerances.items()}
+        for k in range(size):
+            trial = make_ladder(12)
+            for name in tolerances:
+                trial.element(name).value = values[name][k]
+            reference = CircuitSolver(trial).solve(2e3)
+            assert np.isclose(samples["V6"][offset + k], reference.node_voltages[6], rtol=1e-9)
+            assert np.isclose(samples["V13"][offset + k], reference.node_voltages[13], rtol=1e-9)
+        offset += size
+
+def test_adjoint_sensitivities_match_finite_differences():
+    def make():
+        netlist = make_ladder(10)
+        netlist.add_element(ComponentType.CURRENT_SOURCE, 0, 4, 0.02, "I1")
+        return netlist
+
+    outputs = [("node_voltage", 11), ("element_current", "RP5"), ("element_current", "C3"),
+               ("element_current", "L10"), ("power", "RS2")]
+    for frequency in (0.0, 5e3):
+        for kind, target in outputs:
+            sensitivities = netlist_analysis.adjoint_sensitivities(CircuitSolver(make()), kind, target, frequency)
+            assert len(sensitivities) == 33
+            assert abs(sensitivities[0].relative) >= abs(sensitivities[-1].relative)
+            for sensitivity in sensitivities:
+                step = 1e-6 * sensitivity.value
+                values = []
+                for sign in (1, -1):
+                    netlist = make()
+                    netlist.element(sensitivity.element_id).value += sign * step
+                    values.append(netlist_analysis.output_value(CircuitSolver(netlist), kind, target, frequency))
+                difference = (values[0] - values[1]) / (2 * step)
+                assert np.isclose(sensitivity.derivative, difference, rtol=1e-5, atol=1e-9)
+
+def test_port_equivalents_predict_loaded_response():
+    ports = [(3, 0), (7, 2), (11, 0)]
+    for frequency in (0.0, 5e3):
+        solver = CircuitSolver(make_ladder(10))
+        equivalents = netlist_analysis.port_equivalents(solver, ports, frequency)
+        impedances = netlist_analysis.port_impedance_matrix(solver, ports, frequency)
+        assert np.allclose(np.diag(impedances), [e.impedance for e in equivalents])
+        assert np.allclose(impedances, impedances.T)
+
+        for (node1, node2), equivalent in zip(ports, equivalents):
+            # Carga resistiva ligada à porta: I = V_th / (Z_th + R_L)
+            loaded = make_ladder(10)
+            loaded.add_element(ComponentType.RESISTOR, node1, node2, 33.0, "RL")
+            current = CircuitSolver(loaded).solve(frequency).element_current("RL")
+            assert np.isclose(current, equivalent.voltage / (equivalent.impedance + 33.0))
+            assert np.isclose(equivalent.current * equivalent.impedance, equivalent.voltage)
+
+def test_superposition_rows_match_single_source_solves():
+    def make():
+        netlist = make_ladder(10)
+        netlist.add_element(ComponentType.CURRENT_SOURCE, 0, 4, 0.02, "I1")
+        netlist.add_element(ComponentType.VOLTAGE_SOURCE, 9, 0, 0.5, "V2")
+        return netlist
+
+    for frequency in (0.0, 5e3):
+        result = netlist_analysis.superposition(CircuitSolver(make()), frequency)
+        assert result.sources == ["V1", "I1", "V2"]
+        assert result.contributions.shape == (3, 11 + len(make().elements))
+
+        full = CircuitSolver(make()).solve(frequency)
+        expected = np.concatenate((full.node_voltages[1:], list(full.branch_currents.values())))
+        assert np.allclose(result.total, expected)
+
+        for row, source in enumerate(result.sources):
+            alone = make()
+            for other in result.sources:
+                if other != source:
+                    alone.element(other).value = 0.0
+            single = CircuitSolver(alone).solve(frequency)
+            expected = np.concatenate((single.node_voltages[1:], list(single.branch_currents.values())))
+            assert np.allclose(result.contributions[row], expected)
+
+def test_fault_study_matches_dense_inverse_and_fault_element():
+    for frequency in (0.0, 60.0):
+        solver = CircuitSolver(make_ladder(30))
+        diagonal = netlist_analysis.impedance_diagonal(solver, frequency, block=7)
+        dense = np.linalg.inv(solver.system.matrix(frequency).toarray())
+        assert np.allclose(diagonal, np.diag(dense)[:31])
+
+        study = netlist_analysis.fault_study(solver, frequency, fault_impedance=0.5)
+        assert study.current[0] == study.prefault_voltage[0] / 0.5
+        for index in (4, 17, 30):
+            faulted = make_ladder(30)
+            faulted.add_element(ComponentType.RESISTOR, int(study.nodes[index]), 0, 0.5, "RF")
+            current = CircuitSolver(faulted).solve(frequency).element_current("RF")
+            assert np.isclose(study.current[index], current)
+        assert np.all(np.diff(np.abs(study.current[study.ranking()])) <= 0)
+
+def test_prima_reduced_model_tracks_full_model():
+    netlist = make_ladder(60)
+    frequencies = np.logspace(1, 5, 60)
+    full = model_reduction.full_transfer(netlist, frequencies, [20, 61], ["V1"])
+    errors = []
+    for order in (10, 20):
+        model = model_reduction.prima(netlist, order, [20, 61], expansion_frequency=1e3)
+        error = np.abs(model.transfer(frequencies) - full).max() / np.abs(full).max()
+        # A estimativa (diferença para um bloco a menos) não subestima o erro real
+        assert model.error_estimate(frequencies).max() >= error
+        errors.append(error)
+    assert errors[1] < 1e-3 < errors[0]
+
+    # Congruência preserva a passividade: G + Gᵀ ≥ 0 e C simétrica ≥ 0
+    assert np.linalg.eigvalsh(model.G + model.G.T).min() > -1e-9
+    assert np.allclose(model.C, model.C.T) and np.linalg.eigvalsh(model.C).min() > -1e-12
+
+    t = np.linspace(0, 0.01, 4001)
+    reduced = model.simulate(t, np.ones(len(t)))
+    reference = TransientSimulator(netlist, reltol=1e-6).run(0.01)
+    for column, node in enumerate((20, 61)):
+        assert np.allclose(reduced[:, column], np.interp(t, reference.time, reference.node_voltage(node)),
+                           atol=1e-3)
+
+def make_line_netlist(parameters: dict, length: float = 1000.0) -> Netlist:
+    """Fonte 1 V com 50 Ω alimentando uma linha terminada em 50 Ω"""
+    netlist = Netlist(node_count=0)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 1.0, "V1")
+    netlist.add_element(ComponentType.RESISTOR, 1, 2, 50.0, "RS")
+    netlist.add_element(ComponentType.TRANSMISSION_LINE, 2, 3, length, "TL", parameters=parameters)
+    netlist.add_element(ComponentType.RESISTOR, 3, 0, 50.0, "RL")
+    return netlist
+
+def test_transmission_line_matches_explicit_ladder():
+    for parameters in ({"r": 0.05, "l": 2.5e-7, "c": 1e-10, "g": 1e-9, "segments": 40},
+                       {"r": 0.0, "l": 2.5e-7, "c": 1e-10, "segments": 25}):
+        netlist = make_line_netlist(parameters)
+        ladder = expand_lines(netlist)
+        assert ladder.node_count > 3
+        for frequency in (0.0, 1e5, 3e6):
+            line = CircuitSolver(netlist, gmin=0.0).solve(frequency)
+            explicit = CircuitSolver(ladder, gmin=0.0).solve(frequency)
+            assert np.allclose(line.node_voltages, explicit.node_voltages[:4], atol=1e-12)
+            first = "TL.1.R" if parameters["r"] else "TL.1.L"
+            assert np.isclose(line.element_current("TL"), explicit.element_current(first))
+
+            # Perfil em forma fechada = tensões nos nós da escada (ordem de criação)
+            _, profile = voltage_profile(parameters, 1000.0, frequency, line.node_voltage(2), line.node_voltage(3))
+            internal = [k for k, name in ladder.node_names.items() if name.startswith("TL.") and "m" not in name]
+            assert np.allclose(profile[1:-1], explicit.node_voltages[internal], atol=1e-12)
+
+    # Escada de 100 000 seções: O(1) por frequência e converge para a linha distribuída
+    distributed = {"r": 0.01, "l": 2.5e-7, "c": 1e-10}
+    for frequency in (1e5, 3e6):
+        exact = CircuitSolver(make_line_netlist(distributed)).solve(frequency).node_voltage(3)
+        fine = CircuitSolver(make_line_netlist({**distributed, "segments": 100_000})).solve(frequency)
+        assert abs(fine.node_voltage(3) - exact) < 1e-5
+
+def test_resistive_grid_pcg_matches_nodal_solver():
+    # Malha 40 × 40 com resistências aleatórias, fonte de tensão num canto, carga e hastes ao terra
+    rng = np.random.default_rng(3)
+    size = 40
+    netlist = Netlist(node_count=0)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 5.0, "V1")
+    netlist.add_element(ComponentType.CURRENT_SOURCE, 0, size * size // 2, -0.2, "I1")
+    for node in range(1, size * size + 1):
+        if node % size:
+            netlist.add_element(ComponentType.RESISTOR, node, node + 1, rng.uniform(0.5, 2.0))
+        if node + size <= size * size:
+            netlist.add_element(ComponentType.RESISTOR, node, node + size, rng.uniform(0.5, 2.0))
+        if node % 97 == 0:
+            netlist.add_element(ComponentType.RESISTOR, node, 0, 50.0)
+    expected = CircuitSolver(netlist).solve().node_voltages
+
+    network = resistive_grid.network_from_netlist(netlist)
+    assert network.fixed == {1: 5.0}
+    for kind in resistive_grid.PRECONDITIONERS:
+        solution = resistive_grid.GridSolver(network, kind, rtol=1e-12).solve()
+        assert solution.converged and np.allclose(solution.voltages, expected, atol=1e-9)
+        assert np.isclose(solution.source_currents()[1], -CircuitSolver(netlist).solve().element_current("V1"))
+
+    # Alteração pequena: mesma fatoração do pré-condicionador e partida a quente
+    solver = resistive_grid.GridSolver(network, "amg", rtol=1e-10)
+    assert len(resistive_grid.MultigridPreconditioner(solver.A).sizes) > 1
+    cold = solver.solve()
+    changed = [1500, 1501, 1502]
+    solver.update_conductances(changed, network.conductance[changed] * 1.05)
+    warm = solver.solve()
+    # Os resistores da rede seguem a ordem da netlist, depois de V1 e I1
+    for k in changed:
+        netlist.elements[k + 2].value /= 1.05
+    assert warm.iterations < cold.iterations
+    assert np.allclose(warm.voltages, CircuitSolver(netlist).solve().node_voltages, atol=1e-8)
+
+def test_modal_analysis_poles_zeros_and_sparse_shift_invert():
+    # RLC série: polos = raízes de LCs² + RCs + 1; V(L+C) tem zeros em ±j/√(LC)
+    r, l, c = 10.0, 0.01, 100e-6
+    netlist = Netlist(node_count=0)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 1.0, "V")
+    netlist.add_element(ComponentType.RESISTOR, 1, 2, r, "R")
+    netlist.add_element(ComponentType.INDUCTOR, 2, 3, l, "L")
+    netlist.add_element(ComponentType.CAPACITOR, 3, 0, c, "C")
+    poles = modal_analysis.poles(netlist)
+    assert np.allclose(np.sort_complex(poles), np.sort_complex(np.roots([l * c, r * c, 1])))
+    assert np.allclose(np.sort(modal_analysis.zeros(netlist, "V", 2).imag), [-1000.0, 1000.0])
+    assert np.allclose(modal_analysis.zeros(netlist, "V", "V"), 0.0, atol=1e-6)
+    (mode,) = modal_analysis.natural_modes(poles)
+    assert np.isclose(mode.natural_frequency, 1 / (2 * np.pi * np.sqrt(l * c)))
+    assert np.isclose(mode.damping, r / 2 * np.sqrt(c / l))
+
+    # Deslocamento-inversão acha os mesmos polos que o QZ denso perto da faixa pedida
+    ladder = make_ladder(60)
+    for frequency in (0.0, 2e4):
+        dense = modal_analysis.natural_modes(modal_analysis.poles(ladder, 6, frequency))
+        sparse = modal_analysis.natural_modes(modal_analysis.poles(ladder, 6, frequency, dense_limit=0))
+        assert np.allclose([m.pole for m in sparse], [m.pole for m in dense])
+    dense = modal_analysis.zeros(ladder, "V1", 30, 4, 1e3)
+    sparse = modal_analysis.zeros(ladder, "V1", 30, 4, 1e3, dense_limit=0)
+    assert np.allclose(np.sort_complex(sparse), np.sort_complex(dense))
+
+def test_newton_operating_points_of_diode_and_transistors():
+    # Diodo em série com 1 kΩ: 5 − Iₛ·(e^{v/Vt} − 1)·R = v (bissecção escalar como referência)
+    netlist = Netlist(node_count=0)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 5.0, "V")
+    netlist.add_element(ComponentType.RESISTOR, 1, 2, 1000.0, "R")
+    netlist.add_element(ComponentType.DIODE, 2, 0, 1e-14, "D")
+    solution = nonlinear_solver.NonlinearSimulator(netlist).operating_point()
+    low, high = 0.0, 5.0
+    for _ in range(200):
+        v = (low + high) / 2
+        low, high = (v, high) if 5.0 - 1e-14 * np.expm1(v / THERMAL_VOLTAGE) * 1000.0 > v else (low, v)
+    assert np.isclose(solution.node_voltage(2), v, atol=1e-6)
+    assert np.isclose(solution.element_current("D"), solution.element_current("R"), rtol=1e-6)
+
+    # Emissor comum NPN (C, E, B) desenhado no construtor e o espelho PNP com fontes invertidas
+    for polarity in (1, -1):
+        builder = CircuitBuilder()
+        vcc = builder.add_component(ComponentType.VOLTAGE_SOURCE, 0, 0, 10.0 * polarity, "V")
+        rc = builder.add_component(ComponentType.RESISTOR, 0, 0, 1.0, "kΩ")
+        rb = builder.add_component(ComponentType.RESISTOR, 0, 0, 500.0, "kΩ")
+        q = builder.add_component(ComponentType.BJT, 0, 0, 100.0, "", {"polarity": polarity})
+        gnd = builder.add_component(ComponentType.GROUND, 0, 0)
+        builder.connect_components(vcc, rc, "terminal1", "terminal1")
+        builder.connect_components(vcc, rb, "terminal1", "terminal1")
+        builder.connect_components(rc, q, "terminal2", "terminal1")
+        builder.connect_components(rb, q, "terminal2", "terminal3")
+        builder.connect_components(q, gnd, "terminal2", "terminal1")
+        builder.connect_components(vcc, gnd, "terminal2", "terminal1")
+        netlist = build_netlist(builder)
+        solution = nonlinear_solver.NonlinearSimulator(netlist).operating_point()
+        ic, ib = solution.element_current(q), solution.element_current(rb)
+        assert np.isclose(ic / ib, 100.0, rtol=1e-6)
+        assert np.isclose(ic, solution.element_current(rc), rtol=1e-9)
+        assert 0.5 < polarity * (10.0 * polarity - 500e3 * ib) < 0.8
+
+    # MOSFET nível 1 saturado: I_D = β/2·(V_GS − V_T0)² = 4 mA, V_D = 5 − 500·I_D
+    netlist = Netlist(node_count=0)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 5.0, "VDD")
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 3, 0, 3.0, "VG")
+    netlist.add_element(ComponentType.RESISTOR, 1, 2, 500.0, "RD")
+    netlist.add_element(ComponentType.MOSFET, 2, 0, 2e-3, "M", parameters={"vto": 1.0}, node3=3)
+    solution = nonlinear_solver.NonlinearSimulator(netlist).operating_point()
+    assert np.isclose(solution.element_current("M"), 4e-3, rtol=1e-6)
+    assert np.isclose(solution.node_voltage(2), 3.0, rtol=1e-6)
+
+def test_newton_transient_reuses_jacobian_in_rectifier_and_pfc():
+    # Indutor saturável sob degrau de 1 V: φ(i(t)) = t (o trapézio integra a tensão constante exatamente)
+    netlist = Netlist(node_count=0)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 1.0, "V")
+    netlist.add_element(ComponentType.SATURABLE_INDUCTOR, 1, 0, 1e-3, "L",
+                        parameters={"isat": 1.0, "ratio": 0.1})
+    simulator = nonlinear_solver.NonlinearSimulator(netlist)
+    result = simulator.run(5e-3, 1e-5, initial_state=np.zeros(simulator.system.size))
+    current = result.element_current("L")
+    flux, _ = saturable_flux(current, 1e-3, 0.1, 1.0)
+    assert np.allclose(flux[1:], result.time[1:], rtol=1e-4)
+    assert current[-1] > 10.0
+
+    # Retificador em ponte: um ciclo de rede com menos de uma fatoração por passo
+    netlist, sources = nonlinear_solver.bridge_rectifier()
+    result = nonlinear_solver.NonlinearSimulator(netlist).run(1 / 60, 20e-6, sources)
+    assert result.rejected_steps == 0
+    assert result.factorizations_per_step < 0.5 and result.iterations_per_step < 6
+    assert 300.0 < result.node_voltage(3).max() < 311.0
+    line = result.element_current("Vac")
+    rectified = result.element_current("D1") + result.element_current("D2")
+    assert np.allclose(np.abs(line), rectified, atol=1e-3 * np.abs(line).max())
+
+    # PFC boost: o barramento passa da tensão retificada e o Newton segue barato nas comutações
+    netlist, sources = nonlinear_solver.boost_pfc(capacitance=10e-6)
+    result = nonlinear_solver.NonlinearSimulator(netlist).run(5e-4, 0.5e-6, sources)
+    assert result.factorizations_per_step < 1.0 and result.iterations_per_step < 6
+    assert result.node_voltage(6)[-1] > result.node_voltage(3)[-1]
+
+    # RC com diodo reverso e chave que abre em 1 ms e fecha em 2 ms: carga só com a chave fechada
+    netlist = Netlist(node_count=0)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 1.0, "V")
+    netlist.add_element(ComponentType.SWITCH, 1, 2, SWITCH_ON_RESISTANCE, "S")
+    netlist.add_element(ComponentType.RESISTOR, 2, 3, 1e3, "R")
+    netlist.add_element(ComponentType.CAPACITOR, 3, 0, 1e-6, "C")
+    netlist.add_element(ComponentType.DIODE, 0, 3, 1e-14, "D")
+    events = [SwitchEvent(1e-3, "S", False), SwitchEvent(2e-3, "S", True)]
+    simulator = nonlinear_solver.NonlinearSimulator(netlist)
+    result = simulator.run(3e-3, 7e-6, initial_state=np.zeros(simulator.system.size), switch_events=events)
+    on_time = np.minimum(result.time, 1e-3) + np.maximum(result.time - 2e-3, 0.0)
+    assert np.allclose(result.node_voltage(3), 1 - np.exp(-on_time / 1e-3), atol=1e-4)
+    assert np.isclose(result.time, 1e-3).any() and np.isclose(result.time, 2e-3).any()
+    assert not result.switch_closed("S")[np.argmin(np.abs(result.time - 1.5e-3))]
+
+def test_harmonic_balance_matches_ac_and_settled_transient():
+    # Circuito linear com fonte de fundamental + 3º harmônico: cada harmônico é a análise AC em k·f
+    netlist = Netlist(node_count=0)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 1.0, "V")
+    netlist.add_element(ComponentType.RESISTOR, 1, 2, 10.0, "R")
+    netlist.add_element(ComponentType.INDUCTOR, 2, 3, 10e-3, "L")
+    netlist.add_element(ComponentType.CAPACITOR, 3, 0, 100e-6, "C")
+    wave = {"V": lambda t: 10 * np.cos(2 * np.pi * 60 * t) + 3 * np.sin(2 * np.pi * 180 * t)}
+    solution = harmonic_balance.HarmonicBalanceSolver(netlist, 60.0, 5).solve(wave)
+    ac = CircuitSolver(netlist)
+    assert np.isclose(solution.node_phasors(3)[1], 10 * ac.solve(60.0).node_voltage(3))
+    assert np.isclose(solution.node_phasors(3)[3], -3j * ac.solve(180.0).node_voltage(3))
+    assert np.allclose(solution.node_phasors(3)[[0, 2, 4, 5]], 0.0, atol=1e-9)
+    assert solution.iterations == 1
+
+    # Retificador em ponte: fasores iguais aos do último ciclo de um transitório já assentado
+    netlist, sources = nonlinear_solver.bridge_rectifier(capacitance=100e-6, load=50.0)
+    solution = harmonic_balance.HarmonicBalanceSolver(netlist, 60.0, 40).solve(sources)
+    samples = 500
+    result = nonlinear_solver.NonlinearSimulator(netlist).run(3 / 60, 1 / 60 / samples, sources)
+    # Último período completo, começando em t = 2T (fase zero da fonte)
+    settled = harmonic_balance.to_phasors(result.element_current("Vac")[-samples - 1:-1], 7)
+    assert np.allclose(solution.element_current("Vac")[:8], settled, atol=0.02)
+    bus = harmonic_balance.to_phasors(result.node_voltage(3)[-samples - 1:-1], 0)
+    assert np.isclose(solution.node_phasors(3)[0].real, bus[0].real, rtol=2e-3)
+
+    # Balanço de potência e FP não senoidal: S² = P² + Q₁² + D², FP = P/S < cos φ₁
+    metrics = solution.power_metrics("Vac", delivered=True)
+    absorbed = sum(solution.power_metrics(e.id)["active"] for e in netlist.elements if e.id != "Vac")
+    assert np.isclose(metrics["active"], absorbed, rtol=1e-6)
+    assert np.isclose(metrics["apparent"] ** 2, metrics["active"] ** 2 + metrics["reactive"] ** 2
+                      + metrics["distortion"] ** 2)
+    assert metrics["power_factor"] < metrics["displacement_power_factor"] and metrics["thd_current"] > 0.3
+    t, current = solution.waveform(-solution.element_current("Vac"))
+    assert np.isclose(np.sqrt(np.mean(current ** 2)), metrics["current_rms"], rtol=1e-9)
+
+def test_harmonic_load_flow_matches_per_order_solves():
+    # Rede com indutância da fonte, carga RL, banco de capacitores e uma carga retificadora (fonte de corrente)
+    def network(source: float, injection: float) -> Netlist:
+        netlist = Netlist(node_count=0)
+        netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, source, "Vs")
+        netlist.add_element(ComponentType.INDUCTOR, 1, 2, 1e-3, "Ls")
+        netlist.add_element(ComponentType.RESISTOR, 2, 3, 0.2, "Rf")
+        netlist.add_element(ComponentType.INDUCTOR, 3, 4, 0.5e-3, "Lf")
+        netlist.add_element(ComponentType.RESISTOR, 4, 0, 20.0, "Rload")
+        netlist.add_element(ComponentType.CAPACITOR, 4, 0, 100e-6, "Cbank")
+        netlist.add_element(ComponentType.CURRENT_SOURCE, 4, 0, injection, "Irect")
+        return netlist
+
+    netlist = network(311.0, 10.0)
+    spectrum = harmonic_flow.pulse_spectrum(6, 25)
+    assert sorted(spectrum) == [5, 7, 11, 13, 17, 19, 23, 25]
+    flow = harmonic_flow.harmonic_load_flow(netlist, 60.0, {"Irect": spectrum})
+    assert list(flow.orders) == [1, 5, 7, 11, 13, 17, 19, 23, 25]
+
+    # Cada ordem: a fonte de tensão em curto e a de corrente com a amplitude do espectro
+    assert np.allclose(flow.order_voltages(1), CircuitSolver(netlist).solve(60.0).node_voltages[1:])
+    for order in (5, 13):
+        expected = CircuitSolver(network(0.0, 10.0 / order)).solve(60.0 * order).node_voltages[1:]
+        assert np.allclose(flow.order_voltages(order), expected)
+
+    individual = np.abs(flow.voltages[1:]) / np.abs(flow.voltages[0])
+    assert np.allclose(flow.thd, np.sqrt(np.sum(individual ** 2, axis=0)))
+    assert flow.thd[0] == 0.0 and flow.worst_nodes(1)[0] in (3, 4)
+
+    parallel = harmonic_flow.harmonic_load_flow(netlist, 60.0, {"Irect": spectrum}, max_order=13, workers=2)
+    assert list(parallel.orders) == [1, 5, 7, 11, 13]
+    assert np.allclose(parallel.voltages, flow.voltages[:5])
+
+def test_thermal_noise_adjoint_matches_closed_forms():
+    # RC passa-baixas: o ruído integrado em toda a faixa é kT/C, independente de R
+    netlist = Netlist(node_count=0)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 1.0, "V")
+    netlist.add_element(ComponentType.RESISTOR, 1, 2, 1e3, "R")
+    netlist.add_element(ComponentType.CAPACITOR, 2, 0, 1e-9, "C")
+    frequencies = np.logspace(0, 10, 2001)
+    result = noise_analysis.noise_analysis(netlist, 2, frequencies)
+    kt = noise_analysis.BOLTZMANN * noise_analysis.DEFAULT_TEMPERATURE
+    assert np.isclose(result.rms ** 2, kt / 1e-9, rtol=1e-3)
+    assert np.isclose(result.total_density[0], 4 * kt * 1e3, rtol=1e-6)
+
+    # Divisor em DC: cada resistor vê o outro em paralelo e o total é 4kT·(R1 ∥ R2)
+    builder, v1, r1, r2 = make_divider_builder()
+    netlist = build_netlist(builder)
+    result = noise_analysis.noise_analysis(netlist, 2, [0.0, 1e3, 1e6], workers=2)
+    parallel = 1e3 * 2e3 / 3e3
+    assert np.allclose(result.total_density, 4 * kt * parallel)
+    share = result.contributions[0] / result.total_density[0]
+    assert np.allclose(share[[result.element_ids.index(r1), result.element_ids.index(r2)]], [2 / 3, 1 / 3])
+    assert result.element_ids[result.ranking()[0]] == r1
+
+def test_three_phase_loads_and_symmetrical_components():
+    # Equilibrado 380 V: Y com Z = 22∠30° Ω, neutro sem corrente e P = √3·V_L·I·cos φ
+    phase = three_phase.balanced_set(380 / np.sqrt(3))
+    assert np.allclose(np.abs(three_phase.phase_to_line(phase)), 380.0)
+    assert np.allclose(three_phase.line_to_phase(three_phase.phase_to_line(phase)), phase)
+    z = 22 * np.exp(1j * np.radians(30))
+    wye = three_phase.wye_load(phase, [z, z, z])
+    assert np.allclose(wye.neutral_current, 0.0, atol=1e-12)
+    current = 380 / np.sqrt(3) / 22
+    assert np.isclose(wye.total_power.real, np.sqrt(3) * 380 * current * np.cos(np.radians(30)))
+    assert np.isclose(wye.power_factor, np.cos(np.radians(30)))
+    assert np.allclose(wye.voltage_sequence, [0, 380 / np.sqrt(3), 0], atol=1e-9)
+    # Δ com 3Z equivale ao Y com Z
+    delta = three_phase.delta_load(phase, 3 * np.array([z, z, z]))
+    assert np.allclose(delta.line_currents, wye.line_currents)
+    assert np.allclose(np.abs(delta.load_currents), current / np.sqrt(3))
+
+    # Fortescue: ida e volta, e um conjunto de sequência negativa só tem componente 2
+    rng = np.random.default_rng(3)
+    abc = rng.normal(size=(1000, 3)) + 1j * rng.normal(size=(1000, 3))
+    assert np.allclose(three_phase.phase_quantities(three_phase.symmetrical_components(abc)), abc)
+    negative = three_phase.symmetrical_components(three_phase.balanced_set(1.0, 10.0, "negative"))
+    assert np.allclose(negative, [0, 0, np.exp(1j * np.radians(10))])
+
+    # Desequilibrado e vetorizado (N × 3): Δ qualquer ≡ Y equivalente com neutro isolado; cada linha
+    # coincide com o cálculo isolado e a corrente de neutro é a soma das fases
+    impedances = rng.uniform(5, 50, (1000, 3)) * np.exp(1j * rng.uniform(-1, 1, (1000, 3)))
+    delta = three_phase.delta_load(phase, impedances)
+    floating = three_phase.wye_load(phase, three_phase.delta_to_wye(impedances), None)
+    assert np.allclose(delta.line_currents, floating.line_currents)
+    assert np.allclose(delta.total_power, floating.total_power)
+    assert np.allclose(floating.neutral_current, 0.0, atol=1e-9)
+    grounded = three_phase.wye_load(phase, impedances, 0.5)
+    single = three_phase.wye_load(phase, impedances[17], 0.5)
+    assert np.allclose(grounded.line_currents[17], single.line_currents)
+    assert np.allclose(grounded.neutral_current, grounded.line_currents.sum(axis=1))
+    assert np.allclose(grounded.neutral_voltage, 0.5 * grounded.neutral_current)
+    assert np.allclose(grounded.total_power + 0.5 * np.abs(grounded.neutral_current) ** 2,
+                       (phase * np.conj(grounded.line_currents)).sum(axis=1))
+    factors = grounded.current_unbalance
+    sequence = grounded.current_sequence
+    assert np.allclose(factors['negative'], np.abs(sequence[:, 2]) / np.abs(sequence[:, 1]))
+    assert np.allclose(three_phase.unbalance_factors(phase)['nema'], 0.0, atol=1e-12)
+
+def test_power_flow_newton_and_fast_decoupled():
+    f = 60.0
+    w = 2 * np.pi * f
+    # Fonte (pico) – R+L – barra de carga R||C: com cargas na Ybus o fluxo reproduz a análise AC (em eficaz)
+    netlist = Netlist(node_count=3)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 220 * np.sqrt(2), element_id="V1")
+    netlist.add_element(ComponentType.RESISTOR, 1, 2, 0.05, element_id="R1")
+    netlist.add_element(ComponentType.INDUCTOR, 2, 3, 2e-3, element_id="L1")
+    netlist.add_element(ComponentType.RESISTOR, 3, 0, 10.0, element_id="Rc")
+    netlist.add_element(ComponentType.INDUCTOR, 3, 0, 50e-3, element_id="Lc")
+    # O nó entre R1 e L1 é interno à série e some: as barras são os nós 1 e 3
+    expected = CircuitSolver(netlist).solve(f).node_voltages[1:] / np.sqrt(2)
+    case = power_flow.case_from_netlist(netlist, f, constant_power_loads=False)
+    result = power_flow.solve_power_flow(case)
+    assert list(case.nodes) == [1, 3] and "R1+L1" in case.branch_ids
+    assert np.allclose(result.voltages, expected[[0, 2]], rtol=1e-9)
+    assert np.isclose(result.losses, 0.05 * abs((expected[0] - expected[2]) / (0.05 + 1j * w * 2e-3)) ** 2 +
+                      1j * w * 2e-3 * abs((expected[0] - expected[2]) / (0.05 + 1j * w * 2e-3)) ** 2)
+
+    # Cargas de potência constante: desbalanço nulo nas barras PQ e |V| da barra PV mantido
+    netlist.add_element(ComponentType.INDUCTOR, 3, 4, 1e-3, element_id="L2")
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 4, 0, 225 * np.sqrt(2), element_id="G2")
+    case = power_flow.case_from_netlist(netlist, f, generation={"G2": 2000.0})
+    assert list(case.bus_types) == ["slack", "PQ", "PV"]
+    assert np.isclose(case.load[1], 220 ** 2 * (1 / 10.0 + 1 / (-1j * w * 50e-3)))
+    newton = power_flow.solve_power_flow(case)
+    decoupled = power_flow.solve_power_flow(case, method="fast_decoupled")
+    assert np.allclose(newton.voltages, decoupled.voltages, rtol=1e-6)
+    assert np.isclose(newton.injection[1], -case.load[1], atol=1e-5)
+    assert np.isclose(newton.magnitude[2], 225) and np.isclose(newton.source_power[2].real, 2000.0)
+    assert newton.iterations <= 6
+
+    # Correção do FP na tensão calculada da barra: C = (Q − P·tan φ)/(ω|V|²)
+    corrections = power_flow.power_factor_corrections(newton, f, 0.95)
+    load, v = case.load[1], newton.magnitude[1]
+    q = load.imag - load.real * np.tan(np.arccos(0.95))
+    assert list(corrections) == [3]
+    assert np.isclose(corrections[3]['capacitance_uF'], q / (w * v ** 2) * 1e6)
+
+    # Rede malhada de 2000 barras (árvore + laços) com cargas R||L em todas as barras
+    rng = np.random.default_rng(5)
+    n = 2000
+    grid = Netlist(node_count=n)
+    grid.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 13.8e3 * np.sqrt(2), element_id="S")
+    parents = [rng.integers(max(1, k - 20), k) for k in range(2, n + 1)]
+    links = list(zip(range(2, n + 1), parents)) + [tuple(rng.choice(n, 2, replace=False) + 1) for _ in range(n // 10)]
+    for k, (a, b) in enumerate(links):
+        grid.add_element(ComponentType.RESISTOR, a, n + 1 + k, 0.01, element_id=f"R{k}")
+        grid.add_element(ComponentType.INDUCTOR, n + 1 + k, b, 2e-4, element_id=f"L{k}")
+    for bus in range(2, n + 1):
+        grid.add_element(ComponentType.RESISTOR, bus, 0, rng.uniform(2e4, 1e5))
+        grid.add_element(ComponentType.INDUCTOR, bus, 0, rng.uniform(50, 200))
+    case = power_flow.case_from_netlist(grid, f)
+    newton = power_flow.solve_power_flow(case)
+    decoupled = power_flow.solve_power_flow(case, method="fast_decoupled")
+    loaded = case.load != 0
+    assert newton.iterations <= 8
+    assert np.allclose(newton.injection[loaded], -case.load[loaded], atol=1e-7 * np.abs(case.load).sum())
+    assert np.allclose(newton.voltages, decoupled.voltages, rtol=1e-6)
+    assert 0.9 < newton.magnitude.min() / 13.8e3 < 1.0
+
+    # Chave fechada para o terra e carga na barra em curto ficam na Ybus como impedância constante
+    shorted = Netlist(node_count=2)
+    shorted.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 311.0, element_id="V")
+    shorted.add_element(ComponentType.RESISTOR, 1, 2, 1.0, element_id="R")
+    shorted.add_element(ComponentType.CAPACITOR, 2, 0, 10e-6, element_id="C")
+    shorted.add_element(ComponentType.SWITCH, 2, 0, SWITCH_ON_RESISTANCE, element_id="S")
+    case = power_flow.case_from_netlist(shorted, f)
+    result = power_flow.solve_power_flow(case)
+    assert "S" in case.branch_ids and "C" in case.branch_ids and not case.load.any()
+    expected = CircuitSolver(shorted).solve(f).node_voltages[1:] / np.sqrt(2)
+    assert np.allclose(result.voltages, expected, rtol=0, atol=1e-6 * 220)
+
+    # Alimentador fraco (1 kΩ) com L pequeno e chave junto da carga: decide o Thévenin da barra, não o vizinho
+    for switch in (False, True):
+        weak = Netlist(node_count=3 + switch)
+        weak.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 12.0, element_id="V")
+        weak.add_element(ComponentType.RESISTOR, 1, 2, 1e3, element_id="R")
+        weak.add_element(ComponentType.INDUCTOR, 2, 3, 10e-3, element_id="L")
+        if switch:
+            weak.add_element(ComponentType.SWITCH, 3, 4, SWITCH_ON_RESISTANCE, element_id="S")
+        weak.add_element(ComponentType.CAPACITOR, 3 + switch, 0, 1e-6, element_id="C")
+        weak.add_element(ComponentType.RESISTOR, 3 + switch, 0, 2e3, element_id="Rc")
+        case = power_flow.case_from_netlist(weak, f)
+        result = power_flow.solve_power_flow(case)
+        expected = CircuitSolver(weak).solve(f).node_voltages[-1] / np.sqrt(2)
+        assert not case.load.any() and np.isclose(result.voltages[-1], expected, rtol=1e-6)
+
+if __name__ == "__main__":
+    test_divider_dc()
+    test_incremental_matches_full_solve()
+    test_incremental_repeated_edit_reuses_column()
+    test_incremental_updates_saturable_inductor_and_diode()
+    test_netlist_monte_carlo_matches_per_sample_solves()
+    test_adjoint_sensitivities_match_finite_differences()
+    test_port_equivalents_predict_loaded_response()
+    test_superposition_rows_match_single_source_solves()
+    test_fault_study_matches_dense_inverse_and_fault_element()
+    test_prima_reduced_model_tracks_full_model()
+    test_transmission_line_matches_explicit_ladder()
+    test_resistive_grid_pcg_matches_nodal_solver()
+    test_modal_analysis_poles_zeros_and_sparse_shift_invert()
+    test_newton_operating_points_of_diode_and_transistors()
+    test_newton_transient_reuses_jacobian_in_rectifier_and_pfc()
+    test_harmonic_balance_matches_ac_and_settled_transient()
+    test_harmonic_load_flow_matches_per_order_solves()
+    test_thermal_noise_adjoint_matches_closed_forms()
+    test_three_phase_loads_and_symmetrical_components()
+    test_power_flow_newton_and_fast_decoupled()
+    print("🎉 Testes do solver concluídos!")
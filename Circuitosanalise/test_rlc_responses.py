@@ -0,0 +1,198 @@
+"""
+Testes dos motores de resposta do RLC série (espaço de estados e formas fechadas)
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+import scipy.signal as signal
+
+import component_selection
+import design_space
+import monte_carlo
+import response_atlas
+import response_metrics
+from adaptive_sweep import adaptive_frequency_sweep, series_rlc_poles
+import rlc_transient
+import state_space
+
+R, L, C = 10.0, 0.01, 100e-6
+
+def test_state_space_matches_lsim_for_arbitrary_input():
+    A, B = state_space.series_rlc_matrices(R, L, C)
+    system = signal.StateSpace(A, B, np.eye(2), np.zeros((2, 1)))
+    t = np.linspace(0, 0.1, 2000)
+    u = np.sin(2 * np.pi * 60 * t) + 0.3 * np.sign(np.sin(2 * np.pi * 200 * t))
+
+    for method in state_space.HOLD_METHODS:
+        vc, il = state_space.simulate(u, t[1] - t[0], R, L, C, x0=(1.0, 0.2), method=method)
+        _, y, _ = signal.lsim(system, u, t, X0=[1.0, 0.2], interp=(method == "foh"))
+        assert np.allclose(vc, y[:, 0], atol=1e-9)
+        assert np.allclose(il, y[:, 1], atol=1e-9)
+
+def test_step_and_impulse_are_exact_and_cached():
+    tf = signal.TransferFunction([1 / (L * C)], [1, R / L, 1 / (L * C)])
+    t, vc_step, _ = state_space.step_response(R, L, C, 0.05)
+    _, y_step = signal.step(tf, T=t)
+    _, vc_impulse, _ = state_space.impulse_response(R, L, C, 0.05)
+    _, y_impulse = signal.impulse(tf, T=t)
+
+    assert np.allclose(vc_step, y_step, atol=1e-9)
+    assert np.allclose(vc_impulse, y_impulse, rtol=1e-8, atol=1e-8)
+    assert state_space.step_response(R, L, C, 0.05)[1] is vc_step
+
+def test_closed_forms_match_scipy_across_damping_regimes():
+    t = np.linspace(0, 0.05, 3000)
+    critical = 2 * np.sqrt(L / C)
+    resistances = np.array([0.0, 1.0, critical * (1 - 1e-9), critical, critical * (1 + 1e-7), 100.0, 1e4])
+    vc_step, i_step = rlc_transient.step_response(t, resistances, L, C)
+    vc_impulse, _ = rlc_transient.impulse_response(t, resistances, L, C)
+    vc_natural, i_natural = rlc_transient.natural_response(t, resistances, L, C)
+    assert vc_step.shape == (len(resistances), len(t))
+
+    for k, r in enumerate(resistances):
+        tf = signal.TransferFunction([1 / (L * C)], [1, r / L, 1 / (L * C)])
+        current_tf = signal.TransferFunction([1 / L, 0], [1, r / L, 1 / (L * C)])
+        assert np.allclose(vc_step[k], signal.step(tf, T=t)[1], atol=1e-10)
+        assert np.allclose(i_step[k], signal.step(current_tf, T=t)[1], atol=1e-10)
+        y_impulse = signal.impulse(tf, T=t)[1]
+        assert np.allclose(vc_impulse[k], y_impulse, atol=1e-10 * np.max(np.abs(y_impulse)))
+
+    # Descarga livre = valor final − degrau (linearidade)
+    assert np.allclose(vc_natural, 1 - vc_step, atol=1e-12)
+    assert np.allclose(i_natural, -i_step, atol=1e-12)
+
+def test_closed_forms_broadcast_amplitudes():
+    t = np.linspace(0, 0.01, 50)
+    vc, _ = rlc_transient.step_response(t, R, L, C, amplitude=np.array([[1.0], [5.0]]))
+    assert vc.shape == (2, 1, 50)
+    assert np.allclose(vc[1], 5 * vc[0])
+    assert list(rlc_transient.response_regime([0.5, 1.0, 2.0])) == [
+        "Subamortecido", "Criticamente Amortecido", "Superamortecido"]
+
+def test_response_atlas_interpolates_within_bounds_and_falls_back():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "atlas.npy")
+        response_atlas.ResponseAtlas.build(path, zeta_max=2.0, zeta_step=0.01, tau_max=20.0)
+        atlas = response_atlas.ResponseAtlas.load(path, tolerance=1e-4)
+        assert isinstance(atlas.table, np.memmap)
+
+        # τ até 20 cobre o início; o restante da janela cai na avaliação direta
+        t = np.linspace(0, 0.05, 2000)
+        for r in (1.0, R, 2 * np.sqrt(L / C), 30.0, 500.0):
+            served = atlas.responses(t, r, L, C, amplitude=5.0)
+            for kind in ("step", "impulse", "natural"):
+                direct = getattr(rlc_transient, f"{kind}_response")(t, r, L, C, 5.0)
+                for got, expected in zip(served[kind], direct):
+                    assert np.max(np.abs(got - expected)) <= 1e-4 * 5 * max(1, np.max(np.abs(expected)))
+
+        assert np.max(atlas.bounds) < 1e-4
+        assert np.isinf(atlas.error_bound(2.5, 1.0))
+        del atlas
+
+def test_adaptive_sweep_captures_high_q_peak_with_few_points():
+    r = 0.01  # Q ≈ 1000
+    admittance = lambda f: 1 / (r + 2j * np.pi * f * L + 1 / (2j * np.pi * f * C))
+    f, H = adaptive_frequency_sweep(admittance, 1, 1e5, poles=series_rlc_poles(r, L, C))
+    assert len(f) < 500 and np.all(np.diff(f) > 0)
+    assert np.isclose(np.max(np.abs(H)), 1 / r, rtol=1e-9)
+
+    dense = np.logspace(0, 5, 100001)
+    interpolated = np.interp(np.log10(dense), np.log10(f), 20 * np.log10(np.abs(H)))
+    assert np.max(np.abs(interpolated - 20 * np.log10(np.abs(admittance(dense))))) < 0.05
+
+def test_characteristic_points_match_closed_forms_and_dense_scan():
+    critical = 2 * np.sqrt(L / C)
+    resistances = np.array([0.5, R, critical, 3 * critical])
+    points = response_metrics.characteristic_points(resistances, L, C)
+    omega_n, zeta = rlc_transient.damping_parameters(resistances, L, C)
+
+    # -3 dB da admitância: ω = ωₙ(∓ζ + √(ζ² + 1)); Q = 1/(2ζ)
+    root = np.sqrt(zeta**2 + 1)
+    assert np.allclose(points['f_low'], omega_n * (root - zeta) / (2 * np.pi), rtol=1e-9)
+    assert np.allclose(points['f_high'], omega_n * (root + zeta) / (2 * np.pi), rtol=1e-9)
+    assert np.allclose(points['q_factor'], 1 / (2 * zeta), rtol=1e-8)
+    assert np.allclose(points['peak_admittance'], 1 / resistances)
+
+    t = np.linspace(0, 0.5, 500001)
+    vc, _ = rlc_transient.step_response(t, resistances, L, C)
+    for k in range(len(resistances)):
+        outside = np.nonzero(np.abs(vc[k] - 1) > 0.02)[0]
+        assert abs(points['settling_time'][k] - t[outside[-1] + 1]) < 2e-6
+        rise = t[np.argmax(vc[k] >= 0.9)] - t[np.argmax(vc[k] >= 0.1)]
+        assert abs(points['rise_time'][k] - rise) < 2e-6
+        assert abs(points['overshoot_pct'][k] - 100 * max(vc[k].max() - 1, 0)) < 1e-3
+
+def test_design_space_tiles_match_full_grid():
+    r, l, c, f = np.linspace(1, 100, 12), np.logspace(-3, -1, 7), np.logspace(-6, -3, 5), np.logspace(0, 5, 9)
+    grid = np.meshgrid(r, l, c, f, indexing="ij")
+    for name in design_space.QUANTITIES:
+        full = np.broadcast_to(design_space.cell_quantity(name, *grid), grid[0].shape)
+        # Blocos pequenos forçam a divisão ao longo do maior eixo (R), que é eixo do mapa ou reduzido
+        explorer = design_space.DesignSpaceExplorer(r, l, c, f, chunk_cells=200)
+        assert np.allclose(explorer.heatmap(name, "f", "r", "max")["z"], full.max(axis=(1, 2)))
+        assert np.allclose(explorer.heatmap(name, "c", "l", "mean")["z"], full.mean(axis=(0, 3)))
+    # Grades acima do limite são recusadas antes de qualquer cálculo
+    try:
+        design_space.DesignSpaceExplorer(*[np.ones(200)] * 4)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Grade acima de MAX_CELLS deveria ser recusada")
+
+def test_component_selection_matches_brute_force():
+    catalog = component_selection.standard_catalog("E24", "E12", "E12")
+    selections = component_selection.select_components(catalog, f0=2500, zeta=0.6, pf=0.95,
+                                                       frequency=2700, tolerance=0.05, top_n=5)
+    assert selections and selections[0].error <= selections[-1].error
+
+    r, l, c = np.meshgrid(catalog.values["R"], catalog.values["L"], catalog.values["C"],
+                          indexing="ij", sparse=True)
+    f0 = 1 / (2 * np.pi * np.sqrt(l * c))
+    zeta = r / 2 * np.sqrt(c / l)
+    omega = 2 * np.pi * 2700
+    pf = r / np.hypot(r, omega * l - 1 / (omega * c))
+    relative = [(f0 - 2500) / 2500, (zeta - 0.6) / 0.6, (pf - 0.95) / 0.95]
+    feasible = (np.abs(relative[0]) <= 0.05) & (np.abs(relative[1]) <= 0.05) & (np.abs(relative[2]) <= 0.05)
+    error = np.where(feasible, np.sqrt(sum(x**2 for x in relative)), np.inf)
+    assert np.allclose([s.error for s in selections], np.sort(error, axis=None)[:len(selections)])
+    assert component_selection.series_values("E12", -6, -5)[8] == 4.7e-6
+
+def test_rlc_monte_carlo_is_reproducible_and_matches_closed_forms():
+    tolerances = {'r': 0.05, 'l': 0.1, 'c': 0.2}
+    serial = monte_carlo.rlc_monte_carlo("series", 10.0, 0.01, 100e-6, tolerances, 60.0,
+                                         n=30_000, seed=3, chunk=7_000)
+    pooled = monte_carlo.rlc_monte_carlo("series", 10.0, 0.01, 100e-6, tolerances, 60.0,
+                                         n=30_000, seed=3, chunk=7_000, workers=2)
+    assert all(np.array_equal(serial[k], pooled[k]) for k in serial)
+
+    # Distribuição normal truncada em ±tol: f₀ fica entre os cantos do retângulo de tolerâncias
+    f0 = 1 / (2 * np.pi * np.sqrt(0.01 * 100e-6))
+    assert np.all(serial['f0'] >= f0 / np.sqrt(1.1 * 1.2) * (1 - 1e-12))
+    assert np.all(serial['f0'] <= f0 / np.sqrt(0.9 * 0.8) * (1 + 1e-12))
+    assert abs(np.median(serial['f0']) / f0 - 1) < 0.01
+
+    parallel = monte_carlo.rlc_quantities("parallel", 50.0, 0.01, 1e-6, 1e3)
+    z = 1 / (1 / 50.0 + 1 / (2j * np.pi * 1e3 * 0.01) + 2j * np.pi * 1e3 * 1e-6)
+    assert np.isclose(parallel['z_mag'], abs(z)) and np.isclose(parallel['pf'], np.cos(np.angle(z)))
+
+    summary = monte_carlo.summarize(serial, limits={'f0': (0.95 * f0, 1.05 * f0)})
+    inside = np.mean((serial['f0'] >= 0.95 * f0) & (serial['f0'] <= 1.05 * f0))
+    assert np.isclose(summary['f0']['yield'], inside)
+    assert summary['f0']['p2.5'] < summary['f0']['p50'] < summary['f0']['p97.5']
+
+if __name__ == "__main__":
+    test_state_space_matches_lsim_for_arbitrary_input()
+    test_step_and_impulse_are_exact_and_cached()
+    test_closed_forms_match_scipy_across_damping_regimes()
+    test_closed_forms_broadcast_amplitudes()
+    test_response_atlas_interpolates_within_bounds_and_falls_back()
+    test_adaptive_sweep_captures_high_q_peak_with_few_points()
+    test_characteristic_points_match_closed_forms_and_dense_scan()
+    test_design_space_tiles_match_full_grid()
+    test_component_selection_matches_brute_force()
+    test_rlc_monte_carlo_is_reproducible_and_matches_closed_forms()
+    print("🎉 Testes de resposta RLC concluídos!")
@@ -0,0 +1,89 @@
+"""
+Testes do simulador transitório de netlists
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+
+from circuit_editor import ComponentType
+from circuit_solver import Netlist
+from transient_solver import GrowableBuffer, SwitchEvent, TransientSimulator
+
+R, L, C = 10.0, 1e-2, 1e-5
+
+def make_series_rlc() -> Netlist:
+    netlist = Netlist(node_count=0)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 1.0, "V1")
+    netlist.add_element(ComponentType.RESISTOR, 1, 2, R, "R1")
+    netlist.add_element(ComponentType.INDUCTOR, 2, 3, L, "L1")
+    netlist.add_element(ComponentType.CAPACITOR, 3, 0, C, "C1")
+    return netlist
+
+def series_rlc_step(t):
+    """Tensão no capacitor para degrau unitário (sub-amortecido)"""
+    omega_n = 1 / np.sqrt(L * C)
+    zeta = R / 2 * np.sqrt(C / L)
+    omega_d = omega_n * np.sqrt(1 - zeta**2)
+    return 1 - np.exp(-zeta * omega_n * t) * (np.cos(omega_d * t) +
+                                              zeta * omega_n / omega_d * np.sin(omega_d * t))
+
+def test_step_response_matches_closed_form():
+    for method, tolerance in (("trap", 1e-3), ("bdf2", 3e-3)):
+        result = TransientSimulator(make_series_rlc(), method=method,
+                                    reltol=1e-5, abstol=1e-8).run(0.02)
+        error = np.max(np.abs(result.node_voltage(3) - series_rlc_step(result.time)))
+        assert error < tolerance, (method, error)
+        assert result.time[-1] == 0.02
+        # Passo adaptativo: muito menos fatorações que passos
+        assert result.factorizations < result.accepted_steps / 5
+
+def test_sinusoidal_source_and_breakpoints():
+    result = TransientSimulator(make_series_rlc()).run(
+        0.05, sources={"V1": lambda t: np.sin(2 * np.pi * 60 * t)}, breakpoints=[0.025]
+    )
+    assert np.any(np.isclose(result.time, 0.025))
+    assert np.allclose(result.node_voltage(1), np.sin(2 * np.pi * 60 * result.time), atol=1e-9)
+
+def test_switched_rc_reuses_topology_factorizations():
+    netlist = Netlist(node_count=0)
+    netlist.add_element(ComponentType.VOLTAGE_SOURCE, 1, 0, 10.0, "V1")
+    netlist.add_element(ComponentType.SWITCH, 1, 2, 1e-3, "S1")
+    netlist.add_element(ComponentType.RESISTOR, 2, 3, 100.0, "R1")
+    netlist.add_element(ComponentType.CAPACITOR, 3, 0, 10e-6, "C1")
+    netlist.add_element(ComponentType.RESISTOR, 3, 0, 1e4, "RL")
+
+    events = []
+    for k in range(20):
+        events.append(SwitchEvent(2e-3 * k + 1e-3, "S1", False))
+        events.append(SwitchEvent(2e-3 * (k + 1), "S1", True))
+    result = TransientSimulator(netlist).run(0.04, switch_events=events)
+
+    # 40 comutações entre 2 topologias: poucas fatorações no total
+    assert result.factorizations < 30
+    closed = result.switch_closed("S1")
+    assert closed[0] and not closed[np.searchsorted(result.time, 1.5e-3)]
+    # Chave aberta: nenhuma corrente significativa pelo ramo da fonte
+    assert np.max(np.abs(result.element_current("S1")[~closed])) < 1e-6
+
+    reference = TransientSimulator(netlist, reltol=1e-6, abstol=1e-9).run(
+        0.04, switch_events=events, h_max=1e-5
+    )
+    v_reference = np.interp(result.time, reference.time, reference.node_voltage(3))
+    assert np.max(np.abs(result.node_voltage(3) - v_reference)) < 0.02
+
+def test_growable_buffer():
+    buffer = GrowableBuffer(2, capacity=2)
+    for k in range(5):
+        buffer.append([k, 2 * k])
+    assert len(buffer) == 5
+    assert buffer.data[-1].tolist() == [4, 8]
+
+if __name__ == "__main__":
+    test_step_response_matches_closed_form()
+    test_sinusoidal_source_and_breakpoints()
+    test_switched_rc_reuses_topology_factorizations()
+    test_growable_buffer()
+    print("🎉 Testes do transitório concluídos!")
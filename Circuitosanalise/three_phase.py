@@ -0,0 +1,158 @@
+# Módulo de análise de sistemas trifásicos equilibrados e desequilibrados
+# Fasores eficazes em arrays (... × 3) nas fases a, b, c: N alimentadores ou instantes de uma vez
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# Operador a = 1∠120°
+A = np.exp(2j * np.pi / 3)
+# V_abc = FORTESCUE·V_012 e V_012 = FORTESCUE_INVERSE·V_abc (componentes zero, positiva e negativa)
+FORTESCUE = np.array([[1, 1, 1], [1, A ** 2, A], [1, A, A ** 2]])
+FORTESCUE_INVERSE = np.array([[1, 1, 1], [1, A, A ** 2], [1, A ** 2, A]]) / 3
+CONNECTIONS = ("Y", "Δ")
+
+def balanced_set(magnitude, angle_deg=0.0, sequence: str = "positive") -> np.ndarray:
+    """Fasores a, b, c de mesma amplitude defasados de 120° (sequência abc ou acb)"""
+    if sequence not in ("positive", "negative"):
+        raise ValueError(f"Sequência inválida: {sequence}")
+    shift = np.array([0.0, -120.0, 120.0]) * (1 if sequence == "positive" else -1)
+    magnitude = np.asarray(magnitude, dtype=float)[..., None]
+    angle = np.asarray(angle_deg, dtype=float)[..., None] + shift
+    return magnitude * np.exp(1j * np.radians(angle))
+
+def symmetrical_components(abc: np.ndarray) -> np.ndarray:
+    """Componentes simétricas (... × 3) na ordem zero, positiva, negativa"""
+    return np.asarray(abc, dtype=complex) @ FORTESCUE_INVERSE.T
+
+def phase_quantities(sequence: np.ndarray) -> np.ndarray:
+    """Fasores a, b, c a partir das componentes zero, positiva e negativa"""
+    return np.asarray(sequence, dtype=complex) @ FORTESCUE.T
+
+def phase_to_line(phase: np.ndarray) -> np.ndarray:
+    """Tensões de linha ab, bc, ca a partir das tensões de fase"""
+    phase = np.asarray(phase, dtype=complex)
+    return phase - np.roll(phase, -1, axis=-1)
+
+def line_to_phase(line: np.ndarray) -> np.ndarray:
+    """Tensões de fase do Y equivalente (sem sequência zero) a partir das tensões de linha ab, bc, ca"""
+    line = np.asarray(line, dtype=complex)
+    return (line - np.roll(line, 1, axis=-1)) / 3
+
+def unbalance_factors(abc: np.ndarray, line: bool = False) -> Dict[str, np.ndarray]:
+    """Fatores de desequilíbrio: |X₂|/|X₁| e |X₀|/|X₁| (IEC) e o maior desvio da média das amplitudes
+    (NEMA), calculado sobre as tensões de linha quando `abc` são tensões de fase e line=False"""
+    abc = np.asarray(abc, dtype=complex)
+    sequence = symmetrical_components(abc)
+    positive = np.abs(sequence[..., 1])
+    magnitudes = np.abs(abc if line else phase_to_line(abc))
+    mean = magnitudes.mean(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {
+            'negative': np.where(positive > 0, np.abs(sequence[..., 2]) / positive, 0.0),
+            'zero': np.where(positive > 0, np.abs(sequence[..., 0]) / positive, 0.0),
+            'nema': np.where(mean > 0, np.abs(magnitudes - mean[..., None]).max(axis=-1) / mean, 0.0),
+        }
+
+@dataclass
+class ThreePhaseResult:
+    """Tensões e correntes de uma carga trifásica (fasores eficazes, ... × 3)"""
+    connection: str
+    # Tensões de fase da fonte (fase-neutro)
+    phase_voltages: np.ndarray
+    # Tensão e corrente em cada impedância da carga (fases a, b, c no Y; ramos ab, bc, ca no Δ)
+    load_voltages: np.ndarray
+    load_currents: np.ndarray
+    # Correntes nas linhas a, b, c
+    line_currents: np.ndarray
+    # Corrente de retorno pelo neutro e deslocamento do neutro da carga (nulos no Δ)
+    neutral_current: np.ndarray
+    neutral_voltage: np.ndarray
+
+    @property
+    def line_voltages(self) -> np.ndarray:
+        return phase_to_line(self.phase_voltages)
+
+    @property
+    def power(self) -> np.ndarray:
+        """Potência complexa S = V·I* em cada impedância da carga [VA]"""
+        return self.load_voltages * np.conj(self.load_currents)
+
+    @property
+    def total_power(self) -> np.ndarray:
+        return self.power.sum(axis=-1)
+
+    @property
+    def active(self) -> np.ndarray:
+        return self.power.real
+
+    @property
+    def reactive(self) -> np.ndarray:
+        return self.power.imag
+
+    @property
+    def apparent(self) -> np.ndarray:
+        return np.abs(self.power)
+
+    @property
+    def power_factor(self) -> np.ndarray:
+        """FP trifásico vetorial P_total/|S_total|"""
+        total = self.total_power
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(np.abs(total) > 0, total.real / np.abs(total), 1.0)
+
+    @property
+    def voltage_sequence(self) -> np.ndarray:
+        return symmetrical_components(self.phase_voltages)
+
+    @property
+    def current_sequence(self) -> np.ndarray:
+        return symmetrical_components(self.line_currents)
+
+    @property
+    def voltage_unbalance(self) -> Dict[str, np.ndarray]:
+        return unbalance_factors(self.phase_voltages)
+
+    @property
+    def current_unbalance(self) -> Dict[str, np.ndarray]:
+        return unbalance_factors(self.line_currents, line=True)
+
+def wye_load(phase_voltages: np.ndarray, impedances: np.ndarray,
+             neutral_impedance: Optional[complex] = 0.0) -> ThreePhaseResult:
+    """Carga em Y com impedâncias por fase e neutro ligado à fonte por `neutral_impedance`.
+
+    Com neutro ideal (0) cada fase vê a sua tensão de fase; com impedância de
+    neutro (ou neutro isolado, None) o neutro da carga desloca para
+    V_n = Σ(V_k/Z_k)/(Σ 1/Z_k + 1/Z_n), e a corrente de neutro é a soma das
+    correntes de fase.
+    """
+    phase_voltages, impedances = np.broadcast_arrays(np.asarray(phase_voltages, dtype=complex),
+                                                     np.asarray(impedances, dtype=complex))
+    admittances = 1.0 / impedances
+    if neutral_impedance is not None and neutral_impedance == 0:
+        neutral_voltage = np.zeros(phase_voltages.shape[:-1], dtype=complex)
+    else:
+        neutral_admittance = 0.0 if neutral_impedance is None else 1.0 / neutral_impedance
+        neutral_voltage = ((phase_voltages * admittances).sum(axis=-1) /
+                           (admittances.sum(axis=-1) + neutral_admittance))
+    load_voltages = phase_voltages - neutral_voltage[..., None]
+    currents = load_voltages * admittances
+    return ThreePhaseResult("Y", phase_voltages, load_voltages, currents, currents,
+                            currents.sum(axis=-1), neutral_voltage)
+
+def delta_load(phase_voltages: np.ndarray, impedances: np.ndarray) -> ThreePhaseResult:
+    """Carga em Δ com impedâncias nos ramos ab, bc, ca alimentada pelas tensões de fase da fonte"""
+    phase_voltages, impedances = np.broadcast_arrays(np.asarray(phase_voltages, dtype=complex),
+                                                     np.asarray(impedances, dtype=complex))
+    load_voltages = phase_to_line(phase_voltages)
+    branch = load_voltages / impedances
+    # I_a = I_ab − I_ca, I_b = I_bc − I_ab, I_c = I_ca − I_bc
+    line_currents = branch - np.roll(branch, 1, axis=-1)
+    zeros = np.zeros(phase_voltages.shape[:-1], dtype=complex)
+    return ThreePhaseResult("Δ", phase_voltages, load_voltages, branch, line_currents, zeros, zeros)
+
+def delta_to_wye(impedances: np.ndarray) -> np.ndarray:
+    """Impedâncias do Y equivalente (neutro isolado) a uma carga Δ ab, bc, ca"""
+    z = np.asarray(impedances, dtype=complex)
+    # Z_a = Z_ab·Z_ca/ΣZ, Z_b = Z_bc·Z_ab/ΣZ, Z_c = Z_ca·Z_bc/ΣZ
+    return z * np.roll(z, 1, axis=-1) / z.sum(axis=-1, keepdims=True)
@@ -0,0 +1,340 @@
+# Módulo de simulação transitória de netlists do construtor
+# Integração trapezoidal/BDF2 com passo adaptativo controlado pelo erro de truncamento local
+# e chaves temporizadas com cache de fatoração por topologia
+
+import numpy as np
+import scipy.sparse.linalg as spla
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from circuit_editor import ComponentType
+from circuit_solver import (BRANCH_TYPES, GMIN, SWITCH_OFF_RESISTANCE, MNASystem, Netlist,
+                            assemble_mna, expand_lines)
+
+# Coeficiente do erro de truncamento local (LTE ≈ k·h³·x''') de cada método
+LTE_COEFFICIENTS = {"trap": 1.0 / 12.0, "bdf2": 2.0 / 9.0}
+
+class GrowableBuffer:
+    """Buffer pré-alocado de linhas que dobra de capacidade quando enche"""
+
+    def __init__(self, width: int, capacity: int = 1024, dtype=float):
+        self._data = np.empty((capacity, width), dtype=dtype)
+        self._length = 0
+
+    def append(self, row: np.ndarray):
+        if self._length == self._data.shape[0]:
+            grown = np.empty((2 * self._data.shape[0], self._data.shape[1]), dtype=self._data.dtype)
+            grown[:self._length] = self._data[:self._length]
+            self._data = grown
+        self._data[self._length] = row
+        self._length += 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def data(self) -> np.ndarray:
+        """Visão das linhas preenchidas (sem cópia)"""
+        return self._data[:self._length]
+
+def source_function(netlist: Netlist, system: MNASystem,
+                    sources: Optional[Dict[str, Callable[[float], float]]]) -> Callable[[float], np.ndarray]:
+    """Constrói b(t) a partir dos valores fixos da netlist e das formas de onda informadas"""
+    b_static = system.b.copy()
+    if not sources:
+        return lambda t: b_static
+
+    rows = []
+    for element_id, waveform in sources.items():
+        element = netlist.element(element_id)
+        if element.type == ComponentType.VOLTAGE_SOURCE:
+            index = system.branch_index[element.id]
+            b_static[index] = 0.0
+            rows.append(([index], [1.0], waveform))
+        elif element.type == ComponentType.CURRENT_SOURCE:
+            indices, signs = [], []
+            for node, sign in ((element.node1, -1.0), (element.node2, 1.0)):
+                if node > 0:
+                    b_static[node - 1] -= sign * element.value
+                    indices.append(node - 1)
+                    signs.append(sign)
+            rows.append((indices, signs, waveform))
+        else:
+            raise ValueError(f"{element.label} não é uma fonte")
+
+    def b(t: float) -> np.ndarray:
+        vector = b_static.copy()
+        for indices, signs, waveform in rows:
+            value = waveform(t)
+            for index, sign in zip(indices, signs):
+                vector[index] += sign * value
+        return vector
+    return b
+
+@dataclass
+class SwitchEvent:
+    """Abertura (closed=False) ou fechamento (closed=True) de uma chave no instante time"""
+    time: float
+    switch_id: str
+    closed: bool
+
+@dataclass
+class TransientResult:
+    """Formas de onda de uma simulação transitória"""
+    time: np.ndarray
+    states: np.ndarray
+    netlist: Netlist
+    system: MNASystem
+    accepted_steps: int = 0
+    rejected_steps: int = 0
+    factorizations: int = 0
+    switch_ids: List[str] = None
+    switch_states: np.ndarray = None
+
+    def switch_closed(self, switch_id: str) -> np.ndarray:
+        """Estado da chave (True = fechada) em cada instante"""
+        bit = self.switch_ids.index(switch_id)
+        return (self.switch_states >> bit) & 1 == 1
+
+    def node_voltage(self, node: int) -> np.ndarray:
+        """Tensão do nó ao longo do tempo (nó 0 = terra)"""
+        if node == 0:
+            return np.zeros(len(self.time))
+        return self.states[:, node - 1]
+
+    def element_voltage(self, element_id: str) -> np.ndarray:
+        element = self.netlist.element(element_id)
+        return self.node_voltage(element.node1) - self.node_voltage(element.node2)
+
+    def element_current(self, element_id: str) -> np.ndarray:
+        """Corrente do terminal 1 para o terminal 2 do elemento"""
+        element = self.netlist.element(element_id)
+        if element.type in BRANCH_TYPES:
+            return self.states[:, self.system.branch_index[element.id]]
+        v = self.element_voltage(element_id)
+        if element.type == ComponentType.RESISTOR:
+            return v / element.value
+        if element.type == ComponentType.SWITCH:
+            return v / np.where(self.switch_closed(element_id), element.value, SWITCH_OFF_RESISTANCE)
+        if element.type == ComponentType.CAPACITOR:
+            return element.value * np.gradient(v, self.time)
+        if element.type == ComponentType.CURRENT_SOURCE:
+            return np.full(len(self.time), element.value)
+        return np.zeros(len(self.time))
+
+class TransientSimulator:
+    """Simulador transitório de netlists (sistema descritor G·x + C·dx/dt = b(t)).
+
+    Cada passo equivale a trocar indutores e capacitores pelos seus modelos
+    companheiros (condutância α·C/h em paralelo com uma fonte de histórico).
+    O passo é escolhido em níveis h_max/2^k, de modo que a fatoração da matriz
+    α·C/h + G de cada nível é reaproveitada enquanto o passo não muda.
+
+    Cada combinação aberta/fechada das chaves é uma topologia com a sua própria
+    matriz G; as fatorações ficam num LRU indexado por (máscara de chaves, α, h),
+    então circuitos que alternam entre poucos estados fatoram cada um só uma vez.
+    """
+
+    def __init__(self, netlist: Netlist, method: str = "trap", reltol: float = 1e-3,
+                 abstol: float = 1e-6, gmin: float = GMIN, max_cached_factorizations: int = 32):
+        if method not in LTE_COEFFICIENTS:
+            raise ValueError(f"Método de integração inválido: {method}")
+        # Linhas de transmissão entram como escadas concentradas (nós internos ao final)
+        self.netlist = expand_lines(netlist)
+        self.method = method
+        self.reltol = reltol
+        self.abstol = abstol
+        self.gmin = gmin
+        self.max_cached_factorizations = max_cached_factorizations
+        self.switch_ids = [e.id for e in netlist.elements if e.type == ComponentType.SWITCH]
+        self._systems: "OrderedDict[int, MNASystem]" = OrderedDict()
+        self._factorizations: "OrderedDict[Tuple[int, float, float], spla.SuperLU]" = OrderedDict()
+        self.factorization_count = 0
+        self._mask = (1 << len(self.switch_ids)) - 1
+        self.system = self._system_for(self._mask)
+
+    def _lru(self, cache: OrderedDict, key, build):
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        cache[key] = build()
+        if len(cache) > self.max_cached_factorizations:
+            cache.popitem(last=False)
+        return cache[key]
+
+    def switch_mask(self, states: Dict[str, bool]) -> int:
+        """Máscara de bits das chaves (bit k = 1 se a k-ésima chave está fechada)"""
+        mask = 0
+        for bit, switch_id in enumerate(self.switch_ids):
+            if states.get(switch_id, True):
+                mask |= 1 << bit
+        return mask
+
+    def _system_for(self, mask: int) -> MNASystem:
+        """Sistema MNA da topologia indicada pela máscara de chaves"""
+        open_switches = [sid for bit, sid in enumerate(self.switch_ids) if not (mask >> bit) & 1]
+        return self._lru(self._systems, mask,
+                         lambda: assemble_mna(self.netlist, self.gmin, open_switches))
+
+    def _factorize(self, alpha: float, h: float) -> spla.SuperLU:
+        """Fatoração de α·C/h + G com cache LRU por (máscara de chaves, α/h).
+
+        α/h é arredondado a 12 algarismos para que passos iguais a menos de
+        erro de arredondamento (e, p.ex., Euler com h/2 e trapézio com h)
+        compartilhem a mesma fatoração.
+        """
+        coefficient = float(f"{alpha / h:.12g}")
+
+        def build():
+            self.factorization_count += 1
+            return spla.splu((self.system.G + coefficient * self.system.C).tocsc())
+        return self._lru(self._factorizations, (self._mask, coefficient), build)
+
+    def _step(self, x: np.ndarray, x_prev: Optional[np.ndarray], h: float, h_prev: float,
+              b_now: np.ndarray, b_next: np.ndarray, first_order: bool) -> np.ndarray:
+        """Avança um passo; usa Euler implícito logo após t = 0 e breakpoints"""
+        C, G = self.system.C, self.system.G
+        if first_order or (self.method == "bdf2" and x_prev is None):
+            return self._factorize(1.0, h).solve(C @ x / h + b_next)
+        if self.method == "trap":
+            rhs = (2.0 / h) * (C @ x) - G @ x + b_now + b_next
+            return self._factorize(2.0, h).solve(rhs)
+        # BDF2 de passo variável: C·(a0·x₊ + a1·x + a2·x₋)/h + G·x₊ = b₊
+        w = h / h_prev
+        a0 = (1 + 2 * w) / (1 + w)
+        a1 = -(1 + w)
+        a2 = w * w / (1 + w)
+        rhs = C @ (-(a1 * x + a2 * x_prev)) / h + b_next
+        return self._factorize(a0, h).solve(rhs)
+
+    def _lte_ratio(self, times, states, h: float) -> float:
+        """Razão entre o LTE estimado (diferenças divididas) e a tolerância"""
+        t = list(times)
+        dd = [s for s in states]
+        for order in range(1, 4):
+            dd = [(dd[k + 1] - dd[k]) / (t[k + order] - t[k]) for k in range(len(dd) - 1)]
+        third_derivative = 6.0 * dd[0]
+        lte = LTE_COEFFICIENTS[self.method] * h ** 3 * np.abs(third_derivative)
+        scale = self.reltol * np.maximum(np.abs(states[-1]), np.abs(states[-2])) + self.abstol
+        return float(np.max(lte / scale))
+
+    def run(self, t_stop: float, h_max: float = None, h_min: float = None,
+            sources: Optional[Dict[str, Callable[[float], float]]] = None,
+            initial_state: np.ndarray = None, breakpoints: Iterable[float] = (),
+            switch_events: Iterable[SwitchEvent] = (),
+            initial_switch_states: Dict[str, bool] = None,
+            max_steps: int = 1_000_000) -> TransientResult:
+        """Simula de 0 a t_stop com passo adaptativo.
+
+        Fontes sem forma de onda em `sources` ficam constantes desde t = 0
+        (resposta ao degrau a partir do estado inicial, nulo por padrão).
+        Chaves começam fechadas, salvo indicação em initial_switch_states, e
+        mudam de estado exatamente nos instantes dos switch_events.
+        """
+        if t_stop <= 0:
+            raise ValueError("Tempo de simulação deve ser positivo")
+        h_max = h_max or t_stop / 50
+        h_min = h_min or h_max / 2 ** 20
+        max_level = max(0, int(np.ceil(np.log2(h_max / h_min))))
+        h_target = h_max / 2 ** min(max_level, 10)
+        level, interval_base = 0, None
+
+        events = sorted(switch_events, key=lambda event: event.time)
+        for event in events:
+            if event.switch_id not in self.switch_ids:
+                raise ValueError(f"Chave {event.switch_id} não existe na netlist")
+        self._mask = self.switch_mask(initial_switch_states or {})
+        self.system = self._system_for(self._mask)
+
+        b = source_function(self.netlist, self.system, sources)
+        x = np.zeros(self.system.size) if initial_state is None else np.asarray(initial_state, float)
+        event_times = [event.time for event in events]
+        pending = sorted(set(bp for bp in list(breakpoints) + event_times if 0 < bp < t_stop)) + [t_stop]
+        # Eventos em t = 0 valem desde o início
+        while events and events[0].time <= 0:
+            self._apply_event(events.pop(0))
+
+        time_buffer = GrowableBuffer(1)
+        state_buffer = GrowableBuffer(self.system.size)
+        mask_buffer = GrowableBuffer(1, dtype=np.int64)
+        time_buffer.append([0.0])
+        state_buffer.append(x)
+        mask_buffer.append([self._mask])
+
+        t, b_now = 0.0, b(0.0)
+        history_t, history_x = [0.0], [x]
+        x_prev, h_prev = None, 0.0
+        first_order = True
+        accepted = rejected = steps_at_level = 0
+
+        while t < t_stop and accepted + rejected < max_steps:
+            if interval_base is None:
+                # Os níveis de passo de cada intervalo entre breakpoints são frações
+                # binárias de um passo base que divide o intervalo exatamente
+                interval = pending[0] - t
+                interval_base = interval / np.ceil(interval / h_max - 1e-9)
+                level = int(np.clip(np.ceil(np.log2(interval_base / h_target) - 1e-9), 0, max_level))
+
+            # Perto do breakpoint usa o maior nível que cabe na distância restante
+            remaining = pending[0] - t
+            step_level = level
+            while step_level < max_level and interval_base / 2 ** step_level > remaining * (1 + 1e-9):
+                step_level += 1
+            h = interval_base / 2 ** step_level
+            hit_breakpoint = remaining - h < h_min
+            t_next = pending[0] if hit_breakpoint else t + h
+
+            b_next = b(t_next)
+            x_new = self._step(x, x_prev, h, h_prev, b_now, b_next, first_order)
+
+            if len(history_t) >= 3 and not first_order:
+                ratio = self._lte_ratio(history_t[-3:] + [t_next], history_x[-3:] + [x_new], h)
+                if ratio > 1.0 and step_level < max_level:
+                    level = step_level + 1
+                    steps_at_level = 0
+                    rejected += 1
+                    continue
+            else:
+                ratio = 0.0
+
+            x_prev, h_prev = x, h
+            x, t, b_now = x_new, t_next, b_next
+            time_buffer.append([t])
+            state_buffer.append(x)
+            mask_buffer.append([self._mask])
+            accepted += 1
+            steps_at_level += 1
+
+            if hit_breakpoint:
+                pending.pop(0)
+                # Recomeça com passo menor: os primeiros passos após o breakpoint
+                # são aceitos sem estimativa de LTE
+                h_target, interval_base = interval_base / 2 ** (level + 3), None
+                while events and events[0].time <= t + 1e-12 * t_stop:
+                    self._apply_event(events.pop(0))
+                # Derivadas descontínuas: reinicia histórico e volta a Euler implícito
+                history_t, history_x = [t], [x]
+                x_prev, first_order = None, True
+                continue
+            first_order = False
+            history_t = history_t[-3:] + [t]
+            history_x = history_x[-3:] + [x]
+
+            # Dobra o passo só quando o erro previsto (ratio·8) continua folgado
+            if ratio < 0.1 and level > 0 and steps_at_level >= 3:
+                level -= 1
+                steps_at_level = 0
+
+        return TransientResult(
+            time=time_buffer.data[:, 0].copy(), states=state_buffer.data.copy(),
+            netlist=self.netlist, system=self.system, accepted_steps=accepted,
+            rejected_steps=rejected, factorizations=self.factorization_count,
+            switch_ids=list(self.switch_ids), switch_states=mask_buffer.data[:, 0].copy()
+        )
+
+    def _apply_event(self, event: SwitchEvent):
+        """Atualiza a máscara de chaves e o sistema MNA da nova topologia"""
+        bit = 1 << self.switch_ids.index(event.switch_id)
+        self._mask = self._mask | bit if event.closed else self._mask & ~bit
+        self.system = self._system_for(self._mask)
@@ -0,0 +1,112 @@
+# Módulo de linhas de transmissão / escadas RLC parametrizadas
+# Formas fechadas (telegrafista e escada discreta) para o quadripolo entre os terminais, em O(1) por frequência
+
+import numpy as np
+from typing import Dict, Tuple
+
+# Parâmetros por unidade de comprimento (SI) e número de seções; 0 seções = linha distribuída ideal
+LINE_DEFAULTS = {"r": 0.0, "l": 0.0, "c": 0.0, "g": 0.0, "segments": 0}
+LINE_LABELS = {
+    "r": "R [Ω/m]", "l": "L [H/m]", "c": "C [F/m]", "g": "G [S/m]",
+    "segments": "Seções (0 = distribuída)",
+}
+
+# Seções usadas para discretizar linhas distribuídas onde só há modelos concentrados (transitório)
+DEFAULT_LUMPED_SEGMENTS = 100
+
+def line_parameters(parameters: Dict = None) -> Dict[str, float]:
+    """Parâmetros completos da linha (valores ausentes assumem LINE_DEFAULTS), validados"""
+    merged = {**LINE_DEFAULTS, **(parameters or {})}
+    if any(merged[name] < 0 for name in ("r", "l", "c", "g")) or merged["segments"] < 0:
+        raise ValueError("Parâmetros da linha devem ser não negativos")
+    if merged["r"] == 0 and merged["l"] == 0:
+        raise ValueError("Linha sem impedância série (R e L nulos)")
+    merged["segments"] = int(merged["segments"])
+    return merged
+
+def _immittances(parameters: Dict, length: float, frequency) -> Tuple[np.ndarray, np.ndarray]:
+    """Impedância série e admitância paralela totais da linha (R + jωL)·ℓ e (G + jωC)·ℓ"""
+    jw = 2j * np.pi * np.asarray(frequency, dtype=float)
+    return (parameters["r"] + jw * parameters["l"]) * length, (parameters["g"] + jw * parameters["c"]) * length
+
+def _sinh_ratio(a, b, theta):
+    """sinh(a·θ)/sinh(b·θ) sem estouro (Re θ ≥ 0, a ≤ b); limite a/b em θ = 0"""
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        ratio = np.exp((a - b) * theta) * (-np.expm1(-2 * a * theta)) / (-np.expm1(-2 * b * theta))
+    return np.where(theta == 0, a / b, ratio)
+
+def _propagation(parameters: Dict, length: float, frequency):
+    """Ângulo de propagação θ da escada de N seções (ou γℓ da linha distribuída) e N"""
+    z, y = _immittances(parameters, length, frequency)
+    segments = parameters["segments"]
+    if segments:
+        z, y = z / segments, y / segments
+        # cosh θ = 1 + z·y/2  ->  θ = 2·asinh(√(z·y)/2), com Re θ ≥ 0
+        theta = 2 * np.arcsinh(np.sqrt(z * y) / 2)
+    else:
+        theta = np.sqrt(z * y)
+    theta = np.where(theta.real < 0, -theta, theta)
+    return z, y, theta, segments
+
+def line_abcd(parameters: Dict, length: float, frequency) -> Tuple[np.ndarray, ...]:
+    """Matriz ABCD (V₁ = A·V₂ + B·I₂, I₁ = C·V₂ + D·I₂) da linha, vetorizada em frequência.
+
+    Linha distribuída: A = D = cosh γℓ, B = Z₀·sinh γℓ, C = sinh γℓ / Z₀.
+    Escada de N seções (série z seguida de paralelo y): M^N pela identidade
+    de Chebyshev M^N = U_{N−1}·M − U_{N−2}·I, U_k = sinh((k+1)θ)/sinh θ,
+    em O(1) qualquer que seja N.
+    """
+    parameters = line_parameters(parameters)
+    z, y, theta, segments = _propagation(parameters, length, frequency)
+    if segments:
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            u1 = np.where(theta == 0, segments, np.sinh(segments * theta) / np.sinh(theta))
+            u2 = np.where(theta == 0, segments - 1, np.sinh((segments - 1) * theta) / np.sinh(theta))
+        return u1 * (1 + z * y) - u2, u1 * z, u1 * y, u1 - u2
+    # Séries de θ·coth θ e sinh θ/θ evitam 0/0 quando γ = 0
+    cosh = np.cosh(theta)
+    sinhc = np.where(theta == 0, 1.0, np.sinh(theta) / np.where(theta == 0, 1.0, theta))
+    return cosh, z * sinhc, y * sinhc, cosh
+
+def line_admittance(parameters: Dict, length: float, frequency) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parâmetros Y do quadripolo (y₁₁ = D/B, y₁₂ = y₂₁ = −1/B, y₂₂ = A/B) sem estouro.
+
+    Em linhas longas e com perdas A, B, C e D crescem como e^{Nθ}, mas as
+    razões ficam limitadas; elas são calculadas com sinh(aθ)/sinh(bθ)
+    estável. Requer impedância série não nula (B ≠ 0).
+    """
+    parameters = line_parameters(parameters)
+    z, y, theta, segments = _propagation(parameters, length, frequency)
+    if segments:
+        # U_{N−2}/U_{N−1} e 1/U_{N−1}
+        lag = _sinh_ratio(segments - 1, segments, theta)
+        inverse = _sinh_ratio(1, segments, theta)
+        return (1 - lag) / z, -inverse / z, (1 + z * y - lag) / z
+    # θ·coth θ / (zℓ) e θ·csch θ / (zℓ)
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        coth = np.where(theta == 0, 1.0, theta * (1 + np.exp(-2 * theta)) / -np.expm1(-2 * theta))
+        csch = np.where(theta == 0, 1.0, theta * 2 * np.exp(-theta) / -np.expm1(-2 * theta))
+    return coth / z, -csch / z, coth / z
+
+def voltage_profile(parameters: Dict, length: float, frequency: float, v1: complex, v2: complex) -> Tuple[np.ndarray, np.ndarray]:
+    """Tensão ao longo da linha dados os fasores nos terminais: (posições [m], tensões).
+
+    Nós internos da escada satisfazem −V_{k−1} + (2 + zy)·V_k − V_{k+1} = 0,
+    cuja solução exata é V_k = [V₁·sinh((N−k)θ) + V₂·sinh(kθ)] / sinh(Nθ);
+    na linha distribuída o mesmo vale com kθ → γx. Custo O(N) vetorizado.
+    """
+    parameters = line_parameters(parameters)
+    _, _, theta, segments = _propagation(parameters, length, frequency)
+    points = segments or DEFAULT_LUMPED_SEGMENTS
+    k = np.arange(points + 1)
+    if not segments:
+        theta = theta / points
+    voltages = v1 * _sinh_ratio(points - k, points, theta) + v2 * _sinh_ratio(k, points, theta)
+    return k * length / points, voltages
+
+def lumped_sections(parameters: Dict, length: float) -> Tuple[int, float, float, float, float]:
+    """(N, r, l, c, g) por seção da escada concentrada equivalente (distribuída → DEFAULT_LUMPED_SEGMENTS)"""
+    parameters = line_parameters(parameters)
+    segments = parameters["segments"] or DEFAULT_LUMPED_SEGMENTS
+    delta = length / segments
+    return segments, parameters["r"] * delta, parameters["l"] * delta, parameters["c"] * delta, parameters["g"] * delta